@@ -6,16 +6,20 @@ Entry point for intelligent multi-server environment setup
 
 import os
 import sys
+import socket
 import argparse
+import ipaddress
+import threading
 import logging
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-from tools.system_detector import SystemDetector
 from tools.dependency_resolver import DependencyResolver
+from tools.topology_cache import TopologyCache
 from tools.network_scanner import NetworkScanner
-from tools.config_validator import ConfigValidator
+from tools.package_cache_proxy import PackageCacheProxy
+from tools.wizard_context import WizardContext
 
 
 class SetupScenario(Enum):
@@ -84,15 +88,34 @@ class MasterWizard:
         )
     }
     
-    def __init__(self, language: str = "en"):
+    def __init__(self, language: str = "en", rescan: bool = False, 
+                 max_age: Optional[int] = None, context: Optional[WizardContext] = None):
         """Initialize master wizard with language preference."""
         self.language = language
-        self.system_detector = SystemDetector()
-        self.dependency_resolver = DependencyResolver()
-        self.network_scanner = NetworkScanner()
-        self.config_validator = ConfigValidator()
+        # Subsystems are built on first use and shared with scenario wizards
+        self.context = context or WizardContext(rescan=rescan, max_age=max_age)
         self.setup_logging()
         
+    @property
+    def system_detector(self):
+        """System detector from the shared context."""
+        return self.context.system_detector
+        
+    @property
+    def dependency_resolver(self):
+        """Dependency resolver from the shared context."""
+        return self.context.dependency_resolver
+        
+    @property
+    def network_scanner(self):
+        """Network scanner from the shared context."""
+        return self.context.network_scanner
+        
+    @property
+    def config_validator(self):
+        """Config validator from the shared context."""
+        return self.context.config_validator
+        
     def setup_logging(self):
         """Configure logging for the wizard."""
         log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -115,29 +138,35 @@ class MasterWizard:
 Ultimate Multi-Server Environment Setup Automation
 Born from 150+ SSH configuration battles
 
-System detected: {system_info}
-Available ecosystems: {network_info}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        """.format(
-            system_info=self.get_system_summary(),
-            network_info=self.get_network_summary()
+System detected: {system_info}""".format(
+            system_info=self.get_system_summary()
         )
         print(banner)
         
+        # Ecosystem servers are printed as they are discovered
+        print("Available ecosystems:", flush=True)
+        print(f"  {self.get_network_summary()}")
+        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        
     def get_system_summary(self) -> str:
         """Get brief system information summary."""
         try:
-            info = self.system_detector.detect_basic_info()
-            return f"{info.get('os', 'Unknown')} on {info.get('arch', 'Unknown')}"
+            info = self.system_detector.snapshot()
+            return f"{info.os_name or 'Unknown'} on {info.architecture or 'Unknown'}"
         except Exception as e:
             self.logger.warning(f"Could not detect system info: {e}")
             return "Detection failed"
             
     def get_network_summary(self) -> str:
-        """Get brief network ecosystem summary."""
+        """Get brief network ecosystem summary, listing servers as they appear."""
         try:
-            servers = self.network_scanner.scan_ecosystem()
-            return f"{len(servers)} servers discovered"
+            # Neighbor-table hosts answer within milliseconds
+            count = 0
+            for server in self.network_scanner.iter_ecosystem(neighbors_only=True):
+                count += 1
+                print(f"  • {server.server_type}: {server.ip_address} ({server.hostname or 'unknown'})", 
+                      flush=True)
+            return f"{count} servers discovered"
         except Exception as e:
             self.logger.warning(f"Could not scan network: {e}")
             return "Network scan failed"
@@ -195,7 +224,7 @@ Available ecosystems: {network_info}
             module = __import__(module_name, fromlist=[''])
             wizard_class = getattr(module, f"{scenario.value.title().replace('_', '')}Wizard")
             
-            wizard = wizard_class(language=self.language)
+            wizard = wizard_class(language=self.language, context=self.context)
             wizard.run_setup()
             
         except ImportError as e:
@@ -219,7 +248,7 @@ Available ecosystems: {network_info}
         
         try:
             # System health
-            system_status = self.system_detector.health_check()
+            system_status = self.system_detector.health_check(sampler=self.context.health_sampler)
             print(f"System Health: {'✅ OK' if system_status else '❌ Issues detected'}")
             
             # Network connectivity  
@@ -236,6 +265,8 @@ Available ecosystems: {network_info}
             
     def run(self):
         """Main wizard execution loop."""
+        # Remaining subsystems are built while the banner and menu are shown
+        self.context.warm_up()
         self.display_banner()
         
         while True:
@@ -260,6 +291,40 @@ Available ecosystems: {network_info}
             input("\nPress Enter to continue / Stiskněte Enter pro pokračování...")
 
 
+def serve_cache_proxy(port: int, max_size_mb: int, host: str = "127.0.0.1",
+                      allowed_hosts: Optional[List[str]] = None):
+    """Run the fleet package cache proxy in the foreground and print client configs."""
+    logging.basicConfig(level=logging.INFO)
+    proxy = PackageCacheProxy(port=port, max_size_mb=max_size_mb, host=host, allowed_hosts=allowed_hosts)
+    proxy.start()
+    
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = host == "localhost"
+    if host == "0.0.0.0":
+        # Advertise the address of the interface holding the default route, not 127.0.1.1
+        scanner = NetworkScanner()
+        host = scanner.default_route_address(scanner.get_local_network_info().get("gateway")) or socket.gethostname()
+    proxy_url = f"http://{host}:{proxy.port}"
+    
+    print(f"📦 Package cache proxy running at {proxy_url}")
+    if loopback:
+        print("Only this machine can use it; pass --cache-proxy-bind 0.0.0.0 to serve the others")
+    else:
+        print(f"Other machines: master_wizard.py --use-cache-proxy {proxy_url}")
+    print("Or configure them permanently:")
+    for path, content in PackageCacheProxy.client_config(proxy_url).items():
+        print(f"\n# {path}\n{content.rstrip()}")
+        
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print(f"\nStopping proxy ({proxy.hits} hits, {proxy.misses} misses)")
+    finally:
+        proxy.stop()
+
+
 def main():
     """Main entry point with argument parsing."""
     parser = argparse.ArgumentParser(
@@ -276,6 +341,66 @@ def main():
         choices=[s.value for s in SetupScenario],
         help="Run specific scenario directly"
     )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore cached network topology and rescan the subnet"
+    )
+    parser.add_argument(
+        "--max-age",
+        type=int,
+        default=TopologyCache.DEFAULT_TTL,
+        metavar="SECONDS",
+        help="Maximum age of cached topology entries"
+    )
+    parser.add_argument(
+        "--download-cache",
+        metavar="DIR",
+        help="Directory for prefetched packages (default: ~/.cache/unifikation/packages)"
+    )
+    parser.add_argument(
+        "--download-cache-mb",
+        type=int,
+        default=DependencyResolver.DEFAULT_DOWNLOAD_CACHE_MB,
+        metavar="MB",
+        help="Size limit of the prefetched package cache"
+    )
+    parser.add_argument(
+        "--cache-proxy",
+        action="store_true",
+        help="Serve a package cache proxy for the other ecosystem machines and exit on Ctrl+C"
+    )
+    parser.add_argument(
+        "--cache-proxy-port",
+        type=int,
+        default=PackageCacheProxy.DEFAULT_PORT,
+        metavar="PORT",
+        help="Port of the package cache proxy"
+    )
+    parser.add_argument(
+        "--cache-proxy-mb",
+        type=int,
+        default=PackageCacheProxy.DEFAULT_SIZE_MB,
+        metavar="MB",
+        help="Size limit of the package cache proxy store"
+    )
+    parser.add_argument(
+        "--cache-proxy-bind",
+        default="127.0.0.1",
+        metavar="ADDRESS",
+        help="Address the package cache proxy listens on, e.g. 0.0.0.0 for the whole LAN"
+    )
+    parser.add_argument(
+        "--cache-proxy-allow",
+        action="append",
+        metavar="HOST",
+        help="Extra apt mirror host the proxy may forward to (repeatable)"
+    )
+    parser.add_argument(
+        "--use-cache-proxy",
+        metavar="URL",
+        help="Install packages through a package cache proxy, e.g. http://192.168.0.10:3142"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -288,8 +413,20 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
         
+    if args.cache_proxy:
+        serve_cache_proxy(args.cache_proxy_port, args.cache_proxy_mb, args.cache_proxy_bind,
+                          args.cache_proxy_allow)
+        return
+        
     # Create and run wizard
-    wizard = MasterWizard(language=args.language)
+    context = WizardContext(
+        rescan=args.rescan,
+        max_age=args.max_age,
+        download_cache_dir=args.download_cache,
+        download_cache_mb=args.download_cache_mb,
+        proxy_url=args.use_cache_proxy
+    )
+    wizard = MasterWizard(language=args.language, context=context)
     
     if args.scenario:
         # Direct scenario execution
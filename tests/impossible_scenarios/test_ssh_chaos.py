@@ -243,7 +243,10 @@ Host LLMS
         # Can't install tmux without SSH
         # Can't test connectivity without network tools
         
-        with patch('subprocess.run') as mock_run:
+        empty_path = os.path.join(self.temp_dir, 'empty-bin')
+        os.makedirs(empty_path)
+        
+        with patch('subprocess.run') as mock_run, patch.dict(os.environ, {'PATH': empty_path}):
             # Simulate all commands failing initially
             mock_run.side_effect = subprocess.CalledProcessError(127, ['command'], stderr="Command not found")
             
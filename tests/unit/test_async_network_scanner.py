@@ -0,0 +1,102 @@
+"""
+Test Async Network Scanner
+Local-only checks for the asyncio scan engine
+"""
+
+import unittest
+import asyncio
+import concurrent.futures
+import socket
+import time
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.async_network_scanner import AsyncNetworkScanner
+
+
+class TestAsyncNetworkScanner(unittest.TestCase):
+    """Test async subnet scanning against localhost listeners."""
+    
+    def setUp(self):
+        """Open one listening port and reserve one closed port."""
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.open_port = self.listener.getsockname()[1]
+        
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.closed_port = sock.getsockname()[1]
+            
+        self.scanner = AsyncNetworkScanner(max_concurrency=8)
+        self.scanner.probe_ports = [self.open_port, self.closed_port]
+        
+    def tearDown(self):
+        """Close listener."""
+        self.listener.close()
+        
+    def test_scan_finds_open_port(self):
+        """Open ports are reported for hosts that answer the liveness sweep."""
+        servers = self.scanner.scan_subnet("127.0.0.1/32", timeout=0.5)
+        
+        self.assertEqual(len(servers), 1)
+        server = servers[0]
+        self.assertEqual(server.ip_address, "127.0.0.1")
+        self.assertEqual(server.open_ports, [self.open_port])
+        self.assertGreaterEqual(server.ping_time, 0.0)
+        
+    def test_iter_subnet_streams(self):
+        """Sync and async iterators yield the same servers."""
+        streamed = list(self.scanner.iter_subnet("127.0.0.1/32", timeout=0.5))
+        
+        async def collect():
+            return [s async for s in self.scanner.iter_subnet_async("127.0.0.1/32", timeout=0.5)]
+            
+        self.assertEqual([s.ip_address for s in streamed], ["127.0.0.1"])
+        self.assertEqual([s.open_ports for s in asyncio.run(collect())], [[self.open_port]])
+        
+    def test_early_stop(self):
+        """Consumers may stop iterating before the sweep finishes."""
+        servers = self.scanner.iter_subnet("127.0.0.0/29", timeout=0.5)
+        first = next(servers)
+        servers.close()
+        
+        self.assertTrue(first.ip_address.startswith("127.0.0."))
+        
+    def test_invalid_subnet(self):
+        """Invalid subnet returns empty list instead of crashing."""
+        self.assertEqual(self.scanner.scan_subnet("not-a-subnet"), [])
+        
+    def test_per_host_rate_limit(self):
+        """Probes to one host are paced by per_host_rate."""
+        self.scanner.per_host_rate = 20.0
+        self.scanner.probe_ports = [self.closed_port] * 5
+        
+        start = time.monotonic()
+        self.scanner.scan_subnet("127.0.0.1/32", timeout=0.5)
+        elapsed = time.monotonic() - start
+        
+        # Five probes at 20/s need at least four 50 ms gaps
+        self.assertGreaterEqual(elapsed, 0.19)
+        
+    def test_hanging_lookups_do_not_queue(self):
+        """Hosts whose reverse lookup hangs are all released after one HOSTNAME_TIMEOUT."""
+        self.scanner.HOSTNAME_TIMEOUT = 0.2
+        self.scanner.probe_ports = []
+        self.scanner.hostname_resolver.resolve_async = lambda ip: concurrent.futures.Future()
+        
+        async def scan_hosts():
+            return await asyncio.gather(*(self.scanner._scan_host_async(f"127.0.0.{i}", 0.5, 0.1)
+                                          for i in range(1, 41)))
+            
+        start = time.monotonic()
+        servers = asyncio.run(scan_hosts())
+        
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(len(servers), 40)
+        self.assertTrue(all(server.hostname is None for server in servers))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
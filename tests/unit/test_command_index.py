@@ -0,0 +1,75 @@
+"""
+Test Command Index
+PATH lookups without spawning `which`
+"""
+
+import unittest
+import tempfile
+import shutil
+import time
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.command_index import CommandIndex
+
+
+class TestCommandIndex(unittest.TestCase):
+    """Test PATH index lookups and invalidation."""
+    
+    def setUp(self):
+        """Create two PATH directories."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.first = os.path.join(self.temp_dir, 'first')
+        self.second = os.path.join(self.temp_dir, 'second')
+        os.makedirs(self.first)
+        os.makedirs(self.second)
+        self.index = CommandIndex()
+        
+        self.path_patch = patch.dict(os.environ, {'PATH': os.pathsep.join([self.first, self.second])})
+        self.path_patch.start()
+        
+    def tearDown(self):
+        """Restore PATH and clean up."""
+        self.path_patch.stop()
+        shutil.rmtree(self.temp_dir)
+        
+    def _make_file(self, directory: str, name: str, mode: int = 0o755) -> str:
+        """Create file with given permissions."""
+        path = os.path.join(directory, name)
+        with open(path, 'w') as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(path, mode)
+        return path
+        
+    def test_lookup_respects_path_order(self):
+        """Earlier PATH directories win and non-executables are ignored."""
+        self._make_file(self.second, 'tool')
+        expected = self._make_file(self.first, 'tool')
+        self._make_file(self.first, 'notes', 0o644)
+        
+        self.assertEqual(self.index.which('tool'), expected)
+        self.assertFalse(self.index.command_exists('notes'))
+        self.assertFalse(self.index.command_exists('missing'))
+        
+    def test_directory_change_invalidates(self):
+        """New executables are found once their directory mtime changes."""
+        self.assertFalse(self.index.command_exists('late'))
+        
+        time.sleep(0.01)
+        self._make_file(self.second, 'late')
+        
+        self.assertTrue(self.index.command_exists('late'))
+        
+    def test_no_subprocess(self):
+        """Lookups never fork."""
+        self._make_file(self.first, 'tool')
+        
+        with patch('subprocess.run') as mock_run:
+            self.assertTrue(self.index.command_exists('tool'))
+            mock_run.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
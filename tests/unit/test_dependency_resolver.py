@@ -0,0 +1,443 @@
+"""
+Test Dependency Resolver
+Batched installed-package queries
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import subprocess
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.dependency_resolver import DependencyResolver, Package, PackageManager
+from tools.package_catalog import PackageCatalog
+from tools.package_db import PackageDatabase
+from tools.installed_cache import InstalledStateCache
+
+
+DPKG_QUERY_OUTPUT = """git\t1:2.39.5-0+deb12u2\tinstall ok installed
+curl\t7.88.1-10\tdeinstall ok config-files
+tmux\t3.3a-3\tinstall ok installed
+"""
+
+
+class TestInstalledQuery(unittest.TestCase):
+    """Test one query per manager for the whole candidate list."""
+    
+    def setUp(self):
+        """Create resolver with a fixed manager list."""
+        with patch.object(DependencyResolver, '_detect_package_managers', return_value=[]):
+            self.resolver = DependencyResolver()
+            
+        # No readable databases, so every query goes through the CLI
+        self.resolver.package_db = PackageDatabase(site_dirs=[])
+        self.resolver.package_db.DPKG_STATUS = "/nonexistent/status"
+        self.resolver.package_db.PACMAN_LOCAL = "/nonexistent/local"
+        self.resolver.package_db.APK_INSTALLED = "/nonexistent/installed"
+        
+    def test_dpkg_single_query(self):
+        """All candidates are resolved by one dpkg-query call."""
+        self.resolver.detected_managers = [PackageManager.APT, PackageManager.PIP]
+        packages = [self.resolver.catalog.packages[name] for name in ["git", "curl", "tmux", "htop"]]
+        
+        with patch.object(self.resolver, '_run_query', return_value=DPKG_QUERY_OUTPUT) as run:
+            installed = self.resolver.query_installed(packages)
+            
+        run.assert_called_once()
+        self.assertEqual(run.call_args[0][0][:2], ['dpkg-query', '-W'])
+        self.assertEqual(installed, {"git": "1:2.39.5-0+deb12u2", "curl": None,
+                                     "tmux": "3.3a-3", "htop": None})
+        
+    def test_pip_names_normalized(self):
+        """pip list output matches names regardless of case and separators."""
+        self.resolver.detected_managers = [PackageManager.PIP]
+        output = json.dumps([{"name": "Git", "version": "1.0"}, {"name": "tmux_py", "version": "2"}])
+        
+        with patch.object(self.resolver, '_run_query', return_value=output):
+            installed = self.resolver.query_installed([self.resolver.catalog.packages["git"]])
+            
+        self.assertEqual(installed, {"git": "1.0"})
+        
+    def test_resolve_uses_batched_query(self):
+        """resolve_dependencies makes a single query for every package."""
+        self.resolver.detected_managers = [PackageManager.APT]
+        
+        with patch.object(self.resolver, '_run_query', return_value=DPKG_QUERY_OUTPUT) as run:
+            plan = self.resolver.resolve_dependencies(["git", "curl", "tmux", "unknown"])
+            
+        run.assert_called_once()
+        self.assertEqual([p.name for p in plan.packages_to_install], ["curl"])
+        
+    def test_packages_checked_with_their_installing_manager(self):
+        """pip-only tools are looked up in pip, system packages in dpkg, one query each."""
+        self.resolver.detected_managers = [PackageManager.APT, PackageManager.PIP]
+        packages = [self.resolver.catalog.packages["git"], Package(name="black", pip_name="black")]
+        output = json.dumps([{"name": "black", "version": "24.1.0"}])
+        
+        def run_query(command):
+            return DPKG_QUERY_OUTPUT if command[0] == 'dpkg-query' else output
+            
+        with patch.object(self.resolver, '_run_query', side_effect=run_query) as run:
+            installed = self.resolver.query_installed(packages)
+            
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(installed, {"git": "1:2.39.5-0+deb12u2", "black": "24.1.0"})
+        
+    def test_failing_manager_falls_through(self):
+        """A manager whose query fails defers to the next one."""
+        self.resolver.detected_managers = [PackageManager.PACMAN, PackageManager.APT]
+        
+        def run_query(command):
+            if command[0] == 'pacman':
+                raise FileNotFoundError(command[0])
+            return DPKG_QUERY_OUTPUT
+            
+        with patch.object(self.resolver, '_run_query', side_effect=run_query):
+            self.assertTrue(self.resolver.is_package_installed(self.resolver.catalog.packages["git"]))
+
+
+DPKG_STATUS = """Package: git
+Status: install ok installed
+Priority: optional
+Version: 1:2.39.5-0+deb12u2
+Description: fast, scalable, distributed revision control system
+ Git is popular.
+
+Package: curl
+Status: deinstall ok config-files
+Version: 7.88.1-10
+
+Package: tmux
+Status: install ok installed
+Version: 3.3a-3"""
+
+PACMAN_DESC = """%NAME%
+htop
+
+%VERSION%
+3.3.0-1
+
+%DESC%
+Interactive process viewer
+"""
+
+APK_INSTALLED = """C:Q1abc=
+P:musl
+V:1.2.4-r2
+A:x86_64
+
+P:wget
+V:1.21.4-r0
+"""
+
+
+class TestPackageDatabase(unittest.TestCase):
+    """Test direct package database readers."""
+    
+    def setUp(self):
+        """Write fake package databases."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = PackageDatabase(site_dirs=[os.path.join(self.temp_dir, 'site-packages')])
+        self.db.DPKG_STATUS = self._write('status', DPKG_STATUS)
+        self.db.APK_INSTALLED = self._write('installed', APK_INSTALLED)
+        self.db.PACMAN_LOCAL = os.path.join(self.temp_dir, 'local')
+        os.makedirs(os.path.join(self.db.PACMAN_LOCAL, 'htop-3.3.0-1'))
+        self._write(os.path.join('local', 'htop-3.3.0-1', 'desc'), PACMAN_DESC)
+        os.makedirs(os.path.join(self.temp_dir, 'site-packages', 'Py_Yaml-6.0.1.dist-info'))
+        
+    def tearDown(self):
+        """Clean up temp directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def _write(self, name: str, content: str) -> str:
+        """Write file under the temp directory."""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+        
+    def test_readers(self):
+        """Each database yields only installed packages with versions."""
+        self.assertEqual(self.db.installed("apt"), {"git": "1:2.39.5-0+deb12u2", "tmux": "3.3a-3"})
+        self.assertEqual(self.db.installed("pacman"), {"htop": "3.3.0-1"})
+        self.assertEqual(self.db.installed("apk"), {"musl": "1.2.4-r2", "wget": "1.21.4-r0"})
+        self.assertEqual(self.db.installed("pip"), {"py-yaml": "6.0.1"})
+        
+    def test_index_reused_until_database_changes(self):
+        """Unchanged databases are parsed once."""
+        first = self.db.installed("apt")
+        self.assertIs(self.db.installed("apt"), first)
+        
+        with open(self.db.DPKG_STATUS, 'a') as f:
+            f.write("\n\nPackage: htop\nStatus: install ok installed\nVersion: 3.2.2-2\n")
+            
+        self.assertEqual(self.db.installed("apt")["htop"], "3.2.2-2")
+        
+    def test_missing_database(self):
+        """Missing databases report None so callers fall back to the CLI."""
+        self.db.DPKG_STATUS = os.path.join(self.temp_dir, 'missing')
+        self.assertIsNone(self.db.installed("apt"))
+        self.assertIsNone(self.db.installed("yum"))
+        
+    def test_rpm_signature_tracks_database_files(self):
+        """In-place rpm database rewrites change the signature even when the directory stat does not."""
+        self.db.RPM_DIRS = [os.path.join(self.temp_dir, 'rpm'), os.path.join(self.temp_dir, 'sysimage')]
+        os.makedirs(os.path.join(self.temp_dir, 'sysimage'))
+        path = self._write(os.path.join('sysimage', 'rpmdb.sqlite'), 'before')
+        before = self.db.signature("dnf")
+        self.assertIsNotNone(before)
+        
+        directory = os.stat(os.path.join(self.temp_dir, 'sysimage'))
+        with open(path, 'w') as f:
+            f.write('after, and longer')
+        os.utime(os.path.join(self.temp_dir, 'sysimage'), ns=(directory.st_atime_ns, directory.st_mtime_ns))
+        
+        self.assertNotEqual(self.db.signature("dnf"), before)
+        
+    def test_pip_from_other_environment_uses_cli(self):
+        """site-packages are only read when the pip on PATH runs under this interpreter."""
+        pip = os.path.join(self.temp_dir, 'pip')
+        db = PackageDatabase()
+        for interpreter, readable in [("/opt/other-python/bin/python3.9", False), (sys.executable, True)]:
+            self._write('pip', f"#!{interpreter}\nimport pip\n")
+            with patch('shutil.which', return_value=pip):
+                self.assertEqual(db._pip_uses_this_interpreter(), readable)
+                if not readable:
+                    self.assertIsNone(db.installed("pip"))
+                    
+    def test_resolver_reads_database_without_subprocess(self):
+        """Installed state comes from the database when it is readable."""
+        with patch.object(DependencyResolver, '_detect_package_managers', return_value=[PackageManager.APT]):
+            resolver = DependencyResolver()
+        resolver.package_db = self.db
+        
+        with patch.object(resolver, '_run_query') as run:
+            installed = resolver.query_installed(
+                [resolver.catalog.packages[name] for name in ["git", "curl", "tmux"]]
+            )
+            
+        run.assert_not_called()
+        self.assertEqual(installed, {"git": "1:2.39.5-0+deb12u2", "curl": None, "tmux": "3.3a-3"})
+
+
+class TestInstalledStateCache(unittest.TestCase):
+    """Test persistent installed-state snapshots."""
+    
+    def setUp(self):
+        """Create fake dpkg database and cache directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.status_path = os.path.join(self.temp_dir, 'status')
+        with open(self.status_path, 'w') as f:
+            f.write(DPKG_STATUS)
+        self.cache = InstalledStateCache(cache_dir=os.path.join(self.temp_dir, 'cache'))
+        
+    def tearDown(self):
+        """Clean up temp directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def _resolver(self) -> DependencyResolver:
+        """Fresh resolver, as a new wizard session would create."""
+        with patch.object(DependencyResolver, '_detect_package_managers', return_value=[PackageManager.APT]):
+            resolver = DependencyResolver(installed_cache=self.cache)
+        resolver.package_db.DPKG_STATUS = self.status_path
+        return resolver
+        
+    def test_repeat_plan_skips_queries(self):
+        """A second session on an unchanged system answers from the snapshot."""
+        self._resolver().resolve_dependencies(["git", "curl", "tmux"])
+        
+        resolver = self._resolver()
+        with patch.object(resolver, '_query_manager') as query:
+            plan = resolver.resolve_dependencies(["git", "curl", "tmux"])
+            
+        query.assert_not_called()
+        self.assertEqual([p.name for p in plan.packages_to_install], ["curl"])
+        
+    def test_database_change_invalidates(self):
+        """Installing a package changes the database signature and forces a query."""
+        self._resolver().resolve_dependencies(["git", "curl"])
+        
+        with open(self.status_path, 'a') as f:
+            f.write("\n\nPackage: curl\nStatus: install ok installed\nVersion: 7.88.1-10\n")
+            
+        plan = self._resolver().resolve_dependencies(["git", "curl"])
+        self.assertEqual(plan.packages_to_install, [])
+        
+    def test_unknown_names_are_queried(self):
+        """Names never recorded under the current signature are a cache miss."""
+        signature = [[1, 2, 3]]
+        self.cache.store("apt", signature, {"git": "2.39"})
+        
+        self.assertEqual(self.cache.get("apt", signature, ["git"]), {"git": "2.39"})
+        self.assertIsNone(self.cache.get("apt", signature, ["git", "tmux"]))
+        self.assertIsNone(self.cache.get("apt", [[1, 2, 4]], ["git"]))
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """Test dependency DAG ordering and level-parallel installation."""
+    
+    def setUp(self):
+        """Create resolver with apt, pip and npm and a small package graph."""
+        with patch.object(DependencyResolver, '_detect_package_managers',
+                          return_value=[PackageManager.APT, PackageManager.PIP, PackageManager.NPM]):
+            self.resolver = DependencyResolver()
+            
+        self.resolver.catalog = PackageCatalog([
+            Package(name="python3", apt_name="python3"),
+            Package(name="nodejs", apt_name="nodejs"),
+            Package(name="black", pip_name="black", depends_on=["python3"]),
+            Package(name="eslint", npm_name="eslint", depends_on=["nodejs"]),
+            Package(name="tmux", apt_name="tmux"),
+            Package(name="a", apt_name="a", depends_on=["b"]),
+            Package(name="b", apt_name="b", depends_on=["a"])
+        ])
+        
+    def _levels(self, names):
+        """Installation order as lists of names."""
+        packages = [self.resolver.catalog.packages[name] for name in names]
+        return [[p.name for p in level] for level in self.resolver._create_installation_order(packages)]
+        
+    def test_kahn_levels(self):
+        """Dependencies land in earlier levels, independent packages share one."""
+        self.assertEqual(self._levels(["black", "eslint", "tmux", "python3", "nodejs"]),
+                         [["tmux", "python3", "nodejs"], ["black", "eslint"]])
+        
+    def test_installed_dependency_does_not_constrain(self):
+        """Edges to packages outside the install set are ignored."""
+        self.assertEqual(self._levels(["black", "tmux"]), [["black", "tmux"]])
+        
+    def test_cycle_reported(self):
+        """Cyclic packages are reported as conflicts and installed together last."""
+        with patch.object(self.resolver, 'query_installed', return_value={}):
+            plan = self.resolver.resolve_dependencies(["a", "tmux"])
+            
+        self.assertEqual([[p.name for p in level] for level in plan.installation_order],
+                         [["tmux"], ["a", "b"]])
+        self.assertEqual(plan.conflicts_detected, ["Dependency cycle between: a, b"])
+        
+    def test_transitive_closure(self):
+        """Missing dependencies of requested packages are added to the plan."""
+        with patch.object(self.resolver, 'query_installed', return_value={"nodejs": "20"}):
+            plan = self.resolver.resolve_dependencies(["black", "eslint"])
+            
+        self.assertEqual(sorted(p.name for p in plan.packages_to_install), ["black", "eslint", "python3"])
+        
+    def test_levels_batched_per_manager(self):
+        """Each level becomes one transaction per manager, levels run in order."""
+        calls = []
+        
+        def install(packages, manager, dry_run):
+            calls.append((manager, sorted(p.name for p in packages)))
+            return True
+            
+        packages = [self.resolver.catalog.packages[n] for n in ["black", "eslint", "tmux", "python3", "nodejs"]]
+        with patch.object(self.resolver, '_install_with_system_manager', side_effect=install):
+            self.assertTrue(self.resolver.install_packages(packages))
+            
+        self.assertEqual(calls[0], (PackageManager.APT, ["nodejs", "python3", "tmux"]))
+        self.assertEqual(sorted(calls[1:], key=lambda c: c[0].value),
+                         [(PackageManager.NPM, ["eslint"]), (PackageManager.PIP, ["black"])])
+        
+    def test_failed_level_stops(self):
+        """Later levels are not attempted once a level fails."""
+        packages = [self.resolver.catalog.packages[n] for n in ["black", "python3"]]
+        with patch.object(self.resolver, '_install_with_system_manager', return_value=False) as install:
+            self.assertFalse(self.resolver.install_packages(packages))
+            
+        install.assert_called_once()
+
+
+class TestPrefetch(unittest.TestCase):
+    """Test download-only prefetch and its size-capped cache."""
+    
+    def setUp(self):
+        """Create resolver with a temporary download cache."""
+        self.temp_dir = tempfile.mkdtemp()
+        with patch.object(DependencyResolver, '_detect_package_managers',
+                          return_value=[PackageManager.APT, PackageManager.PIP]):
+            self.resolver = DependencyResolver(download_cache_dir=self.temp_dir, download_cache_mb=1)
+            
+    def tearDown(self):
+        """Clean up temp directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def test_download_only_commands(self):
+        """Each manager downloads into the cache the install step reads from."""
+        packages = [self.resolver.catalog.packages["tmux"], Package(name="black", pip_name="black")]
+        apt_dir = os.path.join(self.temp_dir, "apt")
+        
+        with patch('subprocess.run') as run:
+            run.return_value.returncode = 0
+            results = self.resolver.start_prefetch(packages).result(timeout=5)
+            
+        commands = [call[0][0] for call in run.call_args_list]
+        self.assertEqual(results, {"apt": True, "pip": True})
+        self.assertIn("--download-only", commands[0])
+        self.assertIn(f"Dir::Cache::archives={apt_dir}", commands[0])
+        self.assertEqual(commands[1], ["pip", "download", "-d", os.path.join(self.temp_dir, "pip"), "black"])
+        self.assertTrue(os.path.isdir(os.path.join(apt_dir, "partial")))
+        
+        with patch('subprocess.run') as run:
+            self.resolver._install_with_system_manager(packages[:1], PackageManager.APT, dry_run=False)
+        self.assertIn(f"Dir::Cache::archives={apt_dir}", run.call_args[0][0])
+        
+    def test_rpm_prefetch_installs_downloaded_files(self):
+        """yum/dnf download only package files and install the ones fetched this session."""
+        dnf_dir = os.path.join(self.temp_dir, "dnf")
+        command = self.resolver._download_command(PackageManager.DNF, ["tmux"])
+        self.assertIn(f"--downloaddir={dnf_dir}", command)
+        self.assertFalse([option for option in command if "cachedir" in option])
+        
+        def download(command, **kwargs):
+            for name in ["tmux-3.2a-4.el9.x86_64.rpm", "tmux-plugins-1.0-1.noarch.rpm"]:
+                with open(os.path.join(dnf_dir, name), 'w') as f:
+                    f.write("rpm")
+            return subprocess.CompletedProcess(command, 0, "", "")
+            
+        self.resolver.detected_managers = [PackageManager.DNF]
+        with patch('subprocess.run', side_effect=download):
+            self.resolver.prefetch_packages([Package(name="tmux", dnf_name="tmux")])
+            
+        with patch('subprocess.run') as run:
+            self.resolver._install_with_system_manager([Package(name="tmux"), Package(name="htop")],
+                                                       PackageManager.DNF, dry_run=False)
+        self.assertEqual(run.call_args[0][0],
+                         ["sudo", "dnf", "install", "-y", os.path.join(dnf_dir, "tmux-3.2a-4.el9.x86_64.rpm"), "htop"])
+        
+    def test_npm_cache_single_privilege(self):
+        """npm prefetch and install share root's cache, never the user's download cache."""
+        cache = DependencyResolver.NPM_ROOT_CACHE
+        self.assertEqual(self.resolver._download_command(PackageManager.NPM, ["eslint"]),
+                         ["sudo", "-n", "npm", "cache", "add", "--cache", cache, "eslint"])
+        with patch('subprocess.run') as run:
+            self.resolver._install_with_system_manager([Package(name="eslint")], PackageManager.NPM, dry_run=False)
+        self.assertEqual(run.call_args[0][0][:2], ["sudo", "npm"])
+        self.assertIn(cache, run.call_args[0][0])
+        
+    def test_failed_download_is_not_fatal(self):
+        """A prefetch failure is reported, not raised."""
+        with patch('subprocess.run', side_effect=FileNotFoundError("apt-get")):
+            results = self.resolver.prefetch_packages([self.resolver.catalog.packages["tmux"]])
+            
+        self.assertEqual(results, {"apt": False})
+        
+    def test_cache_pruned_to_limit(self):
+        """Least recently used downloads are removed once the cache exceeds its size."""
+        os.makedirs(os.path.join(self.temp_dir, "apt"))
+        for age, name in enumerate(["new.deb", "old.deb"]):
+            path = os.path.join(self.temp_dir, "apt", name)
+            with open(path, 'wb') as f:
+                f.write(b"\0" * 700 * 1024)
+            os.utime(path, (1000 - age * 500, 1000 - age * 500))
+            
+        self.resolver._prune_download_cache()
+        
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, "apt")), ["new.deb"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Test Detection Cache
+Per-boot static facts and field-level TTLs of SystemDetector.snapshot
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.detection_cache import DetectionCache
+from tools.system_detector import SystemDetector, SystemInfo
+
+
+class TestDetectionCache(unittest.TestCase):
+    """Test snapshot caching without re-running probes."""
+    
+    def setUp(self):
+        """Create detector with counting probes and a temporary cache directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.detector = SystemDetector(facts_cache=DetectionCache(cache_dir=self.temp_dir))
+        self.calls = []
+        self._stub_probes(self.detector)
+        
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def _stub_probes(self, detector: SystemDetector):
+        """Replace system probes with ones that record each call."""
+        results = {
+            "platform": {"hostname": "aspire", "os_version": "6.1.0", "architecture": "x86_64",
+                         "python_version": "3.11.2"},
+            "os_distribution": "Debian GNU/Linux 12",
+            "cpu_cores": 4,
+            "package_managers": ["apt", "pip"],
+            "cpu_frequency": 2833.0,
+            "memory": (8 * 1024**3, 6 * 1024**3),
+            "load": 0.5,
+            "disk": (500 * 1024**3, 200 * 1024**3),
+            "network_interfaces": ["eth0"]
+        }
+        for name in SystemDetector.SYSTEM_PROBES:
+            detector.probes.probes[name].func = lambda name=name: self.calls.append(name) or results[name]
+            
+    def test_static_fields_probed_once_per_boot(self):
+        """Static facts are probed once and reused, even by a new detector in the same boot."""
+        with patch('psutil.boot_time', return_value=1700000000.0):
+            info = self.detector.snapshot()
+            self.assertIsInstance(info, SystemInfo)
+            self.assertEqual(info.hostname, "aspire")
+            self.assertEqual(info.package_managers, ["apt", "pip"])
+            self.assertEqual(info.memory_total, 8 * 1024**3)
+            self.assertEqual(sorted(self.calls), sorted(SystemDetector.SYSTEM_PROBES))
+            
+            self.calls.clear()
+            self.detector.snapshot()
+            self.assertEqual(self.calls, [])
+            
+            restarted = SystemDetector(facts_cache=DetectionCache(cache_dir=self.temp_dir))
+            self._stub_probes(restarted)
+            self.assertEqual(restarted.snapshot().os_name, "Debian GNU/Linux 12")
+            self.assertEqual(sorted(self.calls), sorted(SystemDetector.VOLATILE_TTLS))
+            
+    def test_reboot_discards_static_fields(self):
+        """A different boot time probes static facts again."""
+        with patch('psutil.boot_time', return_value=1700000000.0):
+            self.detector.snapshot()
+        self.calls.clear()
+        
+        with patch('psutil.boot_time', return_value=1700090000.0):
+            self.detector.snapshot()
+        self.assertEqual(sorted(self.calls), sorted(SystemDetector.STATIC_PROBES))
+        
+    def test_volatile_fields_refresh_on_demand(self):
+        """max_age=0 re-probes volatile fields only; expired TTLs re-probe just those fields."""
+        with patch('psutil.boot_time', return_value=1700000000.0):
+            self.detector.snapshot()
+            self.calls.clear()
+            
+            self.detector.snapshot(max_age=0)
+            self.assertEqual(sorted(self.calls), sorted(SystemDetector.VOLATILE_TTLS))
+            
+            # Ten seconds later memory is past its TTL, disk is not
+            self.calls.clear()
+            for name in ["disk", "memory"]:
+                probed_at, value = self.detector._volatile[name]
+                self.detector._volatile[name] = (probed_at - 10, value)
+            self.detector.snapshot()
+            self.assertEqual(self.calls, ["memory"])
+            
+    def test_failed_static_probe_not_persisted(self):
+        """A static probe that fell back to its default is retried on the next snapshot."""
+        self.detector.probes.probes["cpu_cores"].func = lambda: 0
+        with patch('psutil.boot_time', return_value=1700000000.0):
+            self.detector.snapshot()
+            self.assertIsNone(self.detector.facts_cache.get(1700000000))
+            
+            self.calls.clear()
+            self.detector.snapshot()
+            self.assertIn("os_distribution", self.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
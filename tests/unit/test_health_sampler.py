@@ -0,0 +1,125 @@
+"""
+Test Health Sampler
+Ring-buffer history and windowed health checks
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import time
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.health_sampler import HealthSampler, RingBuffer
+from tools.system_detector import SystemDetector
+from tools.detection_cache import DetectionCache
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Test fixed-capacity storage."""
+    
+    def test_wraps_without_growing(self):
+        """Old samples are overwritten and the columns never grow."""
+        buffer = RingBuffer(("timestamp", "load"), capacity=4)
+        size = buffer.columns["load"].buffer_info()[1]
+        
+        for i in range(10):
+            buffer.append({"timestamp": float(i), "load": i / 10})
+            
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.values("timestamp"), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(buffer.columns["load"].buffer_info()[1], size)
+
+
+class TestHealthSampler(unittest.TestCase):
+    """Test aggregates, health evaluation and export."""
+    
+    def setUp(self):
+        """Create sampler with synthetic history."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.sampler = HealthSampler(capacity=60)
+        self.detector = SystemDetector(facts_cache=DetectionCache(cache_dir=self.temp_dir))
+        
+    def tearDown(self):
+        """Clean up temporary directory."""
+        self.sampler.stop()
+        shutil.rmtree(self.temp_dir)
+        
+    def _fill(self, memory_percent, temperature=50.0, disk_percent=40.0, seconds_apart=5):
+        """Append one synthetic sample per memory reading, ending now."""
+        now = time.time()
+        for i, memory in enumerate(memory_percent):
+            self.sampler.buffer.append({
+                "timestamp": now - (len(memory_percent) - 1 - i) * seconds_apart,
+                "memory_percent": memory,
+                "disk_percent": disk_percent,
+                "load": 0.5,
+                "temperature": temperature
+            })
+            
+    def test_windowed_aggregates(self):
+        """p95 and EWMA only use samples inside the window and skip unknown values."""
+        self._fill([10.0] * 19 + [95.0])
+        self.sampler.buffer.append({"timestamp": time.time(), "memory_percent": float("nan")})
+        
+        self.assertEqual(self.sampler.percentile("memory_percent", 95), 10.0)
+        self.assertEqual(self.sampler.percentile("memory_percent", 100), 95.0)
+        self.assertAlmostEqual(self.sampler.ewma("memory_percent"), 27.0)
+        self.assertEqual(self.sampler.window("memory_percent", seconds=7), [10.0, 95.0])
+        self.assertIsNone(self.sampler.percentile("net_bytes_sent", 95))
+        
+    def test_single_spike_is_healthy(self):
+        """A momentary memory spike does not fail the check; sustained pressure does."""
+        self._fill([40.0] * 20 + [97.0])
+        self.sampler.sample = lambda: None
+        self.assertTrue(self.detector.health_check(sampler=self.sampler))
+        
+        self._fill([97.0] * 20)
+        self.assertFalse(self.detector.health_check(sampler=self.sampler))
+        
+    def test_sustained_temperature(self):
+        """A CPU that stays hot fails the check."""
+        self._fill([40.0] * 20, temperature=92.0)
+        self.sampler.sample = lambda: None
+        self.assertFalse(self.detector.health_check(sampler=self.sampler))
+        
+    def test_empty_window_falls_back_to_snapshot(self):
+        """Fields the sampler has no readings for come from a fresh snapshot."""
+        self.sampler.sample = lambda: None
+        for reading in [None, {"timestamp": time.time(), "memory_percent": 40.0, "temperature": 50.0}]:
+            if reading:
+                self.sampler.buffer.append(reading)
+            with patch.object(self.detector, 'snapshot', wraps=self.detector.snapshot) as snapshot, \
+                    patch.object(self.detector.logger, 'error') as error:
+                self.detector.health_check(sampler=self.sampler)
+            snapshot.assert_called_once_with(max_age=0)
+            error.assert_not_called()
+        
+    def test_start_samples_immediately(self):
+        """The first reading is taken when sampling starts, not one interval later."""
+        sampler = HealthSampler(interval=60.0, capacity=8)
+        sampler.start()
+        sampler.stop()
+        self.assertEqual(len(sampler.buffer), 1)
+        
+    def test_background_sampling_and_export(self):
+        """The sampler thread records real readings that export as JSON."""
+        sampler = HealthSampler(interval=0.02, capacity=8)
+        sampler.start()
+        time.sleep(0.3)
+        sampler.stop()
+        
+        self.assertEqual(len(sampler.buffer), 8)
+        path = os.path.join(self.temp_dir, "health.json")
+        sampler.export(path)
+        with open(path) as f:
+            exported = json.load(f)
+        self.assertEqual(len(exported["history"]["timestamp"]), 8)
+        self.assertIsNotNone(exported["aggregates"]["memory_percent"]["p95"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
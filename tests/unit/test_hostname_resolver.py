@@ -0,0 +1,79 @@
+"""
+Test Hostname Resolver
+Reverse DNS caching without touching real DNS
+"""
+
+import unittest
+import tempfile
+import socket
+import threading
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.hostname_resolver import HostnameResolver
+
+
+class TestHostnameResolver(unittest.TestCase):
+    """Test cache behaviour and local name index."""
+    
+    def setUp(self):
+        """Point local index at temp files."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.resolver = HostnameResolver(max_entries=2)
+        self.resolver.HOSTS_FILE = os.path.join(self.temp_dir, 'hosts')
+        self.resolver.SSH_CONFIG = os.path.join(self.temp_dir, 'ssh_config')
+        
+    def tearDown(self):
+        """Clean up temp directory."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        
+    def test_negative_caching(self):
+        """Failed lookups are cached and not retried."""
+        with patch('socket.gethostbyaddr', side_effect=socket.herror("no PTR")) as mock_resolve:
+            self.assertIsNone(self.resolver.resolve("192.168.0.41"))
+            self.assertIsNone(self.resolver.resolve("192.168.0.41"))
+            
+        self.assertEqual(mock_resolve.call_count, 1)
+        
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted at max_entries."""
+        with patch('socket.gethostbyaddr', side_effect=lambda ip: (f"host-{ip}", [], [ip])):
+            for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+                self.resolver.resolve(ip)
+                
+        self.assertEqual(self.resolver.lookup_cached("10.0.0.1"), (False, None))
+        self.assertEqual(self.resolver.lookup_cached("10.0.0.3"), (True, "host-10.0.0.3"))
+        
+    def test_local_index_checked_first(self):
+        """ssh config aliases and hosts entries answer without DNS."""
+        with open(self.resolver.SSH_CONFIG, 'w') as f:
+            f.write("Host LLMS\n    HostName 192.168.0.41\n    Port 2222\nHost *\n    HostName 10.9.9.9\n")
+        with open(self.resolver.HOSTS_FILE, 'w') as f:
+            f.write("192.168.0.58  has.lan has  # orchestration\n")
+            
+        with patch('socket.gethostbyaddr') as mock_resolve:
+            self.assertEqual(self.resolver.resolve("192.168.0.41"), "LLMS")
+            self.assertEqual(self.resolver.resolve("192.168.0.58"), "has.lan")
+            
+        mock_resolve.assert_not_called()
+        self.assertEqual(self.resolver.lookup_cached("10.9.9.9"), (False, None))
+        
+    def test_resolve_many_does_not_wait(self):
+        """Slow lookups are returned only once finished."""
+        release = threading.Event()
+        
+        def slow_lookup(ip):
+            release.wait(5)
+            return ("slow.lan", [], [ip])
+            
+        with patch('socket.gethostbyaddr', side_effect=slow_lookup):
+            self.assertEqual(self.resolver.resolve_many(["10.0.0.7"], timeout=0), {})
+            release.set()
+            self.assertEqual(self.resolver.resolve_many(["10.0.0.7"], timeout=5), {"10.0.0.7": "slow.lan"})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Test Install Estimator
+Size metadata parsing, measured history and concurrency-aware time model
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.install_estimator import InstallEstimator, PlannedBatch, MB
+from tools.install_history import InstallHistory
+from tools.dependency_resolver import DependencyResolver, Package, PackageManager
+from tools.package_catalog import PackageCatalog
+
+
+APT_CACHE_SHOW = """Package: tmux
+Version: 3.3a-3
+Installed-Size: 1024
+Depends: libc6 (>= 2.34)
+Description-en: terminal multiplexer
+ tmux enables a number of terminals: to be accessed
+Size: 455736
+
+Package: htop
+Installed-Size: 400
+Size: 152000
+"""
+
+DNF_INFO = """Available Packages
+Name         : tmux
+Version      : 3.3a
+Size         : 478 k
+Repository   : fedora
+"""
+
+PACMAN_SI = """Repository      : extra
+Name            : tmux
+Download Size   : 0.45 MiB
+Installed Size  : 1.03 MiB
+"""
+
+
+class TestInstallEstimator(unittest.TestCase):
+    """Test size parsing and the wall time model."""
+    
+    def setUp(self):
+        """Create estimator with a temporary history store."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history = InstallHistory(state_dir=self.temp_dir, host="test-host")
+        self.estimator = InstallEstimator(history=self.history)
+        
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def test_apt_sizes(self):
+        """apt-cache reports download bytes and installed KiB."""
+        with patch.object(self.estimator, '_run_query', return_value=APT_CACHE_SHOW) as run:
+            sizes = self.estimator.sizes("apt", ["tmux", "htop", "unknown"])
+            self.estimator.sizes("apt", ["tmux"])
+            
+        run.assert_called_once()
+        self.assertEqual(sizes["tmux"], (455736, 1024 * 1024))
+        self.assertEqual(sizes["htop"], (152000, 400 * 1024))
+        self.assertEqual(sizes["unknown"], InstallEstimator.DEFAULT_SIZES["apt"])
+        
+    def test_dnf_and_pacman_sizes(self):
+        """Unit suffixes are converted; a missing installed size is derived from the download."""
+        with patch.object(self.estimator, '_run_query', return_value=DNF_INFO):
+            self.assertEqual(self.estimator.sizes("dnf", ["tmux"])["tmux"],
+                             (478 * 1024, 478 * 1024 * InstallEstimator.INSTALLED_RATIO))
+        with patch.object(self.estimator, '_run_query', return_value=PACMAN_SI):
+            download, installed = self.estimator.sizes("pacman", ["tmux"])["tmux"]
+        self.assertEqual(download, int(0.45 * MB))
+        self.assertEqual(installed, int(1.03 * MB))
+        
+    def test_missing_manager_uses_defaults(self):
+        """A manager that cannot be run falls back to default sizes."""
+        with patch.object(self.estimator, '_run_query', side_effect=FileNotFoundError("pacman")):
+            self.assertEqual(self.estimator.sizes("pacman", ["tmux"])["tmux"],
+                             InstallEstimator.DEFAULT_SIZES["pacman"])
+                             
+    def _batch(self, manager, group, level, names, depends_on=()):
+        """Planned batch whose manager names equal the catalog names."""
+        return PlannedBatch(manager, group, level, list(names), list(names), list(depends_on))
+        
+    def test_concurrency_model(self):
+        """Separate lock groups overlap, a shared one and dependencies serialize."""
+        self.estimator.DOWNLOAD_RATE = 1000 * MB
+        self.history.record("apt", {"tmux": 20.0, "python3": 20.0})
+        self.history.record("pip", {"black": 10.0})
+        self.history.record("npm", {"eslint": 10.0})
+        apt = 20.0 + InstallEstimator.TRANSACTION_SECONDS["apt"]
+        pip = 10.0 + InstallEstimator.TRANSACTION_SECONDS["pip"]
+        npm = 10.0 + InstallEstimator.TRANSACTION_SECONDS["npm"]
+        
+        with patch.object(self.estimator, '_run_query', return_value=""):
+            parallel = self.estimator.estimate([self._batch("apt", "dpkg", 1, ["tmux"]),
+                                                self._batch("pip", "pip:/usr/bin", 1, ["black"]),
+                                                self._batch("npm", "npm-global", 1, ["eslint"])])
+            dependent = self.estimator.estimate([self._batch("apt", "dpkg", 1, ["python3"]),
+                                                 self._batch("pip", "pip:/usr/bin", 2, ["black"], ["python3"])])
+            same_group = self.estimator.estimate([self._batch("apt", "dpkg", 1, ["tmux"]),
+                                                  self._batch("apt", "dpkg", 2, ["python3"])])
+                                                  
+        self.assertEqual(parallel.seconds, apt)
+        self.assertEqual(dependent.seconds, apt + pip)
+        self.assertEqual(same_group.seconds, 2 * apt)
+        self.assertLess(parallel.seconds, apt + pip + npm)
+        
+    def test_bandwidth_bound(self):
+        """Parallel transactions cannot download faster than the link."""
+        with patch.object(self.estimator, '_run_query', return_value=""):
+            estimate = self.estimator.estimate([self._batch("snap", "snapd", 1, ["a", "b", "c", "d"])])
+        download = 4 * InstallEstimator.DEFAULT_SIZES["snap"][0]
+        self.assertEqual(estimate.download_bytes, download)
+        self.assertGreaterEqual(estimate.seconds, download / InstallEstimator.DOWNLOAD_RATE)
+        
+    def test_record_splits_by_size(self):
+        """Measured time minus transaction overhead is shared in proportion to package size."""
+        with patch.object(self.estimator, '_run_query', return_value=APT_CACHE_SHOW):
+            self.estimator.sizes("apt", ["tmux", "htop"])
+        self.estimator.record("apt", ["tmux", "htop"], 15.0)
+        
+        durations = self.history.durations("apt")
+        overhead = InstallEstimator.TRANSACTION_SECONDS["apt"]
+        self.assertAlmostEqual(durations["tmux"] + durations["htop"], 15.0 - overhead, places=2)
+        self.assertGreater(durations["tmux"], durations["htop"])
+        
+    def test_history_smoothing(self):
+        """Repeat measurements move the average toward the new sample, per host class."""
+        self.history.record("apt", {"tmux": 10.0})
+        self.history.record("apt", {"tmux": 20.0})
+        self.assertAlmostEqual(self.history.durations("apt")["tmux"], 13.0)
+        
+        other_host = InstallHistory(state_dir=self.temp_dir, host="other-host")
+        self.assertEqual(other_host.durations("apt"), {})
+
+
+class TestResolverEstimate(unittest.TestCase):
+    """Test plan estimates built by the resolver."""
+    
+    def test_plan_uses_estimator(self):
+        """The plan carries modelled time and sizes instead of per-package constants."""
+        with patch.object(DependencyResolver, '_detect_package_managers',
+                          return_value=[PackageManager.APT, PackageManager.PIP]):
+            resolver = DependencyResolver(catalog=PackageCatalog([
+                Package(name="tmux", apt_name="tmux"),
+                Package(name="htop", apt_name="htop")
+            ]))
+            
+        with patch.object(resolver, 'query_installed', return_value={}), \
+                patch.object(resolver.estimator, '_run_query', return_value=APT_CACHE_SHOW) as run:
+            plan = resolver.resolve_dependencies(["tmux", "htop"])
+            
+        run.assert_called_once()
+        self.assertEqual(plan.download_size, 1)
+        self.assertEqual(plan.disk_space_required, 2)
+        expected = resolver.estimator.batch_seconds("apt", ["tmux", "htop"])
+        self.assertEqual(plan.estimated_time, int(expected) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Test Install Executor
+Concurrent per-manager installation without running any package manager
+"""
+
+import unittest
+import threading
+import time
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.dependency_resolver import DependencyResolver, Package, PackageManager
+from tools.install_executor import InstallExecutor
+
+
+class TestInstallExecutor(unittest.TestCase):
+    """Test partitioning, lock groups and progress events."""
+    
+    def setUp(self):
+        """Create resolver with apt, pip and npm."""
+        with patch.object(DependencyResolver, '_detect_package_managers',
+                          return_value=[PackageManager.APT, PackageManager.PIP, PackageManager.NPM]):
+            self.resolver = DependencyResolver()
+        self.executor = InstallExecutor(self.resolver)
+        
+        self.tmux = Package(name="tmux", apt_name="tmux")
+        self.black = Package(name="black", pip_name="black")
+        self.eslint = Package(name="eslint", npm_name="eslint")
+        
+    def _slow_install(self, delay: float, result: bool = True):
+        """Fake installer that sleeps and records concurrency."""
+        self.active = 0
+        self.peak = 0
+        guard = threading.Lock()
+        
+        def install(packages, manager, dry_run):
+            with guard:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(delay)
+            with guard:
+                self.active -= 1
+            return result
+            
+        return install
+        
+    def test_partitions_run_concurrently(self):
+        """Wall-clock time approaches the longest partition, not the sum."""
+        with patch.object(self.resolver, '_install_with_system_manager', side_effect=self._slow_install(0.2)):
+            start = time.monotonic()
+            events = list(self.executor.execute_levels([[self.tmux, self.black, self.eslint]]))
+            elapsed = time.monotonic() - start
+            
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(self.peak, 3)
+        self.assertEqual(sorted(e.manager for e in events if e.status == "finished"), ["apt", "npm", "pip"])
+        
+    def test_same_lock_group_serializes(self):
+        """Managers sharing an on-disk lock never run at the same time."""
+        self.resolver.detected_managers = [PackageManager.YUM, PackageManager.PIP]
+        rpm_package = Package(name="tmux", yum_name="tmux")
+        self.assertEqual(self.executor.lock_group(PackageManager.YUM), self.executor.lock_group(PackageManager.DNF))
+        
+        with patch.object(self.executor, 'lock_group', return_value="shared"), \
+             patch.object(self.resolver, '_install_with_system_manager', side_effect=self._slow_install(0.05)):
+            list(self.executor.execute_levels([[rpm_package, self.black]]))
+            
+        self.assertEqual(self.peak, 1)
+        
+    def test_pip_lock_is_per_environment(self):
+        """pip is locked by the environment its executable lives in."""
+        with patch('tools.install_executor.which', return_value="/opt/venv/bin/pip"):
+            self.assertEqual(self.executor.lock_group(PackageManager.PIP), "pip:/opt/venv/bin")
+            
+    def test_failed_dependency_skips_dependents(self):
+        """Dependents of a failed batch are skipped, independent work still runs."""
+        self.black.depends_on = ["tmux"]
+        
+        def install(packages, manager, dry_run):
+            return manager != PackageManager.APT
+            
+        with patch.object(self.resolver, '_install_with_system_manager', side_effect=install):
+            events = list(self.executor.execute_levels([[self.tmux, self.eslint], [self.black]]))
+            
+        statuses = {(e.manager, e.status) for e in events}
+        self.assertIn(("apt", "failed"), statuses)
+        self.assertIn(("pip", "skipped"), statuses)
+        self.assertIn(("npm", "finished"), statuses)
+        
+    def test_max_workers_caps_transactions(self):
+        """max_workers limits concurrent transactions without deadlocking dependents."""
+        self.black.depends_on = ["tmux"]
+        executor = InstallExecutor(self.resolver, max_workers=1)
+        
+        with patch.object(self.resolver, '_install_with_system_manager', side_effect=self._slow_install(0.02)):
+            events = list(executor.execute_levels([[self.tmux, self.eslint], [self.black]]))
+            
+        self.assertEqual(self.peak, 1)
+        self.assertEqual(len([e for e in events if e.status == "finished"]), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Test Install Journal
+Write-ahead step journal and resumed workstation installations
+"""
+
+import unittest
+import tempfile
+import shutil
+import logging
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.install_journal import InstallJournal
+from tools.wizard_context import WizardContext
+from tools.dependency_resolver import DependencyResolver, InstallationPlan, Package, PackageManager
+from wizards.workstation_setup import WorkstationWizard, WorkstationConfig
+
+
+class TestInstallJournal(unittest.TestCase):
+    """Test journal records, checksums and crash tolerance."""
+    
+    def setUp(self):
+        """Create journal in a temporary state directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal = InstallJournal("test", state_dir=self.temp_dir)
+        
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def test_latest_state_wins(self):
+        """A step is done only once its last record says so, with the same checksum."""
+        checksum = InstallJournal.checksum("apt", ["tmux"])
+        self.journal.record("install:apt:tmux", "started", checksum)
+        self.assertFalse(self.journal.is_done("install:apt:tmux", checksum))
+        
+        self.journal.record("install:apt:tmux", "done", checksum)
+        self.assertTrue(self.journal.is_done("install:apt:tmux", checksum))
+        self.assertFalse(self.journal.is_done("install:apt:tmux", InstallJournal.checksum("apt", ["htop"])))
+        
+    def test_torn_record(self):
+        """A half-written record is ignored and later records stay readable."""
+        checksum = InstallJournal.checksum("step")
+        self.journal.record("first", "done", checksum)
+        with open(self.journal.path, 'a') as f:
+            f.write('{"version": 1, "step": "sec')
+        self.journal.record("third", "done", checksum)
+        
+        self.assertEqual(set(self.journal.load()), {"first", "third"})
+        
+    def test_complete_discards(self):
+        """A completed run leaves no journal behind."""
+        self.journal.record("step", "done", "x")
+        self.journal.complete()
+        self.assertFalse(os.path.exists(self.journal.path))
+        self.assertEqual(self.journal.load(), {})
+        self.journal.complete()
+
+
+class TestResumedInstallation(unittest.TestCase):
+    """Test that a rerun after a failure skips completed steps."""
+    
+    def setUp(self):
+        """Create wizard with apt and pip and a journal in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        with patch.object(DependencyResolver, '_detect_package_managers',
+                          return_value=[PackageManager.APT, PackageManager.PIP]):
+            resolver = DependencyResolver()
+            
+        context = WizardContext()
+        context._instances["dependency_resolver"] = resolver
+        with patch.object(WorkstationWizard, 'setup_logging'):
+            self.wizard = WorkstationWizard(context=context)
+        self.wizard.logger = logging.getLogger(__name__)
+        self.wizard.journal = InstallJournal("workstation", state_dir=self.temp_dir)
+        
+        tmux = Package(name="tmux", apt_name="tmux")
+        black = Package(name="black", pip_name="black")
+        self.plan = {
+            "packages": InstallationPlan([tmux, black], [], [], [[tmux, black]], 0, 0),
+            "configuration_steps": [{"name": "configure_ssh"}]
+        }
+        self.config = WorkstationConfig(hostname="aspire")
+        
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def _run(self, failing_manager=None):
+        """Execute the plan, returning the managers invoked and whether it raised."""
+        resolver = self.wizard.dependency_resolver
+        installed = []
+        
+        def install(packages, manager, dry_run):
+            installed.append(manager.value)
+            return manager.value != failing_manager
+            
+        with patch.object(resolver, '_install_with_system_manager', side_effect=install), \
+                patch.object(resolver, 'update_package_lists', return_value=True) as update, \
+                patch.object(resolver, 'record_install'), \
+                patch.object(self.wizard, '_configure_ssh_server') as ssh, \
+                patch('builtins.print'):
+            try:
+                self.wizard.execute_installation(self.plan, self.config)
+                failed = False
+            except Exception:
+                failed = True
+        return sorted(installed), update.call_count, ssh.call_count, failed
+        
+    def test_resume_skips_completed_steps(self):
+        """Only the failed batch and the steps after it run again."""
+        self.assertEqual(self._run(failing_manager="pip"), (["apt", "pip"], 1, 0, True))
+        self.assertEqual(self._run(), (["pip"], 0, 1, False))
+        
+        # The successful run discarded the journal, so the next one starts fresh
+        self.assertFalse(os.path.exists(self.wizard.journal.path))
+        self.assertEqual(self._run(), (["apt", "pip"], 1, 1, False))
+        
+    def test_changed_config_redoes_step(self):
+        """A configuration step recorded with a different checksum runs again."""
+        with patch.object(self.wizard, '_setup_tmux_ecosystem', side_effect=RuntimeError("tmux")):
+            self.plan["configuration_steps"].append({"name": "setup_tmux"})
+            self.assertTrue(self._run()[3])
+            
+        self.config.ssh_port = 2200
+        self.plan["configuration_steps"].pop()
+        self.assertEqual(self._run(), ([], 0, 1, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
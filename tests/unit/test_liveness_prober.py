@@ -0,0 +1,63 @@
+"""
+Test Liveness Prober
+Local-only checks for in-process host liveness detection
+"""
+
+import unittest
+import asyncio
+import socket
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.liveness_prober import LivenessProber
+
+
+class TestLivenessProber(unittest.TestCase):
+    """Test ICMP packet handling and the TCP fallback sweep."""
+    
+    def setUp(self):
+        """Force TCP fallback against a localhost listener."""
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        
+        self.prober = LivenessProber(fallback_ports=[self.listener.getsockname()[1]])
+        self.prober._icmp_available = False
+        
+    def tearDown(self):
+        """Close listener."""
+        self.listener.close()
+        
+    def test_echo_request_checksum(self):
+        """Echo request checksum verifies to zero."""
+        packet = self.prober._build_echo_request(7)
+        self.assertEqual(self.prober._checksum(packet), 0)
+        
+    def test_echo_reply_matching(self):
+        """Replies are matched by sequence and source address."""
+        sent = {3: ("192.168.0.41", 0.0)}
+        reply = b"\x00\x00\x00\x00\x00\x01\x00\x03"
+        
+        self.assertIsNone(self.prober._handle_echo_reply(reply, ("192.168.0.58", 0), sent))
+        ip, _ = self.prober._handle_echo_reply(reply, ("192.168.0.41", 0), sent)
+        self.assertEqual(ip, "192.168.0.41")
+        self.assertEqual(sent, {})
+        
+    def test_tcp_fallback_sweep(self):
+        """Listening and refusing hosts are both alive."""
+        results = self.prober.probe_hosts(["127.0.0.1", "127.0.0.2"], timeout=0.5)
+        
+        self.assertEqual(set(results), {"127.0.0.1", "127.0.0.2"})
+        self.assertTrue(all(rtt >= 0 for rtt in results.values()))
+        
+    def test_async_tcp_fallback_sweep(self):
+        """Async sweep reports the same hosts as the sync sweep."""
+        async def collect():
+            return [ip async for ip, _ in self.prober.aiter_probe(["127.0.0.1"], timeout=0.5)]
+            
+        self.assertEqual(asyncio.run(collect()), ["127.0.0.1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
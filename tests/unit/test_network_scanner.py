@@ -0,0 +1,358 @@
+"""
+Test Network Scanner
+Discovery helpers that run without touching the network
+"""
+
+import unittest
+import tempfile
+import threading
+import time
+import json
+import subprocess
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.network_scanner import AdaptiveTimeout, NetworkScanner, ServerInfo
+from tools.topology_cache import TopologyCache
+from tools.port_profiles import PortProfiles
+
+
+PROC_NET_ARP = """IP address       HW type     Flags       HW address            Mask     Device
+192.168.0.1      0x1         0x2         aa:bb:cc:dd:ee:01     *        wlan0
+192.168.0.41     0x1         0x2         aa:bb:cc:dd:ee:29     *        wlan0
+192.168.0.58     0x1         0x0         00:00:00:00:00:00     *        wlan0
+10.0.0.5         0x1         0x2         aa:bb:cc:dd:ee:05     *        docker0
+"""
+
+
+class TestNeighborDiscovery(unittest.TestCase):
+    """Test neighbor-table seeding of host discovery."""
+    
+    def setUp(self):
+        """Write fake ARP table."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.arp_path = os.path.join(self.temp_dir, 'arp')
+        with open(self.arp_path, 'w') as f:
+            f.write(PROC_NET_ARP)
+            
+        self.scanner = NetworkScanner()
+        
+    def tearDown(self):
+        """Clean up temp directory."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        
+    def test_incomplete_entries_skipped(self):
+        """Only complete ARP entries are treated as alive."""
+        neighbors = self.scanner._read_proc_arp(self.arp_path)
+        self.assertEqual(neighbors, ["192.168.0.1", "192.168.0.41", "10.0.0.5"])
+        
+    def test_malformed_lines_skipped(self):
+        """Short or unparsable lines do not abort ARP seeding."""
+        with open(self.arp_path, 'a') as f:
+            f.write("192.168.0.77 0x1\n192.168.0.78 0x1 bogus aa:bb:cc:dd:ee:4e * wlan0\n")
+        neighbors = self.scanner._read_proc_arp(self.arp_path)
+        self.assertEqual(neighbors, ["192.168.0.1", "192.168.0.41", "10.0.0.5"])
+        
+    def test_neighbors_filtered_by_subnet(self):
+        """Known hosts are ordered first and limited to the scanned subnet."""
+        with patch.object(self.scanner, '_read_proc_arp',
+                          return_value=self.scanner._read_proc_arp(self.arp_path)):
+            known, unknown = self.scanner._order_hosts_for_discovery(
+                "192.168.0.0/24", ["192.168.0.1", "192.168.0.2", "192.168.0.41"]
+            )
+            
+        self.assertEqual(known, ["192.168.0.1", "192.168.0.41"])
+        self.assertEqual(unknown, ["192.168.0.2"])
+        
+    def test_local_ip_from_default_route(self):
+        """The LAN address comes from the default route, not a hostname mapped to 127.0.1.1."""
+        route = subprocess.CompletedProcess([], 0, "default via 192.168.0.1 dev wlan0 proto dhcp\n", "")
+        with patch('subprocess.run', return_value=route), \
+                patch('socket.gethostbyname', return_value="127.0.1.1"), \
+                patch.object(self.scanner, 'default_route_address', return_value="192.168.0.20") as address:
+            info = self.scanner.get_local_network_info()
+            
+        address.assert_called_once_with("192.168.0.1")
+        self.assertEqual((info["local_ip"], info["subnet"]), ("192.168.0.20", "192.168.0.0/24"))
+        self.assertNotEqual(self.scanner.default_route_address("127.0.0.1"), "127.0.0.1")
+
+
+class TestTopologyCache(unittest.TestCase):
+    """Test incremental rescans backed by the topology cache."""
+    
+    SUBNET = "192.168.0.0/24"
+    
+    def setUp(self):
+        """Create cache in temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = TopologyCache(cache_dir=self.temp_dir, ttl=60)
+        self.scanner = NetworkScanner(cache=self.cache)
+        
+    def tearDown(self):
+        """Clean up temp directory."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        
+    def _server(self, ip: str) -> ServerInfo:
+        return ServerInfo(
+            ip_address=ip, hostname=None, open_ports=[22], ssh_port=22,
+            services={"22": "ssh"}, ping_time=0.4, server_type=None
+        )
+        
+    def test_round_trip(self):
+        """Stored servers come back as ServerInfo objects."""
+        self.cache.store(self.SUBNET, ["192.168.0.41"], [self._server("192.168.0.41")])
+        
+        servers = self.cache.get_servers(self.SUBNET)
+        self.assertEqual(servers, [self._server("192.168.0.41")])
+        
+    def test_fresh_sweep_skips_probing(self):
+        """A recent full sweep means nothing needs re-probing."""
+        hosts = ["192.168.0.41", "192.168.0.58"]
+        self.cache.store(self.SUBNET, hosts, [self._server("192.168.0.41")], full_sweep=True)
+        
+        cached, to_probe, full_sweep = self.scanner._plan_incremental_scan(self.SUBNET, hosts, False)
+        
+        self.assertEqual([s.ip_address for s in cached], ["192.168.0.41"])
+        self.assertEqual(to_probe, [])
+        self.assertFalse(full_sweep)
+        
+    def test_stale_entries_reprobed(self):
+        """Entries older than max_age are re-probed, fresh ones are reused."""
+        hosts = ["192.168.0.41", "192.168.0.58"]
+        self.cache.store(self.SUBNET, hosts, [self._server(ip) for ip in hosts], full_sweep=True)
+        
+        self.scanner.max_age = -1  # Everything is stale
+        cached, to_probe, full_sweep = self.scanner._plan_incremental_scan(self.SUBNET, hosts, False)
+        
+        self.assertEqual(cached, [])
+        self.assertEqual(to_probe, hosts)
+        self.assertTrue(full_sweep)
+        
+    def test_rescan_bypasses_cache(self):
+        """--rescan ignores cached entries."""
+        self.cache.store(self.SUBNET, [], [self._server("192.168.0.41")], full_sweep=True)
+        self.scanner.rescan = True
+        
+        cached, to_probe, _ = self.scanner._plan_incremental_scan(self.SUBNET, ["192.168.0.41"], False)
+        
+        self.assertEqual(cached, [])
+        self.assertEqual(to_probe, ["192.168.0.41"])
+
+
+class TestHostnameCollection(unittest.TestCase):
+    """Test that reverse lookups reach results and the cache without delaying the scan."""
+    
+    SUBNET = "192.168.0.0/24"
+    
+    def setUp(self):
+        """Create scanner with a cache in temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = TopologyCache(cache_dir=self.temp_dir, ttl=60)
+        self.scanner = NetworkScanner(cache=self.cache)
+        
+    def tearDown(self):
+        """Clean up temp directory."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        
+    def test_hostname_set_before_result(self):
+        """The reverse lookup started with the port scan is in the returned result."""
+        with patch.object(self.scanner.hostname_resolver, '_lookup_and_store', return_value="llms.lan"), \
+                patch.object(self.scanner, 'scan_common_ports', return_value=[22]):
+            server = self.scanner._scan_single_host("192.168.0.41", 0.1, ping_time=0.4)
+            
+        self.assertEqual(server.hostname, "llms.lan")
+        
+    def test_late_hostname_stored(self):
+        """A lookup finishing after the result was yielded reaches the cache, not the yielded object."""
+        server = ServerInfo(
+            ip_address="192.168.0.41", hostname=None, open_ports=[22], ssh_port=22,
+            services={"22": "ssh"}, ping_time=0.4, server_type=None
+        )
+        with patch.object(self.scanner.hostname_resolver, 'resolve_many',
+                          return_value={"192.168.0.41": "late.lan"}):
+            self.scanner._store_scan_results(self.SUBNET, ["192.168.0.41"], [server], True)
+            
+        self.assertIsNone(server.hostname)
+        self.assertEqual(self.cache.get_servers(self.SUBNET)[0].hostname, "late.lan")
+
+
+class TestAdaptiveTimeout(unittest.TestCase):
+    """Test RTT-derived probe timeouts."""
+    
+    def setUp(self):
+        """Create estimator with default floor and ceiling."""
+        self.timeouts = AdaptiveTimeout(floor=0.02, ceiling=1.0)
+        
+    def test_unknown_host_uses_ceiling(self):
+        """Hosts without RTT samples get the full timeout."""
+        self.assertEqual(self.timeouts.timeout_for("192.168.0.41"), 1.0)
+        self.assertEqual(self.timeouts.sweep_timeout(2.0, ["192.168.0.41"]), 2.0)
+        
+    def test_lan_host_clamped_to_floor(self):
+        """Sub-millisecond LAN hosts get the floor timeout."""
+        for _ in range(5):
+            self.timeouts.observe("192.168.0.41", 0.0003)
+            
+        self.assertEqual(self.timeouts.timeout_for("192.168.0.41"), 0.02)
+        self.assertEqual(self.timeouts.sweep_timeout(2.0, ["192.168.0.41"]), 0.25)
+        
+        # Unmeasured hosts in the same sweep keep the full window
+        self.assertEqual(self.timeouts.sweep_timeout(2.0, ["192.168.0.41", "192.168.0.2"]), 2.0)
+        
+    def test_slow_host_clamped_to_ceiling(self):
+        """Jittery slow hosts never exceed the ceiling."""
+        for rtt in (0.4, 0.9, 0.2, 1.5):
+            self.timeouts.observe("10.0.0.5", rtt)
+            
+        self.assertEqual(self.timeouts.timeout_for("10.0.0.5", ceiling=0.5), 0.5)
+        
+    def test_variance_widens_timeout(self):
+        """Timeout follows SRTT plus four times the variance."""
+        self.timeouts.observe("192.168.0.58", 0.1)
+        
+        # First sample: SRTT=0.1, RTTVAR=0.05
+        self.assertAlmostEqual(self.timeouts.timeout_for("192.168.0.58"), 0.3)
+
+
+class TestStreamingExport(unittest.TestCase):
+    """Test topology export built on the streaming iterator."""
+    
+    def test_export_is_valid_json(self):
+        """Incrementally written export parses and counts servers."""
+        scanner = NetworkScanner()
+        servers = [
+            ServerInfo("192.168.0.41", "llms", [22, 2222, 8080, 11434], 22,
+                       {}, 0.4, "llm_server"),
+            ServerInfo("192.168.0.1", None, [80], None, {}, 0.2, None),
+        ]
+        network_info = {"local_ip": "192.168.0.10", "subnet": "192.168.0.0/24",
+                        "gateway": "192.168.0.1"}
+        
+        with tempfile.NamedTemporaryFile(suffix=".json") as f:
+            with patch.object(scanner, 'get_local_network_info', return_value=network_info), \
+                 patch.object(scanner, 'iter_subnet', return_value=iter(servers)):
+                scanner.export_topology(f.name)
+                
+            with open(f.name) as exported:
+                topology = json.load(exported)
+                
+        self.assertEqual(topology["total_hosts"], 2)
+        self.assertEqual(topology["servers"][0]["hostname"], "llms")
+        self.assertEqual([s["ip_address"] for s in topology["ecosystem_servers"]], ["192.168.0.41"])
+        
+    def test_failed_scan_keeps_previous_export(self):
+        """An exception mid-scan leaves the earlier export intact and no temp file behind."""
+        scanner = NetworkScanner()
+        network_info = {"local_ip": "192.168.0.10", "subnet": "192.168.0.0/24",
+                        "gateway": "192.168.0.1"}
+                        
+        def failing_scan(subnet):
+            yield ServerInfo("192.168.0.1", None, [80], None, {}, 0.2, None)
+            raise OSError("network unreachable")
+            
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "topology.json")
+        with open(path, 'w') as f:
+            f.write('{"total_hosts": 3}')
+            
+        with patch.object(scanner, 'get_local_network_info', return_value=network_info), \
+             patch.object(scanner, 'iter_subnet', side_effect=failing_scan):
+            with self.assertRaises(OSError):
+                scanner.export_topology(path)
+                
+        with open(path) as f:
+            self.assertEqual(json.load(f), {"total_hosts": 3})
+        self.assertEqual(os.listdir(temp_dir), ["topology.json"])
+        import shutil
+        shutil.rmtree(temp_dir)
+        
+    def test_early_exit_stops_feed(self):
+        """Abandoning the iterator stops host submission without errors in the feed thread."""
+        scanner = NetworkScanner()
+        errors = []
+        hook = threading.excepthook
+        threading.excepthook = errors.append
+        
+        def sweep(hosts, timeout):
+            for ip in hosts:
+                time.sleep(0.005)
+                yield ip, 0.4
+                
+        try:
+            with patch.object(scanner, '_plan_incremental_scan',
+                              return_value=([], [f"192.168.0.{i}" for i in range(1, 60)], True)), \
+                 patch.object(scanner, '_order_hosts_for_discovery',
+                              side_effect=lambda subnet, hosts: ([], hosts)), \
+                 patch.object(scanner.liveness_prober, 'iter_probe', side_effect=sweep), \
+                 patch.object(scanner, '_scan_single_host',
+                              side_effect=lambda ip, timeout, ping: ServerInfo(ip, None, [22], 22, {}, ping, None)):
+                servers = scanner.iter_subnet("192.168.0.0/24")
+                next(servers)
+                servers.close()
+                time.sleep(0.1)
+        finally:
+            threading.excepthook = hook
+            
+        self.assertEqual(errors, [])
+
+
+class TestPortProfiles(unittest.TestCase):
+    """Test profile-driven port selection and role classification."""
+    
+    def setUp(self):
+        """Write a small profile file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'profiles.json')
+        with open(self.path, 'w') as f:
+            json.dump({
+                "match_threshold": 0.6,
+                "extra_ports": [443],
+                "roles": {
+                    "llm_server": {"ports": [22, 2222, 8080, 11434]},
+                    "database": {"ports": [22, 2222, 5432, 6379, 3306]}
+                },
+                "services": {"22": "ssh", "5432": "postgresql"}
+            }, f)
+            
+    def tearDown(self):
+        """Clean up temp directory."""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+        
+    def test_probe_ports_cover_profiles(self):
+        """Every port a role relies on is probed."""
+        scanner = NetworkScanner(profiles_path=self.path)
+        
+        self.assertEqual(scanner.probe_ports, [22, 443, 2222, 3306, 5432, 6379, 8080, 11434])
+        
+    def test_classify(self):
+        """Roles need the threshold share of their ports, first role wins ties."""
+        profiles = PortProfiles.load(self.path)
+        
+        self.assertEqual(profiles.classify([22, 8080, 11434]), "llm_server")
+        self.assertEqual(profiles.classify([22, 5432, 6379]), "database")
+        self.assertEqual(profiles.classify([22, 2222, 5432, 6379, 3306]), "database")
+        self.assertEqual(profiles.classify([22, 2222, 8080, 5432, 6379, 3306]), "llm_server")
+        self.assertIsNone(profiles.classify([22, 443]))
+        self.assertEqual(profiles.identify_services([22, 443, 5432]), {"22": "ssh", "5432": "postgresql"})
+        
+    def test_compiled_once(self):
+        """Unchanged profile files reuse the compiled index."""
+        self.assertIs(PortProfiles.load(self.path), PortProfiles.load(self.path))
+        
+    def test_fallback_matches_builtin_roles(self):
+        """Missing profile file falls back to ECOSYSTEM_SERVERS."""
+        scanner = NetworkScanner(profiles_path=os.path.join(self.temp_dir, 'missing.json'))
+        server = ServerInfo("10.0.0.2", None, [22, 2222, 8123, 3000], 22, {}, 1.0, None)
+        
+        self.assertEqual(scanner.identify_server_type(server), "orchestration")
+        self.assertIn(9200, scanner.probe_ports)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
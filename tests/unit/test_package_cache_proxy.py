@@ -0,0 +1,159 @@
+"""
+Test Package Cache Proxy
+Offline checks against a local stand-in upstream
+"""
+
+import unittest
+import tempfile
+import shutil
+import threading
+import urllib.request
+import urllib.error
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.package_cache_proxy import DiskLRUCache, PackageCacheProxy
+from tools.dependency_resolver import DependencyResolver, PackageManager
+
+
+class FakeUpstream(BaseHTTPRequestHandler):
+    """Serves a simple index and artifact files, counting requests."""
+    
+    requests = []
+    
+    def do_GET(self):
+        FakeUpstream.requests.append(self.path)
+        if self.path.startswith("/simple/"):
+            host = self.headers["Host"]
+            body = f'<a href="http://{host}/packages/demo-1.0-py3-none-any.whl">demo</a>'.encode()
+            content_type = "text/html"
+        elif self.path.endswith((".whl", ".deb")):
+            body = b"artifact:" + self.path.encode()
+            content_type = "application/octet-stream"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPackageCacheProxy(unittest.TestCase):
+    """Test caching, rewriting and eviction through a real local proxy."""
+    
+    def setUp(self):
+        """Start fake upstream and proxy on ephemeral ports."""
+        FakeUpstream.requests = []
+        self.upstream = ThreadingHTTPServer(("127.0.0.1", 0), FakeUpstream)
+        threading.Thread(target=self.upstream.serve_forever, args=(0.1,), daemon=True).start()
+        self.upstream_url = f"http://127.0.0.1:{self.upstream.server_address[1]}"
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.proxy = PackageCacheProxy(
+            cache_dir=self.temp_dir, host="127.0.0.1", port=0, timeout=5,
+            upstreams={"pypi": f"{self.upstream_url}/simple", "files": self.upstream_url},
+            allowed_hosts=["127.0.0.1"]
+        )
+        self.proxy.start()
+        self.proxy_url = f"http://127.0.0.1:{self.proxy.port}"
+        
+    def tearDown(self):
+        """Stop servers and clean up."""
+        self.proxy.stop()
+        self.upstream.shutdown()
+        self.upstream.server_close()
+        shutil.rmtree(self.temp_dir)
+        
+    def _get(self, url: str, proxy: bool = False):
+        """GET through urllib, optionally using the proxy as an HTTP proxy."""
+        handlers = [urllib.request.ProxyHandler({"http": self.proxy_url} if proxy else {})]
+        with urllib.request.build_opener(*handlers).open(url, timeout=5) as response:
+            return response.headers.get("X-Cache"), response.read()
+            
+    def test_artifact_downloaded_once(self):
+        """Second request for an artifact is served from disk."""
+        url = f"{self.proxy_url}/files/packages/demo-1.0-py3-none-any.whl"
+        
+        first = self._get(url)
+        second = self._get(url)
+        
+        self.assertEqual(first, ("MISS", b"artifact:/packages/demo-1.0-py3-none-any.whl"))
+        self.assertEqual(second, ("HIT", first[1]))
+        self.assertEqual(FakeUpstream.requests, ["/packages/demo-1.0-py3-none-any.whl"])
+        
+    def test_index_links_rewritten(self):
+        """Index pages point artifact links back at the proxy."""
+        _, body = self._get(f"{self.proxy_url}/pypi/demo/")
+        
+        self.assertIn(f"{self.proxy_url}/files/packages/demo-1.0-py3-none-any.whl".encode(), body)
+        
+    def test_forward_proxy_for_apt(self):
+        """Absolute-URI requests (apt's Acquire::http::Proxy) are cached too."""
+        url = f"{self.upstream_url}/debian/pool/main/t/tmux/tmux_3.3a-3_amd64.deb"
+        
+        self.assertEqual(self._get(url, proxy=True)[0], "MISS")
+        self.assertEqual(self._get(url, proxy=True)[0], "HIT")
+        
+    def test_forward_proxy_refuses_other_hosts(self):
+        """Absolute URIs outside the mirror list are refused, not fetched."""
+        self.proxy.mirror_hosts = {"deb.debian.org"}
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self._get(f"{self.upstream_url}/debian/pool/main/t/tmux/tmux_3.3a-3_amd64.deb", proxy=True)
+            
+        self.assertEqual(ctx.exception.code, 403)
+        self.assertEqual(FakeUpstream.requests, [])
+        self.assertTrue(self.proxy.is_mirror("http://ftp.de.deb.debian.org/debian/"))
+        self.assertFalse(self.proxy.is_mirror("http://deb.debian.org@10.0.0.1/"))
+        self.assertFalse(self.proxy.is_mirror("http://evildeb.debian.org.example/"))
+        
+    def test_streamed_without_buffering(self):
+        """Artifacts larger than the cache stream through and key locks are released."""
+        self.proxy.cache.max_bytes = 16
+        url = f"{self.proxy_url}/files/packages/demo-1.0-py3-none-any.whl"
+        
+        self.assertEqual(self._get(url)[1], b"artifact:/packages/demo-1.0-py3-none-any.whl")
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        self.assertEqual(self.proxy._key_locks, {})
+        
+    def test_unknown_route(self):
+        """Requests outside configured routes are rejected."""
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self._get(f"{self.proxy_url}/unknown/file.deb")
+        self.assertEqual(ctx.exception.code, 404)
+        
+    def test_lru_eviction(self):
+        """Least recently used artifacts are evicted over the size cap."""
+        cache = DiskLRUCache(os.path.join(self.temp_dir, 'lru'), max_size_mb=1)
+        chunk = b"\0" * 400 * 1024
+        cache.put("a", chunk)
+        cache.put("b", chunk)
+        cache.get("a")
+        cache.put("c", chunk)
+        
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertLessEqual(cache.size, 1024 * 1024)
+        self.assertEqual(sorted(os.listdir(cache.cache_dir)), ["a", "c"])
+        
+    def test_client_config(self):
+        """Generated client configuration and resolver options target the proxy."""
+        config = PackageCacheProxy.client_config("http://192.168.0.10:3142")
+        
+        self.assertEqual(config["/etc/apt/apt.conf.d/01unifikation-proxy"],
+                         'Acquire::http::Proxy "http://192.168.0.10:3142";\n')
+        self.assertIn("trusted-host = 192.168.0.10", "".join(config.values()))
+        
+        resolver = DependencyResolver(proxy_url="http://192.168.0.10:3142/")
+        self.assertEqual(resolver._proxy_options(PackageManager.PIP),
+                         ["--index-url", "http://192.168.0.10:3142/pypi/", "--trusted-host", "192.168.0.10"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Test Package Catalog
+Data-driven package definitions, aliases and name lookups
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.package_catalog import Package, PackageCatalog
+from tools.dependency_resolver import DependencyResolver, PackageManager
+
+
+class TestPackageCatalog(unittest.TestCase):
+    """Test catalog compilation and lookups."""
+    
+    def setUp(self):
+        """Create temporary catalog directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'packages.json')
+        
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def _write(self, packages):
+        """Write catalog file."""
+        with open(self.path, 'w') as f:
+            json.dump({"packages": packages}, f)
+            
+    def test_shipped_catalog(self):
+        """Bundled catalog holds the core packages with their distribution names."""
+        catalog = PackageCatalog.load()
+        for name in ["git", "python3", "pip", "ssh", "sshd", "nodejs", "npm"]:
+            self.assertIn(name, catalog)
+            
+        sshd = catalog.packages["sshd"]
+        self.assertEqual(sshd.depends_on, ["ssh"])
+        self.assertEqual(catalog.package_name(sshd, "apt"), "openssh-server")
+        self.assertEqual(catalog.package_name(catalog.packages["docker"], "apt"), "docker.io")
+        
+    def test_aliases(self):
+        """Aliases resolve to the canonical package, canonical names are never shadowed."""
+        self._write({
+            "sshd": {"aliases": ["openssh-server", "ssh"], "names": {"apt": "openssh-server"}},
+            "ssh": {"aliases": ["openssh-client"], "names": {"apt": "openssh-client"}}
+        })
+        catalog = PackageCatalog.load(self.path)
+        
+        self.assertIs(catalog.get("openssh-server"), catalog.packages["sshd"])
+        self.assertIs(catalog.get("openssh-client"), catalog.packages["ssh"])
+        self.assertIs(catalog.get("ssh"), catalog.packages["ssh"])
+        self.assertIsNone(catalog.get("telnet"))
+        
+    def test_name_table(self):
+        """Every (package, manager) pair is precomputed, missing names fall back to the package name."""
+        catalog = PackageCatalog([Package(name="python3", pacman_name="python")])
+        self.assertEqual(catalog.names[("python3", "pacman")], "python")
+        self.assertEqual(catalog.names[("python3", "apt")], "python3")
+        
+        # Ad-hoc packages outside the catalog use their own fields
+        other = Package(name="python3", apt_name="python3-minimal")
+        self.assertEqual(catalog.package_name(other, "apt"), "python3-minimal")
+        
+    def test_compiled_once(self):
+        """The compiled catalog is reused until the file changes."""
+        self._write({"git": {"names": {"apt": "git"}}})
+        first = PackageCatalog.load(self.path)
+        self.assertIs(PackageCatalog.load(self.path), first)
+        
+        self._write({"git": {"names": {"apt": "git"}}, "tmux": {"names": {"apt": "tmux"}}})
+        os.utime(self.path, (0, 12345))
+        self.assertEqual(len(PackageCatalog.load(self.path)), 2)
+        
+    def test_invalid_catalog(self):
+        """Unknown manager keys and unreadable files yield an empty catalog."""
+        self._write({"git": {"names": {"aptitude": "git"}}})
+        self.assertEqual(len(PackageCatalog.load(self.path)), 0)
+        self.assertEqual(len(PackageCatalog.load(os.path.join(self.temp_dir, 'missing.json'))), 0)
+        
+    def test_slots(self):
+        """Records carry no per-instance dict."""
+        package = Package(name="git", apt_name="git")
+        self.assertFalse(hasattr(package, '__dict__'))
+        self.assertEqual(package, Package(name="git", apt_name="git"))
+        self.assertNotEqual(package, Package(name="git", apt_name="git-core"))
+
+
+class TestResolverCatalog(unittest.TestCase):
+    """Test resolver lookups through the catalog."""
+    
+    def setUp(self):
+        """Create resolver on apt."""
+        with patch.object(DependencyResolver, '_detect_package_managers',
+                          return_value=[PackageManager.APT]):
+            self.resolver = DependencyResolver()
+            
+    def test_alias_closure(self):
+        """Aliases and canonical names of one package are planned once."""
+        packages = self.resolver._dependency_closure(["openssh-server", "sshd", "python3-pip", "pip"])
+        self.assertEqual([p.name for p in packages], ["sshd", "pip", "ssh", "python3"])
+        
+    def test_get_package_name(self):
+        """Manager-specific names come from the compiled table."""
+        pip = self.resolver.catalog.packages["pip"]
+        self.assertEqual(self.resolver.get_package_name(pip, PackageManager.APT), "python3-pip")
+        self.assertEqual(self.resolver.get_package_name(pip, PackageManager.PACMAN), "python-pip")
+        self.assertEqual(self.resolver.get_package_name(pip, PackageManager.ZYPPER), "pip")
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Test Probe Engine
+Concurrent detection probes with dependencies and timeouts
+"""
+
+import unittest
+import tempfile
+import shutil
+import threading
+import time
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.probe_engine import ProbeEngine
+from tools.system_detector import SystemDetector, SystemInfo
+from tools.detection_cache import DetectionCache
+
+
+class TestProbeEngine(unittest.TestCase):
+    """Test scheduling, dependencies and fallbacks."""
+    
+    def setUp(self):
+        """Create engine with a small pool."""
+        self.engine = ProbeEngine(max_workers=3)
+        
+    def test_independent_probes_overlap(self):
+        """Wall time approaches the slowest probe, not the sum."""
+        for name in ["a", "b", "c"]:
+            self.engine.register(name, lambda: time.sleep(0.2) or True)
+            
+        start = time.monotonic()
+        results = self.engine.run()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(results, {"a": True, "b": True, "c": True})
+        
+    def test_dependencies_receive_results(self):
+        """A probe starts after its dependencies and gets their results as arguments."""
+        self.engine.register("cpuinfo", lambda: "model name: Q9550")
+        self.engine.register("zones", lambda: ["thermal_zone0"])
+        self.engine.register("thermal", lambda cpuinfo, zones: ("Q9550" in cpuinfo, len(zones)),
+                             depends_on=["cpuinfo", "zones"])
+        self.engine.register("unrelated", lambda: self.fail("not requested"))
+        
+        self.assertEqual(self.engine.run(["thermal"]),
+                         {"cpuinfo": "model name: Q9550", "zones": ["thermal_zone0"], "thermal": (True, 1)})
+                         
+    def test_hung_probe_does_not_stall(self):
+        """A probe past its timeout yields its default and the rest still complete."""
+        release = threading.Event()
+        self.engine.register("sensors", release.wait, timeout=0.2, default="n/a")
+        self.engine.register("thermal", lambda sensors: f"sensors: {sensors}", depends_on=["sensors"])
+        self.engine.register("memory", lambda: 42)
+        
+        start = time.monotonic()
+        results = self.engine.run()
+        release.set()
+        
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(results, {"sensors": "n/a", "thermal": "sensors: n/a", "memory": 42})
+        
+    def test_failures_use_default_copy(self):
+        """A raising probe yields a fresh copy of its default."""
+        def broken():
+            raise OSError("no /proc")
+            
+        self.engine.register("virtualization", broken, default={"is_virtual": False})
+        first = self.engine.run()["virtualization"]
+        first["is_virtual"] = True
+        self.assertEqual(self.engine.run()["virtualization"], {"is_virtual": False})
+        
+    def test_pool_size_caps_concurrency(self):
+        """No more than max_workers probes run at once."""
+        active = []
+        peak = []
+        guard = threading.Lock()
+        
+        def probe():
+            with guard:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with guard:
+                active.pop()
+                
+        for i in range(8):
+            self.engine.register(f"p{i}", probe)
+        self.engine.run()
+        self.assertLessEqual(max(peak), 3)
+        
+    def test_unmet_dependency(self):
+        """A probe depending on an unregistered one gets its default instead of waiting forever."""
+        self.engine.register("security", lambda firewall: firewall, depends_on=["firewall"], default=False)
+        self.assertEqual(self.engine.run(), {"security": False})
+
+
+class TestSystemDetectorProbes(unittest.TestCase):
+    """Test SystemDetector built on probes."""
+    
+    def setUp(self):
+        """Keep cached system facts out of the home directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.facts_cache = DetectionCache(cache_dir=self.temp_dir)
+        
+    def tearDown(self):
+        """Clean up temp directory."""
+        shutil.rmtree(self.temp_dir)
+        
+    def test_detect_all(self):
+        """One pass yields SystemInfo and the feature dictionaries."""
+        detected = SystemDetector(facts_cache=self.facts_cache).detect_all()
+        self.assertIsInstance(detected["system"], SystemInfo)
+        self.assertIn("q9550_detected", detected["thermal"])
+        self.assertIn("container", detected["virtualization"])
+        self.assertIn("sudo_available", detected["security"])
+        
+    def test_snapshot_overlaps_feature_probes(self):
+        """The system snapshot runs in the same pass as the feature probes."""
+        detector = SystemDetector(facts_cache=self.facts_cache)
+        detector.detect_all()
+        
+        def slow_snapshot(max_age=None):
+            time.sleep(0.3)
+            return SystemInfo.__new__(SystemInfo)
+            
+        with patch.object(detector, 'snapshot', side_effect=slow_snapshot), \
+                patch.object(detector.probes.probes["firewall"], 'func', side_effect=lambda: time.sleep(0.3)):
+            start = time.monotonic()
+            detector.detect_all()
+            
+        self.assertLess(time.monotonic() - start, 0.55)
+        
+    def test_hung_systemctl(self):
+        """A hung service query only costs its own timeout."""
+        detector = SystemDetector(facts_cache=self.facts_cache)
+        detector.probes.probes["ssh_server"].timeout = 0.2
+        release = threading.Event()
+        
+        with patch.object(detector.probes.probes["ssh_server"], 'func', side_effect=release.wait):
+            start = time.monotonic()
+            security = detector.detect_security_features()
+            release.set()
+            
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertFalse(security["ssh_server_running"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Test Sysfs Reader
+Native /proc, /sys and /run readers against a fake root
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.sysfs_reader import SysfsReader
+from tools.system_detector import SystemDetector
+from tools.detection_cache import DetectionCache
+
+
+CPUINFO = """processor\t: 0
+vendor_id\t: GenuineIntel
+model name\t: Intel(R) Core(TM)2 Quad CPU    Q9550  @ 2.83GHz
+flags\t\t: fpu vme de pse tsc msr
+
+processor\t: 1
+model name\t: should not be read
+"""
+
+
+class TestSysfsReader(unittest.TestCase):
+    """Test pseudo-file parsing without touching the real system."""
+    
+    def setUp(self):
+        """Create fake root filesystem of a Q9550 box."""
+        self.root = tempfile.mkdtemp()
+        self.facts_cache = DetectionCache(cache_dir=os.path.join(self.root, "cache"))
+        self._write("sys/class/hwmon/hwmon0/name", "coretemp\n")
+        self._write("sys/class/hwmon/hwmon0/temp2_input", "61000\n")
+        self._write("sys/class/hwmon/hwmon0/temp2_label", "Core 0\n")
+        self._write("sys/class/hwmon/hwmon0/temp3_input", "67500\n")
+        self._write("sys/class/hwmon/hwmon1/name", "acpitz\n")
+        self._write("sys/class/hwmon/hwmon1/temp1_input", "40000\n")
+        self._write("sys/class/thermal/thermal_zone0/type", "acpitz\n")
+        self._write("sys/class/thermal/thermal_zone0/temp", "40000\n")
+        self._write("sys/class/dmi/id/sys_vendor", "Acer\n")
+        self._write("sys/class/dmi/id/product_name", "Aspire M5641\n")
+        self._write("proc/cpuinfo", CPUINFO)
+        self._write("proc/1/cgroup", "0::/init.scope\n")
+        self.reader = SysfsReader(root=self.root)
+        
+    def tearDown(self):
+        """Clean up fake root."""
+        shutil.rmtree(self.root)
+        
+    def _write(self, relative_path: str, content: str):
+        """Create file below the fake root."""
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+            
+    def test_temperatures(self):
+        """hwmon inputs are converted from millidegrees and labelled."""
+        self.assertEqual(self.reader.hwmon_temperatures(),
+                         [("coretemp", "Core 0", 61.0), ("coretemp", "temp3", 67.5), ("acpitz", "temp1", 40.0)])
+        self.assertEqual(self.reader.thermal_zones(), {"thermal_zone0": {"type": "acpitz", "temp": 40.0}})
+        self.assertEqual(self.reader.cpu_temperature(), 67.5)
+        
+    def test_cpu_temperature_falls_back_to_zones(self):
+        """Without a CPU hwmon driver the CPU thermal zone is used."""
+        shutil.rmtree(os.path.join(self.root, "sys/class/hwmon/hwmon0"))
+        self.assertEqual(self.reader.cpu_temperature(), 40.0)
+        
+    def test_first_cpuinfo_block(self):
+        """Only the first processor block is parsed."""
+        cpuinfo = self.reader.cpuinfo()
+        self.assertIn("Q9550", cpuinfo["model name"])
+        self.assertEqual(cpuinfo["processor"], "0")
+        
+    def test_dmi_and_container(self):
+        """DMI identity is read field by field; init's cgroup reveals containers."""
+        self.assertEqual(self.reader.dmi(), {"sys_vendor": "Acer", "product_name": "Aspire M5641"})
+        self.assertIsNone(self.reader.container())
+        
+        self._write("proc/1/cgroup", "12:pids:/docker/3f2a\n")
+        self.assertEqual(self.reader.container(), "docker")
+        
+    def test_systemd_units(self):
+        """Loaded units have invocation links; without systemd the state is unknown."""
+        self.assertIsNone(self.reader.unit_loaded("ssh"))
+        
+        os.makedirs(os.path.join(self.root, "run/systemd/system"))
+        os.makedirs(os.path.join(self.root, "run/systemd/units"))
+        os.symlink("abc123", os.path.join(self.root, "run/systemd/units/invocation:ssh.service"))
+        self.assertTrue(self.reader.unit_loaded("ssh"))
+        self.assertFalse(self.reader.unit_loaded("sshd"))
+        
+    def test_ssh_liveness(self):
+        """A stopped but still loaded ssh unit is not a running SSH server."""
+        detector = SystemDetector(sysfs=self.reader, facts_cache=self.facts_cache)
+        os.makedirs(os.path.join(self.root, "run/systemd/system"))
+        os.makedirs(os.path.join(self.root, "run/systemd/units"))
+        os.symlink("abc123", os.path.join(self.root, "run/systemd/units/invocation:ssh.service"))
+        self._write("proc/812/comm", "cron\n")
+        self.assertFalse(detector._ssh_server_running())
+        
+        self._write("proc/901/comm", "sshd\n")
+        self.assertTrue(self.reader.process_running("sshd"))
+        self.assertTrue(detector._ssh_server_running())
+        
+    def test_ssh_pidfile_without_systemd(self):
+        """Without systemd a live pid file is enough."""
+        detector = SystemDetector(sysfs=self.reader, facts_cache=self.facts_cache)
+        self._write("run/sshd.pid", "901\n")
+        self.assertFalse(detector._ssh_server_running())
+        
+        os.makedirs(os.path.join(self.root, "proc/901"))
+        self.assertTrue(detector._ssh_server_running())
+        
+    def test_ufw_config(self):
+        """ufw state comes from its configuration file."""
+        self.assertIsNone(self.reader.ufw_enabled())
+        self._write("etc/ufw/ufw.conf", "# comment\nENABLED=yes\nLOGLEVEL=low\n")
+        self.assertTrue(self.reader.ufw_enabled())
+        
+    def test_detector_without_subprocesses(self):
+        """Thermal, virtualization and security detection never spawn a process."""
+        detector = SystemDetector(sysfs=self.reader, facts_cache=self.facts_cache)
+        with patch('subprocess.run') as run, patch('subprocess.Popen') as popen:
+            detected = detector.detect_all()
+            
+        run.assert_not_called()
+        popen.assert_not_called()
+        self.assertTrue(detected["thermal"]["q9550_detected"])
+        self.assertTrue(detected["thermal"]["cpu_temp_available"])
+        self.assertEqual(detected["thermal"]["cpu_temperature"], 67.5)
+        self.assertFalse(detected["virtualization"]["is_virtual"])
+        self.assertFalse(detected["security"]["firewall_active"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Test Thermal Governor
+Temperature-driven worker limits for installs and scans
+"""
+
+import unittest
+import asyncio
+import threading
+import time
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.thermal_governor import ThermalGovernor, ThrottleGate
+from tools.install_executor import InstallExecutor
+from tools.dependency_resolver import DependencyResolver, Package, PackageManager
+from tools.network_scanner import NetworkScanner
+from tools.async_network_scanner import AsyncNetworkScanner
+
+
+class FakeSensor:
+    """SysfsReader stand-in with a settable CPU temperature."""
+    
+    def __init__(self, temperature=None):
+        self.temperature = temperature
+        
+    def cpu_temperature(self):
+        """Current fake reading."""
+        return self.temperature
+
+
+class TestThermalGovernor(unittest.TestCase):
+    """Test throttle levels, hysteresis and logging."""
+    
+    def setUp(self):
+        """Create governor reading the fake sensor on every call."""
+        self.sensor = FakeSensor(60.0)
+        self.governor = ThermalGovernor(sysfs=self.sensor, threshold=80.0)
+        self.governor.READ_INTERVAL = 0
+        
+    def _limit(self, temperature, max_workers=8):
+        """Worker limit at a temperature."""
+        self.sensor.temperature = temperature
+        return self.governor.limit(max_workers)
+        
+    def test_halves_above_threshold(self):
+        """Each step above threshold halves workers, never below min_workers."""
+        self.assertEqual(self._limit(79.0), 8)
+        with self.assertLogs('tools.thermal_governor', level='WARNING') as logs:
+            self.assertEqual(self._limit(81.0), 4)
+        self.assertIn("throttling to 4/8 workers", logs.output[0])
+        self.assertEqual(self._limit(86.0), 2)
+        self.assertEqual(self._limit(99.0), 1)
+        
+    def test_hysteresis(self):
+        """Workers come back only once the CPU is clearly below the step it crossed."""
+        self._limit(81.0)
+        self.assertEqual(self._limit(78.0), 4)
+        with self.assertLogs('tools.thermal_governor', level='INFO') as logs:
+            self.assertEqual(self._limit(76.0), 8)
+        self.assertIn("raising to 8/8 workers", logs.output[0])
+        
+    def test_no_sensor(self):
+        """Without a readable sensor nothing is throttled."""
+        self.assertEqual(self._limit(None), 8)
+
+
+class TestThrottledExecutor(unittest.TestCase):
+    """Test that the executor follows the governor."""
+    
+    def test_hot_cpu_serializes_transactions(self):
+        """A hot CPU halves concurrent transactions and every batch still completes."""
+        with patch.object(DependencyResolver, '_detect_package_managers',
+                          return_value=[PackageManager.APT, PackageManager.PIP, PackageManager.NPM]):
+            resolver = DependencyResolver()
+        sensor = FakeSensor(83.0)
+        governor = ThermalGovernor(sysfs=sensor)
+        governor.READ_INTERVAL = 0
+        executor = InstallExecutor(resolver, governor=governor)
+        executor.THROTTLE_POLL = 0.01
+        
+        active = []
+        peak = []
+        guard = threading.Lock()
+        
+        def install(packages, manager, dry_run):
+            with guard:
+                active.append(manager)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with guard:
+                active.remove(manager)
+            return True
+            
+        packages = [Package(name="tmux", apt_name="tmux"), Package(name="black", pip_name="black"),
+                    Package(name="eslint", npm_name="eslint")]
+        with patch.object(resolver, '_install_with_system_manager', side_effect=install):
+            events = list(executor.execute_levels([packages]))
+            
+        self.assertEqual(max(peak), 1)
+        self.assertEqual(len([e for e in events if e.status == "finished"]), 3)
+
+
+
+class TestThrottledScans(unittest.TestCase):
+    """Test that scans re-read the governor while they run."""
+    
+    def setUp(self):
+        """Create governor reading the fake sensor on every call."""
+        self.sensor = FakeSensor(60.0)
+        self.governor = ThermalGovernor(sysfs=self.sensor)
+        self.governor.READ_INTERVAL = 0
+        
+    def test_gate_narrows_mid_run(self):
+        """Workers entering after the CPU heats up wait until the gate's new width allows them."""
+        gate = ThrottleGate(self.governor, 8)
+        gate.POLL = 0.01
+        seen = []
+        guard = threading.Lock()
+        
+        def work():
+            with gate:
+                with guard:
+                    seen.append(gate._active)
+                time.sleep(0.05)
+                
+        cool = [threading.Thread(target=work) for _ in range(8)]
+        for thread in cool:
+            thread.start()
+        time.sleep(0.02)
+        self.sensor.temperature = 95.0
+        hot = [threading.Thread(target=work) for _ in range(4)]
+        for thread in hot:
+            thread.start()
+        for thread in cool + hot:
+            thread.join()
+            
+        self.assertEqual(max(seen[:8]), 8)
+        self.assertEqual(seen[8:], [1, 1, 1, 1])
+        
+    def test_port_scans_follow_governor(self):
+        """Sync and async port probes never exceed the governor's current limit."""
+        self.sensor.temperature = 95.0
+        peak = []
+        active = [0]
+        guard = threading.Lock()
+        
+        def probe(*args):
+            with guard:
+                active[0] += 1
+                peak.append(active[0])
+            time.sleep(0.01)
+            with guard:
+                active[0] -= 1
+            return False
+            
+        scanner = NetworkScanner(governor=self.governor)
+        scanner.probe_ports = list(range(1, 9))
+        with patch.object(scanner, 'scan_port', side_effect=probe), patch.object(ThrottleGate, 'POLL', 0.01):
+            scanner.scan_common_ports("192.0.2.1")
+        self.assertEqual(max(peak), 1)
+        
+        async def connect(ip, port, timeout):
+            probe()
+            await asyncio.sleep(0.01)
+            return False
+            
+        async def scan():
+            async_scanner._semaphore = asyncio.Semaphore(async_scanner.max_concurrency)
+            return await asyncio.gather(*(async_scanner._probe_port_async("192.0.2.1", port, 0.1)
+                                          for port in range(1, 9)))
+            
+        peak.clear()
+        async_scanner = AsyncNetworkScanner(max_concurrency=8, per_host_rate=0, governor=self.governor)
+        async_scanner.THROTTLE_POLL = 0.01
+        with patch.object(async_scanner, '_connect', side_effect=connect):
+            self.assertEqual(len(asyncio.run(scan())), 8)
+        self.assertEqual(max(peak), 1)
+        self.assertEqual(async_scanner._in_flight, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
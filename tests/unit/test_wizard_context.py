@@ -0,0 +1,66 @@
+"""
+Test Wizard Context
+Lazy construction and sharing of wizard subsystems
+"""
+
+import unittest
+import threading
+import os
+import sys
+from unittest.mock import patch
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from tools.wizard_context import WizardContext
+from wizards.workstation_setup import WorkstationWizard
+
+
+class TestWizardContext(unittest.TestCase):
+    """Test lazily built, shared subsystems."""
+    
+    def test_nothing_built_until_used(self):
+        """Creating a context does not construct any subsystem."""
+        with patch('tools.wizard_context.DependencyResolver') as resolver:
+            context = WizardContext()
+            resolver.assert_not_called()
+            
+            self.assertIs(context.dependency_resolver, context.dependency_resolver)
+            resolver.assert_called_once()
+            
+    def test_concurrent_first_use_builds_once(self):
+        """Threads racing on first use share one instance."""
+        context = WizardContext()
+        results = []
+        
+        with patch('tools.wizard_context.SystemDetector', side_effect=lambda: object()):
+            threads = [threading.Thread(target=lambda: results.append(context.system_detector))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+                
+        self.assertEqual(len({id(r) for r in results}), 1)
+        
+    def test_warm_up_builds_everything(self):
+        """Background warm-up constructs every subsystem once."""
+        context = WizardContext()
+        with patch('tools.wizard_context.DependencyResolver') as resolver:
+            context.warm_up().join(timeout=10)
+            self.assertIs(context.warm_up(), context.warm_up())
+            
+        resolver.assert_called_once()
+        self.assertEqual(set(context._instances), set(WizardContext.WARM_UP_ORDER))
+        
+    def test_scenario_wizard_shares_context(self):
+        """Scenario wizards reuse the master wizard's subsystems."""
+        context = WizardContext()
+        with patch('tools.wizard_context.ConfigValidator') as validator, \
+             patch.object(WorkstationWizard, 'setup_logging'):
+            wizard = WorkstationWizard(context=context)
+            
+            self.assertIs(wizard.config_validator, context.config_validator)
+            validator.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Async Network Scanner Module
+Single-threaded asyncio scan engine for fast subnet discovery
+"""
+
+import asyncio
+import socket
+import ipaddress
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from tools.network_scanner import NetworkScanner, ServerInfo
+
+
+class AsyncNetworkScanner(NetworkScanner):
+    """Network scanner running every host×port probe on one asyncio loop."""
+    
+    THROTTLE_POLL = 0.5  # Seconds a probe held back by the governor waits before re-checking
+    
+    def __init__(self, max_concurrency: int = 256, per_host_rate: float = 100.0, 
+                 cache=None, max_age: Optional[float] = None, rescan: bool = False,
+                 profiles_path: Optional[str] = None, governor=None):
+        """Initialize scanner with global concurrency and per-host rate limits."""
+        super().__init__(cache=cache, max_age=max_age, rescan=rescan, profiles_path=profiles_path,
+                         governor=governor)
+        self.max_concurrency = max_concurrency
+        self.per_host_rate = per_host_rate  # Probes per second sent to one host
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._next_slot: Dict[str, float] = {}
+        self._in_flight = 0
+        
+    def iter_subnet(self, subnet: str, timeout: float = 1.0, 
+                    neighbors_only: bool = False) -> Iterator[ServerInfo]:
+        """Yield servers as each host finishes, driven by a private event loop."""
+        loop = None
+        servers = None
+        try:
+            loop = asyncio.new_event_loop()
+            servers = self.iter_subnet_async(subnet, timeout, neighbors_only)
+            while True:
+                try:
+                    server_info = loop.run_until_complete(servers.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield server_info
+        except Exception as e:
+            self.logger.error(f"Async subnet scan failed: {e}")
+        finally:
+            if loop is not None:
+                self._close_loop(loop, servers)
+                
+    def _close_loop(self, loop: asyncio.AbstractEventLoop, servers: Optional[AsyncIterator]):
+        """Finish the scan generator and any leftover tasks before closing the loop."""
+        try:
+            if servers is not None:
+                loop.run_until_complete(servers.aclose())
+                
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+                
+    async def scan_subnet_async(self, subnet: str, timeout: float = 1.0, 
+                                neighbors_only: bool = False) -> List[ServerInfo]:
+        """Scan entire subnet with a single bounded pool of non-blocking connects."""
+        return [server async for server in self.iter_subnet_async(subnet, timeout, neighbors_only)]
+        
+    async def iter_subnet_async(self, subnet: str, timeout: float = 1.0, 
+                                neighbors_only: bool = False) -> AsyncIterator[ServerInfo]:
+        """Async twin of iter_subnet yielding servers as each host finishes."""
+        self.logger.info(f"Scanning subnet (async): {subnet}")
+        
+        try:
+            network = ipaddress.IPv4Network(subnet, strict=False)
+        except ValueError as e:
+            self.logger.error(f"Invalid subnet: {e}")
+            return
+            
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._next_slot = {}
+        self._in_flight = 0
+        cached, to_probe, full_sweep = self._plan_incremental_scan(
+            subnet, [str(ip) for ip in network.hosts()], neighbors_only
+        )
+        for server_info in cached:
+            yield server_info
+            
+        known, unknown = self._order_hosts_for_discovery(subnet, to_probe)
+        probed = known if neighbors_only else known + unknown
+        active_servers = []
+        
+        # Port-scan each host as soon as its liveness reply arrives,
+        # neighbor-table hosts first
+        completed: asyncio.Queue = asyncio.Queue()
+        tasks = []
+        
+        async def feed():
+            try:
+                for hosts in ([known] if neighbors_only else [known, unknown]):
+                    # Measured hosts get an RTT-derived window, unmeasured ones the full 2s
+                    sweep_timeout = self.adaptive_timeout.sweep_timeout(2.0, hosts)
+                    async for ip, ping_time in self.liveness_prober.aiter_probe(hosts, sweep_timeout):
+                        task = asyncio.ensure_future(self._scan_host_async(ip, timeout, ping_time))
+                        task.add_done_callback(completed.put_nowait)
+                        tasks.append(task)
+            finally:
+                completed.put_nowait(None)
+                
+        feeder = asyncio.ensure_future(feed())
+        try:
+            feeding = True
+            finished = 0
+            while feeding or finished < len(tasks):
+                task = await completed.get()
+                if task is None:
+                    feeding = False
+                    continue
+                    
+                finished += 1
+                if task.cancelled():
+                    continue
+                if task.exception():
+                    self.logger.debug(f"Async scan error: {task.exception()}")
+                    continue
+                    
+                server_info = task.result()
+                active_servers.append(server_info)
+                self.logger.info(f"Found server: {server_info.ip_address} ({server_info.hostname})")
+                yield server_info
+        finally:
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+                
+        self._store_scan_results(subnet, probed, active_servers, full_sweep)
+        
+    async def _scan_host_async(self, ip: str, timeout: float, ping_time: float) -> ServerInfo:
+        """Probe all common ports on a live host and build its server information."""
+        self.adaptive_timeout.observe(ip, ping_time / 1000)
+        probe_timeout = self.adaptive_timeout.timeout_for(ip, timeout)
+        
+        # Reverse lookup overlaps the port probes and is awaited on the loop, never in a thread
+        lookup = asyncio.wrap_future(self.hostname_resolver.resolve_async(ip))
+        deadline = time.monotonic() + self.HOSTNAME_TIMEOUT
+        probes = await asyncio.gather(
+            *(self._probe_port_async(ip, port, probe_timeout) for port in self.probe_ports)
+        )
+        open_ports = sorted(port for port, is_open in probes if is_open)
+        hostname = await self._collect_hostname_async(lookup, deadline - time.monotonic())
+        
+        return self._build_server_info(ip, hostname, open_ports, ping_time)
+        
+    async def _collect_hostname_async(self, lookup: asyncio.Future, remaining: float) -> Optional[str]:
+        """Hostname if the lookup finishes within remaining seconds; a late one is stored with the results."""
+        try:
+            # Shielded so the shared resolver future keeps running for _store_scan_results
+            return await asyncio.wait_for(asyncio.shield(lookup), max(0.0, remaining))
+        except asyncio.TimeoutError:
+            return None
+        
+    async def _probe_port_async(self, ip: str, port: int, timeout: float) -> Tuple[int, bool]:
+        """Non-blocking TCP connect returning (port, is_open)."""
+        await self._wait_for_host_slot(ip)
+        
+        async with self._semaphore:
+            await self._wait_for_thermal_slot()
+            try:
+                return port, await self._connect(ip, port, timeout)
+            finally:
+                self._in_flight -= 1
+                
+    async def _connect(self, ip: str, port: int, timeout: float) -> bool:
+        """Non-blocking TCP connect, True when the port accepts."""
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        
+        try:
+            start = time.monotonic()
+            await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+            self.adaptive_timeout.observe(ip, time.monotonic() - start)
+            return True
+        except (asyncio.TimeoutError, OSError):
+            return False
+        finally:
+            sock.close()
+                
+    async def _wait_for_thermal_slot(self):
+        """Hold a probe back while more are in flight than the governor allows right now."""
+        while self.governor and self._in_flight >= self.governor.limit(self.max_concurrency):
+            await asyncio.sleep(self.THROTTLE_POLL)
+        self._in_flight += 1
+        
+    async def _wait_for_host_slot(self, ip: str):
+        """Pace probes so a single host never sees more than per_host_rate per second."""
+        if self.per_host_rate <= 0:
+            return
+            
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(ip, now))
+        self._next_slot[ip] = slot + 1.0 / self.per_host_rate
+        
+        if slot > now:
+            await asyncio.sleep(slot - now)
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Command Index Module
+In-process executable lookup replacing `which` subprocesses
+"""
+
+import os
+import stat
+import threading
+import logging
+from typing import Dict, Optional, Tuple
+
+
+class CommandIndex:
+    """Name to path index of $PATH executables, rebuilt when a directory changes."""
+    
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._index: Dict[str, str] = {}
+        self._key: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        
+    def which(self, command: str) -> Optional[str]:
+        """Return full path of command like `which`, None when not found."""
+        if os.sep in command:
+            return command if self._is_executable(command) else None
+            
+        with self._lock:
+            self._refresh()
+            return self._index.get(command)
+            
+    def command_exists(self, command: str) -> bool:
+        """Check if command exists in system PATH."""
+        return self.which(command) is not None
+        
+    def _refresh(self):
+        """Rebuild index if $PATH or any of its directories changed."""
+        directories = [d for d in os.environ.get("PATH", os.defpath).split(os.pathsep) if d]
+        key = tuple((d, self._dir_mtime(d)) for d in directories)
+        if key == self._key:
+            return
+            
+        index = {}
+        for directory, mtime in key:
+            if mtime is None:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        # Earlier PATH entries shadow later ones
+                        if entry.name not in index and self._entry_is_executable(entry):
+                            index[entry.name] = entry.path
+            except OSError as e:
+                self.logger.debug(f"Cannot list PATH directory {directory}: {e}")
+                
+        self._index = index
+        self._key = key
+        
+    @staticmethod
+    def _dir_mtime(directory: str) -> Optional[int]:
+        """Directory mtime in nanoseconds, None if missing."""
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+            
+    @staticmethod
+    def _entry_is_executable(entry: os.DirEntry) -> bool:
+        """Regular file with any execute bit, following symlinks."""
+        try:
+            mode = entry.stat().st_mode
+        except OSError:
+            return False
+        return stat.S_ISREG(mode) and bool(mode & 0o111)
+        
+    @staticmethod
+    def _is_executable(path: str) -> bool:
+        """Check explicit path points to an executable file."""
+        return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+# Shared by every module so PATH is scanned once per process
+_default_index = CommandIndex()
+
+
+def which(command: str) -> Optional[str]:
+    """Return full path of command from the shared index."""
+    return _default_index.which(command)
+
+
+def command_exists(command: str) -> bool:
+    """Check if command exists in system PATH using the shared index."""
+    return _default_index.command_exists(command)
\ No newline at end of file
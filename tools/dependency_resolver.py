@@ -3,12 +3,25 @@ Dependency Resolution Module
 Intelligent package dependency management across different OS distributions
 """
 
+import os
+import glob
+import json
+import fnmatch
+import math
 import subprocess
+import threading
+import concurrent.futures
 import logging
 from typing import Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from tools.command_index import command_exists
+from tools.package_db import PackageDatabase, normalize_pip_name
+from tools.package_catalog import Package, PackageCatalog
+from tools.install_executor import InstallExecutor
+from tools.install_estimator import InstallEstimator, InstallEstimate, PlannedBatch, MB
+
 
 class PackageManager(Enum):
     """Supported package managers."""
@@ -22,21 +35,7 @@ class PackageManager(Enum):
     PIP = "pip"
     CONDA = "conda"
     SNAP = "snap"
-
-
-@dataclass
-class Package:
-    """Package definition with OS-specific names."""
-    name: str
-    apt_name: Optional[str] = None
-    yum_name: Optional[str] = None
-    dnf_name: Optional[str] = None
-    pacman_name: Optional[str] = None
-    apk_name: Optional[str] = None
-    brew_name: Optional[str] = None
-    pip_name: Optional[str] = None
-    description: str = ""
-    required: bool = True
+    NPM = "npm"
 
 
 @dataclass
@@ -48,136 +47,50 @@ class InstallationPlan:
     installation_order: List[List[Package]]
     estimated_time: int
     disk_space_required: int
+    download_size: int = 0
 
 
 class DependencyResolver:
     """Intelligent dependency resolution and package management."""
     
-    # Common packages with OS-specific names
-    COMMON_PACKAGES = {
-        "git": Package(
-            name="git",
-            apt_name="git",
-            yum_name="git",
-            dnf_name="git",
-            pacman_name="git",
-            apk_name="git",
-            brew_name="git",
-            description="Version control system"
-        ),
-        "python3": Package(
-            name="python3",
-            apt_name="python3",
-            yum_name="python3",
-            dnf_name="python3",
-            pacman_name="python",
-            apk_name="python3",
-            brew_name="python@3.9",
-            description="Python 3 interpreter"
-        ),
-        "pip": Package(
-            name="pip",
-            apt_name="python3-pip",
-            yum_name="python3-pip",
-            dnf_name="python3-pip",
-            pacman_name="python-pip",
-            apk_name="py3-pip",
-            pip_name="pip",
-            description="Python package installer"
-        ),
-        "curl": Package(
-            name="curl",
-            apt_name="curl",
-            yum_name="curl",
-            dnf_name="curl",
-            pacman_name="curl",
-            apk_name="curl",
-            brew_name="curl",
-            description="Command line tool for transfers"
-        ),
-        "wget": Package(
-            name="wget",
-            apt_name="wget",
-            yum_name="wget",
-            dnf_name="wget",
-            pacman_name="wget",
-            apk_name="wget",
-            brew_name="wget",
-            description="Network downloader"
-        ),
-        "ssh": Package(
-            name="ssh",
-            apt_name="openssh-client",
-            yum_name="openssh-clients",
-            dnf_name="openssh-clients",
-            pacman_name="openssh",
-            apk_name="openssh-client",
-            description="SSH client"
-        ),
-        "sshd": Package(
-            name="sshd",
-            apt_name="openssh-server",
-            yum_name="openssh-server",
-            dnf_name="openssh-server",
-            pacman_name="openssh",
-            apk_name="openssh-server",
-            description="SSH server daemon"
-        ),
-        "tmux": Package(
-            name="tmux",
-            apt_name="tmux",
-            yum_name="tmux",
-            dnf_name="tmux",
-            pacman_name="tmux",
-            apk_name="tmux",
-            brew_name="tmux",
-            description="Terminal multiplexer"
-        ),
-        "htop": Package(
-            name="htop",
-            apt_name="htop",
-            yum_name="htop",
-            dnf_name="htop",
-            pacman_name="htop",
-            apk_name="htop",
-            brew_name="htop",
-            description="Interactive process viewer"
-        ),
-        "docker": Package(
-            name="docker",
-            apt_name="docker.io",
-            yum_name="docker",
-            dnf_name="docker",
-            pacman_name="docker",
-            apk_name="docker",
-            brew_name="docker",
-            description="Container platform"
-        ),
-        "nodejs": Package(
-            name="nodejs",
-            apt_name="nodejs",
-            yum_name="nodejs",
-            dnf_name="nodejs",
-            pacman_name="nodejs",
-            apk_name="nodejs",
-            brew_name="node",
-            description="JavaScript runtime"
-        ),
-        "npm": Package(
-            name="npm",
-            apt_name="npm",
-            yum_name="npm",
-            dnf_name="npm",
-            pacman_name="npm",
-            apk_name="npm",
-            brew_name="npm",
-            description="Node.js package manager"
-        )
-    }
+    # Managers whose installed state can be queried
+    QUERYABLE_MANAGERS = [
+        PackageManager.APT, PackageManager.YUM, PackageManager.DNF,
+        PackageManager.PACMAN, PackageManager.APK, PackageManager.PIP
+    ]
+    
+    # Managers that own the base system; at most one of them is used
+    SYSTEM_MANAGERS = [
+        PackageManager.APT, PackageManager.YUM, PackageManager.DNF,
+        PackageManager.PACMAN, PackageManager.APK
+    ]
     
-    def __init__(self):
+    # Size cap of the prefetched package download cache
+    DEFAULT_DOWNLOAD_CACHE_MB = 2048
+    
+    # Global npm installs run as root, so their cache is root's own and outside the download cache
+    NPM_ROOT_CACHE = "/var/cache/unifikation/npm"
+    
+    def __init__(self, installed_cache=None, download_cache_dir: Optional[str] = None,
+                 download_cache_mb: int = DEFAULT_DOWNLOAD_CACHE_MB, proxy_url: Optional[str] = None,
+                 catalog: Optional[PackageCatalog] = None, install_history=None, thermal_governor=None):
+        """Initialize resolver with optional InstalledStateCache and InstallHistory shared across sessions."""
         self.logger = logging.getLogger(__name__)
+        self.thermal_governor = thermal_governor
+        self.catalog = catalog or PackageCatalog.load()
+        self.estimator = InstallEstimator(history=install_history)
         self.detected_managers = self._detect_package_managers()
+        self.package_db = PackageDatabase()
+        self.installed_cache = installed_cache
+        
+        if download_cache_dir is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            download_cache_dir = os.path.join(cache_home, "unifikation", "packages")
+        self.download_cache_dir = download_cache_dir
+        self.download_cache_mb = download_cache_mb
+        self._prefetched: Dict[PackageManager, List[str]] = {}  # rpm files written by the last prefetch
+        # Fleet package cache proxy (PackageCacheProxy) used by apt, pip and npm
+        self.proxy_url = proxy_url.rstrip("/") if proxy_url else None
         
     def _detect_package_managers(self) -> List[PackageManager]:
         """Detect available package managers on the system."""
@@ -193,7 +106,8 @@ class DependencyResolver:
             PackageManager.BREW: ["brew"],
             PackageManager.PIP: ["pip", "pip3"],
             PackageManager.CONDA: ["conda"],
-            PackageManager.SNAP: ["snap"]
+            PackageManager.SNAP: ["snap"],
+            PackageManager.NPM: ["npm"]
         }
         
         for manager, commands in manager_commands.items():
@@ -206,84 +120,127 @@ class DependencyResolver:
         
     def _command_exists(self, command: str) -> bool:
         """Check if command exists in system PATH."""
-        try:
-            subprocess.run(['which', command], 
-                         check=True, 
-                         capture_output=True, 
-                         text=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return command_exists(command)
             
     def get_package_name(self, package: Package, manager: PackageManager) -> Optional[str]:
         """Get OS-specific package name for given package manager."""
-        name_mapping = {
-            PackageManager.APT: package.apt_name,
-            PackageManager.YUM: package.yum_name,
-            PackageManager.DNF: package.dnf_name,
-            PackageManager.PACMAN: package.pacman_name,
-            PackageManager.APK: package.apk_name,
-            PackageManager.BREW: package.brew_name,
-            PackageManager.PIP: package.pip_name
-        }
-        
-        return name_mapping.get(manager) or package.name
+        return self.catalog.package_name(package, manager.value)
         
     def is_package_installed(self, package: Package) -> bool:
         """Check if package is already installed."""
-        for manager in self.detected_managers:
-            package_name = self.get_package_name(package, manager)
-            if not package_name:
-                continue
-                
-            try:
-                if manager == PackageManager.APT:
-                    result = subprocess.run(
-                        ['dpkg', '-l', package_name],
-                        capture_output=True, text=True
-                    )
-                    return result.returncode == 0
+        return self.query_installed([package]).get(package.name) is not None
+        
+    def query_installed(self, packages: List[Package]) -> Dict[str, Optional[str]]:
+        """Map package names to installed versions (None if missing) with one query per manager."""
+        queryable = [m for m in self.detected_managers if m in self.QUERYABLE_MANAGERS]
+        
+        # Each package is checked with the manager that would install it, e.g. pip tools in pip
+        groups: Dict[Optional[PackageManager], List[Package]] = {}
+        for package in packages:
+            manager = self.select_manager(package)
+            groups.setdefault(manager if manager in queryable else None, []).append(package)
+            
+        results = {package.name: None for package in packages}
+        for selected, group in groups.items():
+            # A manager whose query fails defers to the remaining ones
+            for manager in ([selected] if selected else []) + [m for m in queryable if m != selected]:
+                names = {}
+                for package in group:
+                    package_name = self.get_package_name(package, manager)
+                    if package_name:
+                        names[package.name] = package_name
+                        
+                try:
+                    installed = self._query_cached(manager, sorted(set(names.values())))
+                except Exception as e:
+                    self.logger.debug(f"Could not query installed packages with {manager}: {e}")
+                    continue
                     
-                elif manager == PackageManager.YUM:
-                    result = subprocess.run(
-                        ['rpm', '-q', package_name],
-                        capture_output=True, text=True
-                    )
-                    return result.returncode == 0
+                results.update({name: installed.get(package_name) for name, package_name in names.items()})
+                break
+                
+        return results
+        
+    def _query_cached(self, manager: PackageManager, names: List[str]) -> Dict[str, Optional[str]]:
+        """Answer from the snapshot cache while the package database is unchanged."""
+        signature = None
+        if self.installed_cache is not None:
+            signature = self.package_db.signature(manager.value)
+            
+        if signature is not None:
+            cached = self.installed_cache.get(manager.value, signature, names)
+            if cached is not None:
+                return cached
+                
+        installed = self._query_manager(manager, names)
+        results = {name: installed.get(name) for name in names}
+        
+        if signature is not None:
+            self.installed_cache.store(manager.value, signature, results)
+        return results
+        
+    def _query_manager(self, manager: PackageManager, names: List[str]) -> Dict[str, str]:
+        """Ask one package manager about all names at once, returning installed versions."""
+        if not names:
+            return {}
+            
+        # Read the package database directly, the CLI is only a fallback
+        database = self.package_db.installed(manager.value)
+        if database is not None:
+            if manager == PackageManager.PIP:
+                return {name: database[normalize_pip_name(name)] for name in names
+                        if normalize_pip_name(name) in database}
+            return {name: database[name] for name in names if name in database}
+            
+        installed = {}
+        if manager == PackageManager.APT:
+            # Exit status is non-zero when any name is unknown, output is still valid
+            output = self._run_query(
+                ['dpkg-query', '-W', '-f', '${Package}\t${Version}\t${Status}\n'] + names
+            )
+            for line in output.splitlines():
+                parts = line.split('\t')
+                if len(parts) == 3 and parts[2].split()[-1:] == ['installed']:
+                    installed[parts[0]] = parts[1]
                     
-                elif manager == PackageManager.DNF:
-                    result = subprocess.run(
-                        ['rpm', '-q', package_name],
-                        capture_output=True, text=True
-                    )
-                    return result.returncode == 0
+        elif manager in (PackageManager.YUM, PackageManager.DNF):
+            output = self._run_query(['rpm', '-q', '--qf', '%{NAME}\t%{VERSION}-%{RELEASE}\n'] + names)
+            for line in output.splitlines():
+                parts = line.split('\t')
+                if len(parts) == 2:
+                    installed[parts[0]] = parts[1]
                     
-                elif manager == PackageManager.PACMAN:
-                    result = subprocess.run(
-                        ['pacman', '-Q', package_name],
-                        capture_output=True, text=True
-                    )
-                    return result.returncode == 0
+        elif manager == PackageManager.PACMAN:
+            output = self._run_query(['pacman', '-Q'] + names)
+            for line in output.splitlines():
+                parts = line.split()
+                if len(parts) == 2:
+                    installed[parts[0]] = parts[1]
                     
-                elif manager == PackageManager.APK:
-                    result = subprocess.run(
-                        ['apk', 'info', '-e', package_name],
-                        capture_output=True, text=True
-                    )
-                    return result.returncode == 0
+        elif manager == PackageManager.APK:
+            # apk only echoes the names that are installed
+            output = self._run_query(['apk', 'info', '-e'] + names)
+            for line in output.splitlines():
+                if line.strip():
+                    installed[line.strip()] = ""
                     
-                elif manager == PackageManager.PIP:
-                    result = subprocess.run(
-                        ['pip', 'show', package_name],
-                        capture_output=True, text=True
-                    )
-                    return result.returncode == 0
+        elif manager == PackageManager.PIP:
+            output = self._run_query(['pip', 'list', '--format=json'])
+            versions = {
+                normalize_pip_name(dist["name"]): dist["version"]
+                for dist in json.loads(output or "[]")
+            }
+            for name in names:
+                version = versions.get(normalize_pip_name(name))
+                if version is not None:
+                    installed[name] = version
                     
-            except Exception as e:
-                self.logger.debug(f"Could not check {package_name} with {manager}: {e}")
-                continue
-                
-        return False
+        return installed
+        
+    def _run_query(self, command: List[str]) -> str:
+        """Run read-only query command and return its stdout."""
+        result = subprocess.run(command, capture_output=True, text=True)
+        return result.stdout
         
     def resolve_dependencies(self, required_packages: List[str]) -> InstallationPlan:
         """Resolve dependencies and create installation plan."""
@@ -293,37 +250,70 @@ class DependencyResolver:
         packages_to_update = []
         conflicts_detected = []
         
-        for package_name in required_packages:
-            if package_name in self.COMMON_PACKAGES:
-                package = self.COMMON_PACKAGES[package_name]
-                
-                if not self.is_package_installed(package):
-                    packages_to_install.append(package)
-                    self.logger.debug(f"Package {package_name} needs installation")
-                else:
-                    self.logger.debug(f"Package {package_name} already installed")
+        # Requested packages plus everything they transitively depend on
+        known_packages = self._dependency_closure(required_packages)
+        
+        # One batched query per package manager instead of one process per package
+        installed = self.query_installed(known_packages)
+        
+        for package in known_packages:
+            if installed.get(package.name) is None:
+                packages_to_install.append(package)
+                self.logger.debug(f"Package {package.name} needs installation")
             else:
-                self.logger.warning(f"Unknown package: {package_name}")
+                self.logger.debug(f"Package {package.name} already installed ({installed[package.name]})")
                 
         # Detect conflicts
         conflicts_detected = self._detect_conflicts(packages_to_install)
         
         # Create installation order based on dependencies
+        _, cyclic = self._topological_levels(packages_to_install)
+        if cyclic:
+            conflicts_detected.append(
+                f"Dependency cycle between: {', '.join(pkg.name for pkg in cyclic)}"
+            )
         installation_order = self._create_installation_order(packages_to_install)
         
-        # Estimate installation time and disk space
-        estimated_time = len(packages_to_install) * 30  # 30 seconds per package
-        disk_space_required = len(packages_to_install) * 50  # 50MB per package
+        # Estimate installation time and disk space from metadata and measured history
+        estimate = self.estimate_installation(installation_order)
         
         return InstallationPlan(
             packages_to_install=packages_to_install,
             packages_to_update=packages_to_update,
             conflicts_detected=conflicts_detected,
             installation_order=installation_order,
-            estimated_time=estimated_time,
-            disk_space_required=disk_space_required
+            estimated_time=estimate.seconds,
+            disk_space_required=math.ceil(estimate.installed_bytes / MB),
+            download_size=math.ceil(estimate.download_bytes / MB)
         )
         
+    def estimate_installation(self, installation_order: List[List[Package]]) -> InstallEstimate:
+        """Predict wall time and sizes of installing the levels with the concurrent executor."""
+        executor = InstallExecutor(self)
+        partitions, _ = executor.partition(installation_order)
+        batches = [
+            PlannedBatch(
+                manager=manager.value,
+                lock_group=executor.lock_group(manager),
+                level=level_number,
+                names=[p.name for p in batch],
+                package_names=[self.get_package_name(p, manager) for p in batch],
+                depends_on=sorted({d for p in batch for d in p.depends_on})
+            )
+            for manager, level_batches in partitions.items()
+            for level_number, batch in level_batches
+        ]
+        return self.estimator.estimate(batches)
+        
+    def expected_seconds(self, manager: PackageManager, packages: List[Package]) -> float:
+        """Predicted duration of one install transaction."""
+        return self.estimator.batch_seconds(manager.value,
+                                            [self.get_package_name(p, manager) for p in packages])
+        
+    def record_install(self, manager: PackageManager, packages: List[Package], elapsed: float):
+        """Feed a measured transaction duration into the install history."""
+        self.estimator.record(manager.value, [self.get_package_name(p, manager) for p in packages], elapsed)
+        
     def _detect_conflicts(self, packages: List[Package]) -> List[str]:
         """Detect potential package conflicts."""
         conflicts = []
@@ -342,42 +332,107 @@ class DependencyResolver:
                 
         return conflicts
         
+    def _dependency_closure(self, required_packages: List[str]) -> List[Package]:
+        """Expand requested names with their transitive depends_on edges."""
+        packages = []
+        seen = set()
+        pending = list(required_packages)
+        
+        while pending:
+            package_name = pending.pop(0)
+            if package_name in seen:
+                continue
+            seen.add(package_name)
+            
+            # Aliases such as openssh-server resolve to the canonical package
+            package = self.catalog.get(package_name)
+            if package is None:
+                self.logger.warning(f"Unknown package: {package_name}")
+                continue
+            if package.name != package_name:
+                if package.name in seen:
+                    continue
+                seen.add(package.name)
+                
+            packages.append(package)
+            pending.extend(package.depends_on)
+            
+        return packages
+        
+    def _topological_levels(self, packages: List[Package]) -> Tuple[List[List[Package]], List[Package]]:
+        """Kahn's algorithm: levels of mutually independent packages, plus packages left in cycles."""
+        by_name = {package.name: package for package in packages}
+        in_degree = {name: 0 for name in by_name}
+        dependents: Dict[str, List[str]] = {name: [] for name in by_name}
+        
+        # Only edges between packages that still need installing constrain the order
+        for package in packages:
+            for dependency in set(package.depends_on):
+                if dependency in by_name and dependency != package.name:
+                    in_degree[package.name] += 1
+                    dependents[dependency].append(package.name)
+                    
+        levels = []
+        ready = [package.name for package in packages if in_degree[package.name] == 0]
+        while ready:
+            levels.append([by_name[name] for name in ready])
+            next_ready = []
+            for name in ready:
+                for dependent in dependents[name]:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        next_ready.append(dependent)
+            ready = next_ready
+            
+        cyclic = [package for package in packages if in_degree[package.name] > 0]
+        return levels, cyclic
+        
     def _create_installation_order(self, packages: List[Package]) -> List[List[Package]]:
         """Create optimal installation order based on dependencies."""
-        # Simple ordering: system packages first, then applications
-        system_packages = []
-        dev_packages = []
-        app_packages = []
+        levels, cyclic = self._topological_levels(packages)
         
-        for package in packages:
-            if package.name in ["python3", "pip", "git", "curl", "wget"]:
-                system_packages.append(package)
-            elif package.name in ["nodejs", "npm", "docker"]:
-                dev_packages.append(package)
-            else:
-                app_packages.append(package)
+        # Package managers resolve cycles inside one transaction, so install them together last
+        if cyclic:
+            levels.append(cyclic)
+        return levels
+        
+    def select_manager(self, package: Package) -> Optional[PackageManager]:
+        """Pick the manager that installs package: the system one unless it lacks a native name."""
+        system_manager = next(
+            (m for m in self.detected_managers if m in self.SYSTEM_MANAGERS), None
+        )
+        if system_manager and package.native_name(system_manager.value):
+            return system_manager
+            
+        for manager in (PackageManager.PIP, PackageManager.NPM, PackageManager.CONDA, PackageManager.SNAP):
+            if package.native_name(manager.value) and manager in self.detected_managers:
+                return manager
                 
-        return [group for group in [system_packages, dev_packages, app_packages] if group]
+        return system_manager
         
     def install_packages(self, packages: List[Package], dry_run: bool = False) -> bool:
-        """Install packages using appropriate package manager."""
+        """Install packages with one concurrent worker per package manager."""
         if not packages:
             self.logger.info("No packages to install")
             return True
             
         self.logger.info(f"Installing {len(packages)} packages (dry_run={dry_run})")
         
-        for manager in self.detected_managers:
-            if manager in [PackageManager.APT, PackageManager.YUM, PackageManager.DNF, 
-                          PackageManager.PACMAN, PackageManager.APK]:
-                return self._install_with_system_manager(packages, manager, dry_run)
+        success = True
+        executor = InstallExecutor(self, governor=self.thermal_governor)
+        for event in executor.execute_levels(self._create_installation_order(packages), dry_run):
+            if event.status in ("failed", "skipped"):
+                success = False
+                self.logger.error(f"{event.manager}: {', '.join(event.packages)} {event.status} "
+                                  f"{event.message}".rstrip())
+            else:
+                self.logger.info(f"{event.manager}: {', '.join(event.packages)} {event.status}")
                 
-        self.logger.error("No suitable package manager found")
-        return False
+        return success
         
     def _install_with_system_manager(self, packages: List[Package], 
                                    manager: PackageManager, dry_run: bool) -> bool:
-        """Install packages with system package manager."""
+        """Install one batch of packages in a single package manager transaction."""
         package_names = []
         
         for package in packages:
@@ -389,18 +444,27 @@ class DependencyResolver:
             self.logger.warning("No valid package names found")
             return False
             
+        # Install from the same cache the prefetch stage downloaded into
         commands = {
-            PackageManager.APT: ["sudo", "apt", "install", "-y"] + package_names,
+            PackageManager.APT: ["sudo", "apt", "install", "-y",
+                                 "-o", f"Dir::Cache::archives={self._download_dir(manager)}"] + package_names,
             PackageManager.YUM: ["sudo", "yum", "install", "-y"] + package_names,
             PackageManager.DNF: ["sudo", "dnf", "install", "-y"] + package_names,
-            PackageManager.PACMAN: ["sudo", "pacman", "-S", "--noconfirm"] + package_names,
-            PackageManager.APK: ["sudo", "apk", "add"] + package_names
+            PackageManager.PACMAN: ["sudo", "pacman", "-S", "--noconfirm",
+                                    "--cachedir", self._download_dir(manager)] + package_names,
+            PackageManager.APK: ["sudo", "apk", "add"] + package_names,
+            PackageManager.PIP: ["pip", "install", "--find-links", self._download_dir(manager)] + package_names,
+            PackageManager.NPM: ["sudo", "npm", "install", "-g", "--cache", self.NPM_ROOT_CACHE] + package_names,
+            PackageManager.CONDA: ["conda", "install", "-y"] + package_names,
+            PackageManager.SNAP: ["sudo", "snap", "install"] + package_names
         }
         
         command = commands.get(manager)
         if not command:
             self.logger.error(f"Unsupported package manager: {manager}")
             return False
+        command = (command[:len(command) - len(package_names)] + self._proxy_options(manager)
+                   + self._prefetched_rpms(manager, package_names))
             
         if dry_run:
             self.logger.info(f"Would run: {' '.join(command)}")
@@ -417,6 +481,139 @@ class DependencyResolver:
             self.logger.error(f"Error output: {e.stderr}")
             return False
             
+    def start_prefetch(self, packages: List[Package]) -> concurrent.futures.Future:
+        """Download packages in the background; the future resolves to {manager: success}."""
+        future = concurrent.futures.Future()
+        
+        def run():
+            try:
+                future.set_result(self.prefetch_packages(packages))
+            except Exception as e:
+                self.logger.debug(f"Prefetch failed: {e}")
+                future.set_exception(e)
+                
+        threading.Thread(target=run, name="package-prefetch", daemon=True).start()
+        return future
+        
+    def prefetch_packages(self, packages: List[Package]) -> Dict[str, bool]:
+        """Run each manager's download-only mode so installing only unpacks and configures."""
+        batches: Dict[PackageManager, List[str]] = {}
+        for package in packages:
+            manager = self.select_manager(package)
+            name = self.get_package_name(package, manager) if manager else None
+            if name:
+                batches.setdefault(manager, []).append(name)
+                
+        results = {}
+        for manager, names in batches.items():
+            command = self._download_command(manager, names)
+            if command is None:
+                continue
+                
+            try:
+                self.logger.info(f"Prefetching: {' '.join(command)}")
+                before = self._rpm_files(manager)
+                result = subprocess.run(command, capture_output=True, text=True,
+                                        stdin=subprocess.DEVNULL)
+                results[manager.value] = result.returncode == 0
+                if result.returncode == 0 and manager in (PackageManager.YUM, PackageManager.DNF):
+                    self._prefetched[manager] = [path for path, mtime in self._rpm_files(manager).items()
+                                                 if before.get(path) != mtime]
+                if result.returncode != 0:
+                    self.logger.debug(f"Prefetch with {manager.value} failed: {result.stderr.strip()}")
+            except OSError as e:
+                self.logger.debug(f"Prefetch with {manager.value} failed: {e}")
+                results[manager.value] = False
+                
+        self._prune_download_cache()
+        return results
+        
+    def _download_command(self, manager: PackageManager, names: List[str]) -> Optional[List[str]]:
+        """Download-only command for a manager; sudo never prompts in the background."""
+        commands = {
+            PackageManager.APT: ["sudo", "-n", "apt-get", "install", "--download-only", "-y",
+                                 "-o", f"Dir::Cache::archives={self._download_dir(manager)}"],
+            # yum/dnf fetch only the package files; repo metadata stays in the system cachedir
+            PackageManager.YUM: ["sudo", "-n", "yum", "install", "-y", "--downloadonly",
+                                 f"--downloaddir={self._download_dir(manager)}"],
+            PackageManager.DNF: ["sudo", "-n", "dnf", "install", "-y", "--downloadonly",
+                                 f"--downloaddir={self._download_dir(manager)}"],
+            PackageManager.PACMAN: ["sudo", "-n", "pacman", "-Sw", "--noconfirm",
+                                    "--cachedir", self._download_dir(manager)],
+            PackageManager.PIP: ["pip", "download", "-d", self._download_dir(manager)],
+            PackageManager.NPM: ["sudo", "-n", "npm", "cache", "add", "--cache", self.NPM_ROOT_CACHE]
+        }
+        command = commands.get(manager)
+        return command + self._proxy_options(manager) + names if command else None
+        
+    def _proxy_options(self, manager: PackageManager) -> List[str]:
+        """Command line options routing a manager through the package cache proxy."""
+        if not self.proxy_url:
+            return []
+            
+        host = self.proxy_url.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+        options = {
+            PackageManager.APT: ["-o", f"Acquire::http::Proxy={self.proxy_url}"],
+            PackageManager.PIP: ["--index-url", f"{self.proxy_url}/pypi/", "--trusted-host", host],
+            PackageManager.NPM: ["--registry", f"{self.proxy_url}/npm/"]
+        }
+        return options.get(manager, [])
+        
+    def _rpm_files(self, manager: PackageManager) -> Dict[str, int]:
+        """Modification times of the rpm files in a manager's download directory."""
+        files = {}
+        for path in glob.glob(os.path.join(self._download_dir(manager), "*.rpm")):
+            try:
+                files[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return files
+        
+    def _prefetched_rpms(self, manager: PackageManager, names: List[str]) -> List[str]:
+        """Swap names for the rpm files this session's prefetch downloaded, so yum/dnf install them."""
+        prefetched = self._prefetched.get(manager, [])
+        resolved = []
+        for name in names:
+            # Versions start with a digit, so python3 does not match python3-libs
+            matches = [path for path in prefetched
+                       if fnmatch.fnmatchcase(os.path.basename(path), f"{glob.escape(name)}-[0-9]*.rpm")]
+            resolved.append(max(matches) if matches else name)
+        return resolved
+        
+    def _download_dir(self, manager: PackageManager) -> str:
+        """Per-manager download directory inside the package cache."""
+        path = os.path.join(self.download_cache_dir, manager.value)
+        try:
+            # apt refuses an archive directory without partial/
+            os.makedirs(os.path.join(path, "partial") if manager == PackageManager.APT else path,
+                        exist_ok=True)
+        except OSError as e:
+            self.logger.debug(f"Cannot create download cache {path}: {e}")
+        return path
+        
+    def _prune_download_cache(self):
+        """Delete least recently used downloads until the cache fits its size limit."""
+        files = []
+        for root, _, names in os.walk(self.download_cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+                
+        total = sum(size for _, size, _ in files)
+        limit = self.download_cache_mb * 1024 * 1024
+        for _, size, path in sorted(files):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                self.logger.debug(f"Cannot prune {path}: {e}")
+                
     def update_package_lists(self) -> bool:
         """Update package manager repositories."""
         for manager in self.detected_managers:
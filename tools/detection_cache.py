@@ -0,0 +1,61 @@
+"""
+Detection Cache Module
+Persistent per-boot store of static system facts
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Optional
+
+
+class DetectionCache:
+    """JSON store of facts that cannot change before the next reboot, under ~/.cache/unifikation."""
+    
+    CACHE_VERSION = 1
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        if cache_dir is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            cache_dir = os.path.join(cache_home, "unifikation")
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "system_facts.json")
+        
+    def _load(self) -> Dict:
+        """Load cache file, returning an empty cache when missing or corrupt."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.CACHE_VERSION:
+                return data
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Detection cache unavailable: {e}")
+            
+        return {"version": self.CACHE_VERSION, "boot_time": None, "facts": {}}
+        
+    def _save(self, data: Dict):
+        """Atomically write cache file."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write detection cache: {e}")
+            
+    def get(self, boot_time: int) -> Optional[Dict]:
+        """Facts recorded during this boot, None after a reboot or when never recorded."""
+        data = self._load()
+        if data["boot_time"] != boot_time or not data["facts"]:
+            return None
+        return data["facts"]
+        
+    def store(self, boot_time: int, facts: Dict):
+        """Record facts for this boot, replacing those of earlier boots."""
+        self._save({"version": self.CACHE_VERSION, "boot_time": boot_time, "facts": facts})
+        
+    def invalidate(self):
+        """Forget recorded facts."""
+        self._save({"version": self.CACHE_VERSION, "boot_time": None, "facts": {}})
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Health Sampler Module
+Background sampling of system health into a fixed-size ring buffer
+"""
+
+import os
+import math
+import json
+import time
+import array
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+from tools.sysfs_reader import SysfsReader
+
+
+class RingBuffer:
+    """Fixed-capacity columns of doubles; the oldest sample is overwritten when full."""
+    
+    def __init__(self, fields: Tuple[str, ...], capacity: int):
+        self.fields = fields
+        self.capacity = capacity
+        # Preallocated once, so memory stays constant however long sampling runs
+        self.columns = {name: array.array('d', [math.nan]) * capacity for name in fields}
+        self.next = 0
+        self.count = 0
+        
+    def append(self, sample: Dict[str, float]):
+        """Store one sample, missing fields as NaN."""
+        for name in self.fields:
+            self.columns[name][self.next] = sample.get(name, math.nan)
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        
+    def values(self, name: str) -> List[float]:
+        """Column values from oldest to newest."""
+        column = self.columns[name]
+        start = (self.next - self.count) % self.capacity
+        return [column[(start + i) % self.capacity] for i in range(self.count)]
+        
+    def __len__(self) -> int:
+        """Number of samples held."""
+        return self.count
+
+
+class HealthSampler:
+    """Sample CPU, memory, disk, load, temperature and network counters every interval seconds."""
+    
+    FIELDS = ("timestamp", "cpu_percent", "memory_percent", "disk_percent", "load",
+              "temperature", "net_bytes_sent", "net_bytes_recv")
+              
+    DEFAULT_INTERVAL = 5.0
+    DEFAULT_CAPACITY = 720  # One hour at the default interval
+    EWMA_ALPHA = 0.2
+    
+    def __init__(self, interval: float = DEFAULT_INTERVAL, capacity: int = DEFAULT_CAPACITY,
+                 sysfs: Optional[SysfsReader] = None, disk_path: str = "/"):
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval
+        self.sysfs = sysfs or SysfsReader()
+        self.disk_path = disk_path
+        self.buffer = RingBuffer(self.FIELDS, capacity)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+    def sample(self) -> Dict[str, float]:
+        """Take one reading and append it to the buffer."""
+        reading = {"timestamp": time.time()}
+        try:
+            reading["cpu_percent"] = psutil.cpu_percent(interval=None)
+            reading["memory_percent"] = psutil.virtual_memory().percent
+            reading["disk_percent"] = psutil.disk_usage(self.disk_path).percent
+            reading["load"] = os.getloadavg()[0]
+            network = psutil.net_io_counters()
+            if network is not None:
+                reading["net_bytes_sent"] = float(network.bytes_sent)
+                reading["net_bytes_recv"] = float(network.bytes_recv)
+        except (OSError, AttributeError) as e:
+            self.logger.debug(f"Partial health sample: {e}")
+            
+        temperature = self.sysfs.cpu_temperature()
+        if temperature is not None:
+            reading["temperature"] = temperature
+            
+        with self._lock:
+            self.buffer.append(reading)
+        return reading
+        
+    def start(self):
+        """Start sampling in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        # The first cpu_percent call only primes psutil's counters
+        psutil.cpu_percent(interval=None)
+        # Record one reading now so callers have history before the first interval passes
+        self.sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-sampler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Health sampling every {self.interval:.0f}s, {self.buffer.capacity} samples kept")
+        
+    def stop(self):
+        """Stop sampling and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            
+    def _run(self):
+        """Sample until stopped."""
+        while not self._stop.wait(self.interval):
+            self.sample()
+            
+    def window(self, name: str, seconds: Optional[float] = None) -> List[float]:
+        """Known values of one field from the last seconds, oldest first."""
+        with self._lock:
+            timestamps = self.buffer.values("timestamp")
+            values = self.buffer.values(name)
+            
+        cutoff = -math.inf if seconds is None else time.time() - seconds
+        return [value for stamp, value in zip(timestamps, values) if stamp >= cutoff and not math.isnan(value)]
+        
+    def percentile(self, name: str, percent: float, seconds: Optional[float] = None) -> Optional[float]:
+        """Nearest-rank percentile of a field over the window, None without samples."""
+        values = sorted(self.window(name, seconds))
+        if not values:
+            return None
+        rank = max(1, math.ceil(percent / 100.0 * len(values)))
+        return values[rank - 1]
+        
+    def ewma(self, name: str, seconds: Optional[float] = None, alpha: float = EWMA_ALPHA) -> Optional[float]:
+        """Exponentially weighted moving average of a field over the window, None without samples."""
+        average = None
+        for value in self.window(name, seconds):
+            average = value if average is None else alpha * value + (1 - alpha) * average
+        return average
+        
+    def aggregates(self, seconds: Optional[float] = None) -> Dict[str, Dict[str, Optional[float]]]:
+        """p95, EWMA and latest value of every sampled field."""
+        summary = {}
+        for name in self.FIELDS[1:]:
+            values = self.window(name, seconds)
+            summary[name] = {
+                "p95": self.percentile(name, 95, seconds),
+                "ewma": self.ewma(name, seconds),
+                "last": values[-1] if values else None
+            }
+        return summary
+        
+    def history(self) -> Dict[str, List[Optional[float]]]:
+        """Buffered samples as columns, unknown values as None."""
+        with self._lock:
+            columns = {name: self.buffer.values(name) for name in self.FIELDS}
+        return {name: [None if math.isnan(value) else value for value in values]
+                for name, values in columns.items()}
+                
+    def export(self, filepath: str):
+        """Write sampling settings, aggregates and history to JSON for monitoring."""
+        export_data = {
+            "interval": self.interval,
+            "capacity": self.buffer.capacity,
+            "aggregates": self.aggregates(),
+            "history": self.history()
+        }
+        with open(filepath, 'w') as f:
+            json.dump(export_data, f, indent=2)
+            
+        self.logger.info(f"Health history exported to {filepath}")
\ No newline at end of file
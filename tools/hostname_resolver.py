@@ -0,0 +1,186 @@
+"""
+Hostname Resolver Module
+Cached, non-blocking reverse DNS for network discovery
+"""
+
+import os
+import socket
+import threading
+import queue
+import time
+import logging
+import concurrent.futures
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class HostnameResolver:
+    """Reverse DNS with LRU+TTL cache, negative caching and a local name index."""
+    
+    HOSTS_FILE = "/etc/hosts"
+    SSH_CONFIG = "~/.ssh/config"
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, negative_ttl: float = 300,
+                 max_workers: int = 16, use_local_index: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_workers = max_workers
+        self.use_local_index = use_local_index
+        
+        self._cache: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        
+        self._local_index: Dict[str, str] = {}
+        self._local_index_key: Optional[Tuple] = None
+        
+    def lookup_cached(self, ip: str) -> Tuple[bool, Optional[str]]:
+        """Answer from local index or cache without any I/O; returns (hit, hostname)."""
+        hostname = self._lookup_local_index(ip)
+        if hostname:
+            return True, hostname
+            
+        with self._lock:
+            entry = self._cache.get(ip)
+            if entry is None:
+                return False, None
+                
+            hostname, expires = entry
+            if expires < time.monotonic():
+                del self._cache[ip]
+                return False, None
+                
+            self._cache.move_to_end(ip)
+            return True, hostname
+            
+    def resolve(self, ip: str) -> Optional[str]:
+        """Resolve IP address to hostname, blocking on a cache miss."""
+        hit, hostname = self.lookup_cached(ip)
+        if hit:
+            return hostname
+        return self._lookup_and_store(ip)
+        
+    def resolve_async(self, ip: str) -> concurrent.futures.Future:
+        """Resolve in the background; concurrent requests for one IP share a lookup."""
+        hit, hostname = self.lookup_cached(ip)
+        if hit:
+            future = concurrent.futures.Future()
+            future.set_result(hostname)
+            return future
+            
+        with self._lock:
+            future = self._pending.get(ip)
+            if future is not None:
+                return future
+                
+            future = concurrent.futures.Future()
+            self._pending[ip] = future
+            self._ensure_workers()
+            
+        self._queue.put(ip)
+        return future
+        
+    def resolve_many(self, ips: List[str],
+                     timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """Resolve many addresses concurrently, returning those finished within timeout."""
+        futures = {ip: self.resolve_async(ip) for ip in ips}
+        concurrent.futures.wait(futures.values(), timeout=timeout)
+        
+        return {ip: future.result() for ip, future in futures.items() if future.done()}
+        
+    def _lookup_and_store(self, ip: str) -> Optional[str]:
+        """Perform reverse lookup and cache positive or negative result."""
+        try:
+            hostname = socket.gethostbyaddr(ip)[0]
+        except Exception:
+            hostname = None
+            
+        ttl = self.ttl if hostname else self.negative_ttl
+        with self._lock:
+            self._cache[ip] = (hostname, time.monotonic() + ttl)
+            self._cache.move_to_end(ip)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                
+        return hostname
+        
+    def _ensure_workers(self):
+        """Start daemon lookup workers so slow lookups never delay interpreter exit."""
+        if len(self._workers) >= self.max_workers or self._queue.qsize() < len(self._workers):
+            return
+            
+        worker = threading.Thread(target=self._worker, name="rdns-resolver", daemon=True)
+        self._workers.append(worker)
+        worker.start()
+        
+    def _worker(self):
+        """Process queued reverse lookups."""
+        while True:
+            ip = self._queue.get()
+            hostname = self._lookup_and_store(ip)
+            
+            with self._lock:
+                future = self._pending.pop(ip, None)
+            if future is not None:
+                future.set_result(hostname)
+                
+    def _lookup_local_index(self, ip: str) -> Optional[str]:
+        """Look up name from /etc/hosts and ~/.ssh/config HostName entries."""
+        if not self.use_local_index:
+            return None
+            
+        paths = [self.HOSTS_FILE, os.path.expanduser(self.SSH_CONFIG)]
+        key = tuple(self._file_mtime(path) for path in paths)
+        
+        with self._lock:
+            if key != self._local_index_key:
+                index = self._parse_ssh_config(paths[1])
+                index.update(self._parse_hosts_file(paths[0]))
+                self._local_index = index
+                self._local_index_key = key
+            return self._local_index.get(ip)
+            
+    @staticmethod
+    def _file_mtime(path: str) -> Optional[float]:
+        """Modification time of path, None if missing."""
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+            
+    def _parse_hosts_file(self, path: str) -> Dict[str, str]:
+        """Map addresses to the first name listed in a hosts file."""
+        index = {}
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    parts = line.split('#', 1)[0].split()
+                    if len(parts) >= 2 and parts[0] not in index:
+                        index[parts[0]] = parts[1]
+        except OSError:
+            pass
+        return index
+        
+    def _parse_ssh_config(self, path: str) -> Dict[str, str]:
+        """Map HostName addresses to their ssh Host alias."""
+        index = {}
+        aliases: List[str] = []
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    parts = line.strip().split(None, 1)
+                    if len(parts) < 2:
+                        continue
+                        
+                    keyword, value = parts[0].lower(), parts[1].strip()
+                    if keyword == "host":
+                        aliases = [a for a in value.split() if not any(c in a for c in "*?!")]
+                    elif keyword == "hostname" and aliases and value not in index:
+                        index[value] = aliases[0]
+        except OSError:
+            pass
+        return index
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+Install Estimator Module
+Installation time and disk predictions from package metadata and measured history
+"""
+
+import os
+import re
+import math
+import subprocess
+import threading
+import logging
+from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+
+
+MB = 1024 * 1024
+
+
+@dataclass
+class PlannedBatch:
+    """One package manager transaction of an installation plan."""
+    manager: str
+    lock_group: str
+    level: int
+    names: List[str]
+    package_names: List[str]
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class InstallEstimate:
+    """Predicted wall time and sizes of an installation plan."""
+    seconds: int
+    download_bytes: int
+    installed_bytes: int
+
+
+class InstallEstimator:
+    """Predict installation wall time from sizes, measured durations and concurrency."""
+    
+    # (download, installed) bytes assumed when a manager reports nothing
+    DEFAULT_SIZES = {
+        "apt": (2 * MB, 8 * MB),
+        "yum": (2 * MB, 8 * MB),
+        "dnf": (2 * MB, 8 * MB),
+        "pacman": (2 * MB, 8 * MB),
+        "apk": (1 * MB, 4 * MB),
+        "pip": (1 * MB, 4 * MB),
+        "npm": (1 * MB, 5 * MB),
+        "conda": (10 * MB, 40 * MB),
+        "snap": (50 * MB, 50 * MB)
+    }
+    FALLBACK_SIZE = (2 * MB, 8 * MB)
+    
+    # Fixed cost of one transaction: dependency solving, locking, triggers
+    TRANSACTION_SECONDS = {
+        "apt": 5.0, "yum": 10.0, "dnf": 8.0, "pacman": 3.0, "apk": 1.0,
+        "brew": 5.0, "pip": 2.0, "npm": 3.0, "conda": 15.0, "snap": 10.0
+    }
+    FALLBACK_TRANSACTION_SECONDS = 5.0
+    
+    PACKAGE_SECONDS = 1.0
+    DOWNLOAD_RATE = 5 * MB
+    UNPACK_RATE = 50 * MB
+    
+    # Installed size relative to download size when only one is reported
+    INSTALLED_RATIO = 3
+    
+    UNITS = {
+        "b": 1, "k": 1024, "kb": 1024, "kib": 1024, "m": MB, "mb": MB, "mib": MB,
+        "g": 1024 * MB, "gb": 1024 * MB, "gib": 1024 * MB
+    }
+    
+    def __init__(self, history=None):
+        """Initialize estimator with optional InstallHistory of measured durations."""
+        self.logger = logging.getLogger(__name__)
+        self.history = history
+        self._sizes: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        
+    def sizes(self, manager: str, package_names: List[str]) -> Dict[str, Tuple[int, int]]:
+        """(download, installed) bytes per package, asking the manager once per unknown batch."""
+        missing = [name for name in package_names if (manager, name) not in self._sizes]
+        if missing:
+            try:
+                found = self._query_sizes(manager, missing)
+            except (OSError, subprocess.SubprocessError) as e:
+                self.logger.debug(f"Cannot read {manager} package sizes: {e}")
+                found = {}
+                
+            default = self.DEFAULT_SIZES.get(manager, self.FALLBACK_SIZE)
+            with self._lock:
+                for name in missing:
+                    self._sizes[(manager, name)] = found.get(name, default)
+                    
+        return {name: self._sizes[(manager, name)] for name in package_names}
+        
+    def _query_sizes(self, manager: str, names: List[str]) -> Dict[str, Tuple[int, int]]:
+        """Read sizes from repository metadata in a single manager call."""
+        if manager == "apt":
+            # Size is in bytes, Installed-Size in KiB
+            output = self._run_query(["apt-cache", "show", "--no-all-versions"] + names)
+            return self._parse_metadata(output, download_unit=1, installed_unit=1024)
+        if manager in ("dnf", "yum"):
+            output = self._run_query([manager, "info", "-q"] + names)
+            return self._parse_metadata(output, download_unit=1, installed_unit=1)
+        if manager == "pacman":
+            output = self._run_query(["pacman", "-Si"] + names)
+            return self._parse_metadata(output, download_unit=1, installed_unit=1)
+        return {}
+        
+    def _run_query(self, command: List[str]) -> str:
+        """Run read-only metadata command in the C locale and return its stdout."""
+        env = dict(os.environ, LC_ALL="C")
+        result = subprocess.run(command, capture_output=True, text=True, env=env, timeout=30)
+        return result.stdout
+        
+    def _parse_metadata(self, output: str, download_unit: int,
+                        installed_unit: int) -> Dict[str, Tuple[int, int]]:
+        """Parse 'Key: value' records of apt-cache, dnf and pacman into sizes by name."""
+        sizes: Dict[str, Tuple[int, int]] = {}
+        name = None
+        record: Dict[str, int] = {}
+        
+        def flush():
+            if name and record and name not in sizes:
+                download = record.get("download") or record["installed"] // self.INSTALLED_RATIO
+                installed = record.get("installed") or download * self.INSTALLED_RATIO
+                sizes[name] = (download, installed)
+                
+        for line in output.splitlines():
+            # Continuation lines of descriptions start with whitespace
+            if not line or line[0].isspace():
+                continue
+            key, sep, value = line.partition(":")
+            key = key.strip().lower()
+            if not sep:
+                continue
+            if key in ("package", "name"):
+                flush()
+                name, record = value.strip(), {}
+            elif key in ("size", "download size"):
+                record.setdefault("download", self._parse_size(value, download_unit))
+            elif key in ("installed-size", "installed size"):
+                record.setdefault("installed", self._parse_size(value, installed_unit))
+        flush()
+        
+        return {n: s for n, s in sizes.items() if s[0] or s[1]}
+        
+    def _parse_size(self, value: str, default_unit: int) -> int:
+        """Convert '44890', '53 k' or '6.87 MiB' to bytes."""
+        match = re.match(r"\s*([\d.,]+)\s*([A-Za-z]*)", value)
+        if not match:
+            return 0
+        unit = self.UNITS.get(match.group(2).lower(), default_unit)
+        return int(float(match.group(1).replace(",", ".")) * unit)
+        
+    def _modelled_seconds(self, size: Tuple[int, int]) -> float:
+        """Install seconds of one package derived from its sizes alone."""
+        download, installed = size
+        return self.PACKAGE_SECONDS + download / self.DOWNLOAD_RATE + installed / self.UNPACK_RATE
+        
+    def package_seconds(self, manager: str, package_names: List[str]) -> Dict[str, float]:
+        """Predicted seconds per package: measured history first, size model otherwise."""
+        measured = self.history.durations(manager) if self.history else {}
+        sizes = self.sizes(manager, package_names)
+        return {name: measured.get(name, self._modelled_seconds(sizes[name])) for name in package_names}
+        
+    def batch_seconds(self, manager: str, package_names: List[str]) -> float:
+        """Predicted duration of one transaction installing package_names."""
+        overhead = self.TRANSACTION_SECONDS.get(manager, self.FALLBACK_TRANSACTION_SECONDS)
+        return overhead + sum(self.package_seconds(manager, package_names).values())
+        
+    def estimate(self, batches: List[PlannedBatch]) -> InstallEstimate:
+        """Simulate the concurrent executor: batches wait for dependencies and their lock group."""
+        finished: Dict[str, float] = {}
+        group_free: Dict[str, float] = {}
+        download_bytes = installed_bytes = 0
+        end = 0.0
+        
+        for batch in sorted(batches, key=lambda b: b.level):
+            for download, installed in self.sizes(batch.manager, batch.package_names).values():
+                download_bytes += download
+                installed_bytes += installed
+                
+            start = max([group_free.get(batch.lock_group, 0.0)] +
+                        [finished[d] for d in batch.depends_on if d in finished])
+            finish = start + self.batch_seconds(batch.manager, batch.package_names)
+            group_free[batch.lock_group] = finish
+            for name in batch.names:
+                finished[name] = finish
+            end = max(end, finish)
+            
+        # Concurrent transactions still share one network link
+        end = max(end, download_bytes / self.DOWNLOAD_RATE)
+        return InstallEstimate(seconds=math.ceil(end), download_bytes=download_bytes,
+                               installed_bytes=installed_bytes)
+                               
+    def record(self, manager: str, package_names: List[str], elapsed: float):
+        """Split a measured transaction time over its packages by their modelled share."""
+        if self.history is None or not package_names:
+            return
+            
+        overhead = self.TRANSACTION_SECONDS.get(manager, self.FALLBACK_TRANSACTION_SECONDS)
+        default = self.DEFAULT_SIZES.get(manager, self.FALLBACK_SIZE)
+        weights = {name: self._modelled_seconds(self._sizes.get((manager, name), default))
+                   for name in package_names}
+        total = sum(weights.values())
+        work = max(elapsed - overhead, 0.0)
+        self.history.record(manager, {name: work * weight / total for name, weight in weights.items()})
\ No newline at end of file
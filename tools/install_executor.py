@@ -0,0 +1,206 @@
+"""
+Install Executor Module
+Concurrent per-manager installation with lock groups and progress events
+"""
+
+import os
+import time
+import queue
+import threading
+import concurrent.futures
+import logging
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from tools.command_index import which
+
+
+@dataclass
+class ProgressEvent:
+    """Progress of one manager transaction."""
+    manager: str
+    status: str  # started, finished, failed, skipped
+    packages: List[str]
+    level: int
+    elapsed: float = 0.0
+    expected: float = 0.0
+    message: str = ""
+    timestamp: float = field(default_factory=time.time)
+
+
+# One lock per group for the whole process, so separate executors never collide
+_group_locks: Dict[str, threading.Lock] = {}
+_group_locks_guard = threading.Lock()
+
+
+class InstallExecutor:
+    """Run each package manager's share of a plan in its own worker."""
+    
+    # Managers that serialize on the same on-disk lock
+    LOCK_GROUPS = {
+        "apt": "dpkg",
+        "yum": "rpm",
+        "dnf": "rpm",
+        "zypper": "rpm",
+        "pacman": "pacman",
+        "apk": "apk",
+        "brew": "brew",
+        "conda": "conda",
+        "snap": "snapd",
+        "npm": "npm-global"
+    }
+    
+    # Seconds a throttled batch waits before re-checking the thermal limit
+    THROTTLE_POLL = 2.0
+    
+    def __init__(self, resolver, max_workers: Optional[int] = None, governor=None):
+        self.logger = logging.getLogger(__name__)
+        self.resolver = resolver
+        self.max_workers = max_workers
+        # Optional ThermalGovernor lowering max_workers while the CPU is hot
+        self.governor = governor
+        
+    def lock_group(self, manager) -> str:
+        """Lock group of a manager; pip is locked per Python environment."""
+        if manager.value == "pip":
+            pip_path = which("pip") or which("pip3") or "pip"
+            return f"pip:{os.path.dirname(os.path.realpath(pip_path))}"
+        return self.LOCK_GROUPS.get(manager.value, manager.value)
+        
+    @staticmethod
+    def _group_lock(group: str) -> threading.Lock:
+        """Process-wide lock for a lock group."""
+        with _group_locks_guard:
+            return _group_locks.setdefault(group, threading.Lock())
+            
+    def partition(self, installation_order: List[List]) -> Tuple[Dict, List]:
+        """Split levels into per-manager batches; returns ({manager: [(level, batch)]}, unmanaged)."""
+        partitions: Dict = {}
+        unmanaged = []
+        for level_number, level in enumerate(installation_order, 1):
+            batches: Dict = {}
+            for package in level:
+                manager = self.resolver.select_manager(package)
+                if manager is None:
+                    unmanaged.append(package)
+                else:
+                    batches.setdefault(manager, []).append(package)
+            for manager, batch in batches.items():
+                partitions.setdefault(manager, []).append((level_number, batch))
+        return partitions, unmanaged
+        
+    def execute(self, plan, dry_run: bool = False) -> Iterator[ProgressEvent]:
+        """Install an InstallationPlan, yielding progress events as they happen."""
+        return self.execute_levels(plan.installation_order, dry_run)
+        
+    def execute_levels(self, installation_order: List[List],
+                       dry_run: bool = False) -> Iterator[ProgressEvent]:
+        """Run every manager partition concurrently, honouring cross-manager dependencies."""
+        partitions, unmanaged = self.partition(installation_order)
+        for package in unmanaged:
+            yield ProgressEvent("none", "failed", [package.name], 0,
+                                message="No suitable package manager found")
+                                
+        if not partitions:
+            return
+            
+        # A package is done once its batch finished; dependents wait on it
+        level_of = {p.name: n for n, level in enumerate(installation_order, 1) for p in level}
+        done = {name: threading.Event() for name in level_of}
+        succeeded: Dict[str, bool] = {p.name: False for p in unmanaged}
+        for package in unmanaged:
+            done[package.name].set()
+            
+        events: queue.Queue = queue.Queue()
+        
+        # One thread per partition so a waiting partition never starves the one it waits on;
+        # max_workers caps how many transactions run at once, less while the governor throttles
+        workers = self.max_workers or len(partitions)
+        slots = threading.Condition()
+        active = [0]
+        
+        def run_batch(manager, batch: List, level_number: int) -> bool:
+            with slots:
+                while active[0] >= (self.governor.limit(workers) if self.governor else workers):
+                    slots.wait(self.THROTTLE_POLL)
+                active[0] += 1
+            try:
+                return self._run_batch(manager, batch, level_number, dry_run, events.put)
+            finally:
+                with slots:
+                    active[0] -= 1
+                    slots.notify_all()
+                
+        def run_partition(manager, batches: List[Tuple[int, List]]):
+            for level_number, batch in batches:
+                names = [p.name for p in batch]
+                ok = False
+                try:
+                    # Dependencies in earlier levels only; same-level packages are a cycle
+                    dependencies = {d for p in batch for d in p.depends_on
+                                    if level_of.get(d, level_number) < level_number}
+                    for dependency in dependencies:
+                        done[dependency].wait()
+                        
+                    failed = [d for d in dependencies if not succeeded.get(d)]
+                    if failed:
+                        events.put(ProgressEvent(manager.value, "skipped", names, level_number,
+                                                 message=f"Dependencies failed: {', '.join(sorted(failed))}"))
+                    else:
+                        ok = run_batch(manager, batch, level_number)
+                finally:
+                    # Always release dependents, even if this batch crashed
+                    for name in names:
+                        succeeded[name] = ok
+                        done[name].set()
+                        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+            futures = [executor.submit(run_partition, manager, batches)
+                       for manager, batches in partitions.items()]
+            for future in futures:
+                future.add_done_callback(lambda f: events.put(None))
+                
+            remaining = len(futures)
+            while remaining:
+                event = events.get()
+                if event is None:
+                    remaining -= 1
+                else:
+                    yield event
+                    
+            for future in futures:
+                future.result()
+                
+    def _run_batch(self, manager, batch: List, level_number: int, dry_run: bool,
+                   emit: Callable[[ProgressEvent], None]) -> bool:
+        """Install one batch while holding its manager's lock group."""
+        names = [p.name for p in batch]
+        expected = round(self.resolver.expected_seconds(manager, batch), 1)
+        with self._group_lock(self.lock_group(manager)):
+            emit(ProgressEvent(manager.value, "started", names, level_number, expected=expected))
+            started = time.monotonic()
+            try:
+                ok = self.resolver._install_with_system_manager(batch, manager, dry_run)
+            except Exception as e:
+                self.logger.error(f"{manager.value} installation crashed: {e}")
+                ok = False
+            elapsed = time.monotonic() - started
+            
+        # Measured durations sharpen the next plan's estimate
+        if ok and not dry_run:
+            self.resolver.record_install(manager, batch, elapsed)
+            
+        emit(ProgressEvent(manager.value, "finished" if ok else "failed", names, level_number,
+                           elapsed=round(elapsed, 3), expected=expected))
+        return ok
+        
+    def run(self, plan, dry_run: bool = False,
+            callback: Optional[Callable[[ProgressEvent], None]] = None) -> bool:
+        """Install plan to completion; True when every batch succeeded."""
+        success = True
+        for event in self.execute(plan, dry_run):
+            if callback:
+                callback(event)
+            if event.status in ("failed", "skipped"):
+                success = False
+        return success
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Install History Module
+Measured package installation durations per host class
+"""
+
+import os
+import json
+import platform
+import threading
+import logging
+from typing import Dict, Optional
+
+import psutil
+
+
+def host_class() -> str:
+    """Coarse machine class; durations only transfer between similar hosts."""
+    memory_gb = round(psutil.virtual_memory().total / (1024 ** 3))
+    return f"{platform.machine()}-{os.cpu_count()}cpu-{memory_gb}gb"
+
+
+class InstallHistory:
+    """JSON store of install durations under ~/.local/state/unifikation."""
+    
+    HISTORY_VERSION = 1
+    
+    # Weight of the newest sample in the moving average
+    SMOOTHING = 0.3
+    
+    def __init__(self, state_dir: Optional[str] = None, host: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        if state_dir is None:
+            state_home = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+            state_dir = os.path.join(state_home, "unifikation")
+        self.state_dir = state_dir
+        self.path = os.path.join(state_dir, "install_history.json")
+        self.host = host or host_class()
+        self._lock = threading.Lock()
+        
+    def _load(self) -> Dict:
+        """Load history file, returning an empty history when missing or corrupt."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.HISTORY_VERSION:
+                return data
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Install history unavailable: {e}")
+            
+        return {"version": self.HISTORY_VERSION, "hosts": {}}
+        
+    def _save(self, data: Dict):
+        """Atomically write history file."""
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write install history: {e}")
+            
+    def durations(self, manager: str) -> Dict[str, float]:
+        """Smoothed install seconds of every recorded package of a manager on this host class."""
+        packages = self._load()["hosts"].get(self.host, {}).get(manager, {})
+        return {name: entry["seconds"] for name, entry in packages.items()}
+        
+    def record(self, manager: str, durations: Dict[str, float]):
+        """Fold measured seconds per package into the moving averages."""
+        with self._lock:
+            data = self._load()
+            packages = data["hosts"].setdefault(self.host, {}).setdefault(manager, {})
+            for name, seconds in durations.items():
+                entry = packages.get(name)
+                if entry is None:
+                    packages[name] = {"seconds": round(seconds, 3), "samples": 1}
+                else:
+                    entry["seconds"] = round(entry["seconds"] + self.SMOOTHING * (seconds - entry["seconds"]), 3)
+                    entry["samples"] += 1
+            self._save(data)
\ No newline at end of file
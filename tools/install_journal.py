@@ -0,0 +1,83 @@
+"""
+Install Journal Module
+Write-ahead journal of setup steps so an interrupted installation can resume
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from typing import Dict, Optional, Tuple
+
+
+class InstallJournal:
+    """Append-only step log under ~/.local/state/unifikation, removed once a run completes."""
+    
+    JOURNAL_VERSION = 1
+    
+    def __init__(self, name: str = "workstation", state_dir: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        if state_dir is None:
+            state_home = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+            state_dir = os.path.join(state_home, "unifikation")
+        self.state_dir = state_dir
+        self.path = os.path.join(state_dir, f"{name}_journal.jsonl")
+        self._lock = threading.Lock()
+        
+    @staticmethod
+    def checksum(*parts) -> str:
+        """Checksum of everything that defines a step; a changed step is redone."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+        
+    def load(self) -> Dict[str, Tuple[str, str]]:
+        """Latest (state, checksum) of every step of the unfinished run, empty if none."""
+        steps: Dict[str, Tuple[str, str]] = {}
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash
+                        continue
+                    if record.get("version") != self.JOURNAL_VERSION:
+                        continue
+                    steps[record["step"]] = (record["state"], record["checksum"])
+        except OSError:
+            pass
+        return steps
+        
+    def is_done(self, step: str, checksum: str) -> bool:
+        """True when step completed in the unfinished run with the same checksum."""
+        return self.load().get(step) == ("done", checksum)
+        
+    def record(self, step: str, state: str, checksum: str):
+        """Append a step state and force it to disk before the step's effects."""
+        record = {"version": self.JOURNAL_VERSION, "step": step, "state": state,
+                  "checksum": checksum, "timestamp": time.time()}
+        with self._lock:
+            try:
+                os.makedirs(self.state_dir, exist_ok=True)
+                with open(self.path, 'a+b') as f:
+                    # Never append to the tail of a torn record
+                    prefix = b""
+                    if f.seek(0, os.SEEK_END):
+                        f.seek(-1, os.SEEK_END)
+                        prefix = b"" if f.read(1) == b"\n" else b"\n"
+                    f.write(prefix + json.dumps(record).encode() + b"\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                self.logger.warning(f"Could not write install journal: {e}")
+                
+    def complete(self):
+        """Discard the journal after a fully successful run."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Could not remove install journal: {e}")
\ No newline at end of file
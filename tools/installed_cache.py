@@ -0,0 +1,80 @@
+"""
+Installed Cache Module
+Persistent installed-package snapshots keyed by package database state
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+
+class InstalledStateCache:
+    """JSON store of installed-package query results under ~/.cache/unifikation."""
+    
+    CACHE_VERSION = 1
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        if cache_dir is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            cache_dir = os.path.join(cache_home, "unifikation")
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "installed.json")
+        
+    def _load(self) -> Dict:
+        """Load cache file, returning an empty cache when missing or corrupt."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.CACHE_VERSION:
+                return data
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Installed-state cache unavailable: {e}")
+            
+        return {"version": self.CACHE_VERSION, "managers": {}}
+        
+    def _save(self, data: Dict):
+        """Atomically write cache file."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write installed-state cache: {e}")
+            
+    def get(self, manager: str, signature: List,
+            names: Iterable[str]) -> Optional[Dict[str, Optional[str]]]:
+        """Cached versions for names, None unless every name was recorded under signature."""
+        entry = self._load()["managers"].get(manager)
+        if not entry or entry["signature"] != signature:
+            return None
+            
+        packages = entry["packages"]
+        names = list(names)
+        if any(name not in packages for name in names):
+            return None
+            
+        return {name: packages[name] for name in names}
+        
+    def store(self, manager: str, signature: List, results: Dict[str, Optional[str]]):
+        """Record query results; a changed signature discards older results."""
+        data = self._load()
+        entry = data["managers"].get(manager)
+        if not entry or entry["signature"] != signature:
+            entry = {"signature": signature, "packages": {}}
+            data["managers"][manager] = entry
+            
+        entry["packages"].update(results)
+        self._save(data)
+        
+    def invalidate(self, manager: Optional[str] = None):
+        """Forget one manager or the whole cache."""
+        data = self._load()
+        if manager is None:
+            data["managers"] = {}
+        else:
+            data["managers"].pop(manager, None)
+        self._save(data)
\ No newline at end of file
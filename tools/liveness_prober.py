@@ -0,0 +1,277 @@
+"""
+Liveness Prober Module
+In-process host liveness detection without forking ping
+"""
+
+import asyncio
+import collections
+import errno
+import os
+import selectors
+import socket
+import struct
+import time
+import logging
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+
+class LivenessProber:
+    """Burst host liveness probing via ICMP datagram sockets or TCP connects."""
+    
+    # Ports used when the kernel does not allow unprivileged ICMP sockets
+    FALLBACK_PORTS = [22, 2222]
+    
+    def __init__(self, fallback_ports: Optional[List[int]] = None, max_sockets: int = 512):
+        self.logger = logging.getLogger(__name__)
+        self.fallback_ports = fallback_ports or list(self.FALLBACK_PORTS)
+        self.max_sockets = max_sockets
+        self._icmp_available: Optional[bool] = None
+        
+    def icmp_available(self) -> bool:
+        """Check whether unprivileged ICMP datagram sockets are allowed."""
+        if self._icmp_available is None:
+            try:
+                sock = self._open_icmp_socket()
+                sock.close()
+                self._icmp_available = True
+            except OSError as e:
+                self.logger.debug(f"ICMP datagram sockets unavailable, using TCP fallback: {e}")
+                self._icmp_available = False
+                
+        return self._icmp_available
+        
+    def probe_hosts(self, hosts: List[str], timeout: float = 1.0) -> Dict[str, float]:
+        """Probe all hosts in one burst and return response times in milliseconds."""
+        return dict(self.iter_probe(hosts, timeout))
+        
+    def iter_probe(self, hosts: List[str], timeout: float = 1.0) -> Iterator[Tuple[str, float]]:
+        """Yield (ip, ping_time) for every host as its reply arrives."""
+        if not hosts:
+            return
+            
+        try:
+            if self.icmp_available():
+                yield from self._icmp_sweep(hosts, timeout)
+            else:
+                yield from self._tcp_sweep(hosts, timeout)
+        except Exception as e:
+            self.logger.debug(f"Liveness sweep failed: {e}")
+            
+    async def aiter_probe(self, hosts: List[str],
+                          timeout: float = 1.0) -> AsyncIterator[Tuple[str, float]]:
+        """Async twin of iter_probe driven by the running event loop."""
+        if not hosts:
+            return
+            
+        try:
+            if self.icmp_available():
+                async for reply in self._icmp_sweep_async(hosts, timeout):
+                    yield reply
+            else:
+                async for reply in self._tcp_sweep_async(hosts, timeout):
+                    yield reply
+        except Exception as e:
+            self.logger.debug(f"Async liveness sweep failed: {e}")
+            
+    def _open_icmp_socket(self) -> socket.socket:
+        """Open unprivileged ICMP echo socket (net.ipv4.ping_group_range)."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        sock.setblocking(False)
+        return sock
+        
+    def _build_echo_request(self, sequence: int) -> bytes:
+        """Build ICMP echo request; the kernel rewrites the identifier."""
+        payload = b"unifikation-liveness"
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, os.getpid() & 0xFFFF, sequence)
+        checksum = self._checksum(header + payload)
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, os.getpid() & 0xFFFF, sequence)
+        return header + payload
+        
+    def _parse_echo_reply(self, data: bytes) -> Optional[int]:
+        """Return sequence number of an ICMP echo reply."""
+        if len(data) < 8:
+            return None
+        icmp_type, _, _, _, sequence = struct.unpack("!BBHHH", data[:8])
+        return sequence if icmp_type == ICMP_ECHO_REPLY else None
+        
+    @staticmethod
+    def _checksum(data: bytes) -> int:
+        """Internet checksum (RFC 1071)."""
+        if len(data) % 2:
+            data += b"\x00"
+        total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+        total = (total >> 16) + (total & 0xFFFF)
+        total += total >> 16
+        return ~total & 0xFFFF
+        
+    def _send_echo_burst(self, sock: socket.socket, hosts: List[str]) -> Dict[int, Tuple[str, float]]:
+        """Send one echo request per host and remember send times by sequence."""
+        sent = {}
+        for sequence, ip in enumerate(hosts):
+            sequence &= 0xFFFF
+            try:
+                sock.sendto(self._build_echo_request(sequence), (ip, 0))
+                sent[sequence] = (ip, time.monotonic())
+            except OSError as e:
+                self.logger.debug(f"ICMP send failed for {ip}: {e}")
+        return sent
+        
+    def _handle_echo_reply(self, data: bytes, address: Tuple[str, int],
+                           sent: Dict[int, Tuple[str, float]]) -> Optional[Tuple[str, float]]:
+        """Match reply to a pending request and compute its RTT."""
+        sequence = self._parse_echo_reply(data)
+        if sequence is None or sequence not in sent:
+            return None
+            
+        ip, sent_at = sent[sequence]
+        if address[0] != ip:
+            return None
+            
+        del sent[sequence]
+        return ip, round((time.monotonic() - sent_at) * 1000, 3)
+        
+    def _icmp_sweep(self, hosts: List[str], timeout: float) -> Iterator[Tuple[str, float]]:
+        """Burst ICMP echo requests and collect replies as they arrive."""
+        sock = self._open_icmp_socket()
+        try:
+            sent = self._send_echo_burst(sock, hosts)
+            deadline = time.monotonic() + timeout
+            
+            with selectors.DefaultSelector() as selector:
+                selector.register(sock, selectors.EVENT_READ)
+                
+                while sent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if not selector.select(remaining):
+                        continue
+                        
+                    try:
+                        data, address = sock.recvfrom(1024)
+                    except (BlockingIOError, InterruptedError):
+                        continue
+                    except OSError as e:
+                        self.logger.debug(f"ICMP receive error: {e}")
+                        continue
+                        
+                    reply = self._handle_echo_reply(data, address, sent)
+                    if reply:
+                        yield reply
+        finally:
+            sock.close()
+            
+    async def _icmp_sweep_async(self, hosts: List[str],
+                                timeout: float) -> AsyncIterator[Tuple[str, float]]:
+        """Async ICMP sweep using a reader callback on the event loop."""
+        loop = asyncio.get_running_loop()
+        sock = self._open_icmp_socket()
+        replies: asyncio.Queue = asyncio.Queue()
+        
+        def on_readable():
+            try:
+                replies.put_nowait(sock.recvfrom(1024))
+            except OSError:
+                pass
+                
+        loop.add_reader(sock.fileno(), on_readable)
+        try:
+            sent = self._send_echo_burst(sock, hosts)
+            deadline = loop.time() + timeout
+            
+            while sent:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    data, address = await asyncio.wait_for(replies.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                    
+                reply = self._handle_echo_reply(data, address, sent)
+                if reply:
+                    yield reply
+        finally:
+            loop.remove_reader(sock.fileno())
+            sock.close()
+            
+    def _tcp_sweep(self, hosts: List[str], timeout: float) -> Iterator[Tuple[str, float]]:
+        """Non-blocking TCP connects to fallback ports; refused still means alive."""
+        pending = collections.deque((ip, port) for ip in hosts for port in self.fallback_ports)
+        alive = set()
+        selector = selectors.DefaultSelector()
+        
+        try:
+            while pending or selector.get_map():
+                # Keep a rolling window of in-flight connects
+                while pending and len(selector.get_map()) < self.max_sockets:
+                    ip, port = pending.popleft()
+                    if ip in alive:
+                        continue
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    sock.setblocking(False)
+                    result = sock.connect_ex((ip, port))
+                    if result not in (0, errno.EINPROGRESS, errno.ECONNREFUSED):
+                        sock.close()
+                        continue
+                    selector.register(sock, selectors.EVENT_WRITE, (ip, time.monotonic()))
+                    
+                now = time.monotonic()
+                for key in list(selector.get_map().values()):
+                    if now - key.data[1] > timeout or key.data[0] in alive:
+                        selector.unregister(key.fileobj)
+                        key.fileobj.close()
+                        
+                if not selector.get_map():
+                    continue
+                    
+                for key, _ in selector.select(0.05):
+                    ip, started = key.data
+                    error = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                    
+                    if error in (0, errno.ECONNREFUSED) and ip not in alive:
+                        alive.add(ip)
+                        yield ip, round((time.monotonic() - started) * 1000, 3)
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+            
+    async def _tcp_sweep_async(self, hosts: List[str],
+                               timeout: float) -> AsyncIterator[Tuple[str, float]]:
+        """Async TCP fallback sweep on the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_sockets)
+        
+        async def connect(ip: str, port: int) -> Optional[Tuple[str, float]]:
+            async with semaphore:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                started = time.monotonic()
+                try:
+                    await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+                except ConnectionRefusedError:
+                    pass
+                except (asyncio.TimeoutError, OSError):
+                    return None
+                finally:
+                    sock.close()
+                return ip, round((time.monotonic() - started) * 1000, 3)
+                
+        alive = set()
+        tasks = [loop.create_task(connect(ip, port)) for ip in hosts for port in self.fallback_ports]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                reply = await next_done
+                if reply and reply[0] not in alive:
+                    alive.add(reply[0])
+                    yield reply
+        finally:
+            for task in tasks:
+                task.cancel()
\ No newline at end of file
@@ -3,15 +3,24 @@ Network Scanner Module
 Intelligent network discovery and ecosystem topology detection
 """
 
+import os
 import socket
 import subprocess
 import ipaddress
 import concurrent.futures
+import threading
+import queue
+import time
 import logging
-from typing import Dict, List, Optional, Tuple, Set
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, Set
+from dataclasses import dataclass, replace
 import json
 
+from tools.liveness_prober import LivenessProber
+from tools.hostname_resolver import HostnameResolver
+from tools.port_profiles import PortProfiles
+from tools.thermal_governor import ThrottleGate
+
 
 @dataclass
 class ServerInfo:
@@ -36,6 +45,61 @@ class NetworkTopology:
     ecosystem_servers: List[ServerInfo]
 
 
+class AdaptiveTimeout:
+    """Per-host smoothed RTT and variance for probe timeouts (RFC 6298 style)."""
+    
+    ALPHA = 1 / 8   # SRTT gain
+    BETA = 1 / 4    # RTTVAR gain
+    K = 4           # Variance multiplier
+    
+    def __init__(self, floor: float = 0.02, ceiling: float = 1.0, sweep_floor: float = 0.25):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.sweep_floor = sweep_floor
+        self._estimates: Dict[str, Tuple[float, float]] = {}  # ip -> (srtt, rttvar)
+        self._lock = threading.Lock()
+        
+    def observe(self, ip: str, rtt: float):
+        """Record RTT sample in seconds for host."""
+        with self._lock:
+            if ip not in self._estimates:
+                self._estimates[ip] = (rtt, rtt / 2)
+                return
+                
+            srtt, rttvar = self._estimates[ip]
+            rttvar = (1 - self.BETA) * rttvar + self.BETA * abs(srtt - rtt)
+            srtt = (1 - self.ALPHA) * srtt + self.ALPHA * rtt
+            self._estimates[ip] = (srtt, rttvar)
+            
+    def _rto(self, ip: str) -> Optional[float]:
+        """Retransmission-style timeout for host, None when never measured."""
+        estimate = self._estimates.get(ip)
+        if estimate is None:
+            return None
+        srtt, rttvar = estimate
+        return srtt + self.K * rttvar
+        
+    def timeout_for(self, ip: str, ceiling: Optional[float] = None) -> float:
+        """Probe timeout for host, clamped between floor and ceiling."""
+        ceiling = self.ceiling if ceiling is None else ceiling
+        with self._lock:
+            rto = self._rto(ip)
+            
+        if rto is None:
+            return ceiling
+        return min(max(rto, self.floor), ceiling)
+        
+    def sweep_timeout(self, ceiling: float, hosts: List[str]) -> float:
+        """Liveness sweep timeout for hosts; the full ceiling unless every host has been measured."""
+        with self._lock:
+            rtos = [self._rto(ip) for ip in hosts]
+            
+        # Never-seen hosts may be slower than anything measured so far
+        if not rtos or None in rtos:
+            return ceiling
+        return min(max(self.K * max(rtos), self.sweep_floor), ceiling)
+        
+        
 class NetworkScanner:
     """Intelligent network discovery and ecosystem analysis."""
     
@@ -63,8 +127,51 @@ class NetworkScanner:
         }
     }
     
-    def __init__(self):
+    # Service names used when no port profile file is available
+    SERVICE_NAMES = {
+        22: "ssh",
+        2222: "ssh-alt",
+        80: "http",
+        443: "https",
+        3000: "grafana/adguard",
+        8000: "development",
+        8080: "http-alt/llm-api",
+        8123: "home-assistant",
+        8443: "https-alt",
+        9000: "portainer",
+        11434: "ollama",
+        5432: "postgresql",
+        6379: "redis",
+        3306: "mysql",
+        9090: "prometheus",
+        5601: "kibana",
+        9200: "elasticsearch"
+    }
+    
+    # Seconds a host's result waits for its reverse lookup, which runs during the port scan
+    HOSTNAME_TIMEOUT = 0.5
+    
+    def __init__(self, cache=None, max_age: Optional[float] = None, rescan: bool = False,
+                 profiles_path: Optional[str] = None, governor=None):
+        """Initialize scanner with optional TopologyCache for incremental rescans."""
         self.logger = logging.getLogger(__name__)
+        self.port_profiles = PortProfiles.load(profiles_path, self.ECOSYSTEM_SERVERS, self.SERVICE_NAMES)
+        # Ports probed on every live host, the union of all role profiles
+        self.probe_ports = list(self.port_profiles.probe_ports)
+        self.liveness_prober = LivenessProber()
+        self.adaptive_timeout = AdaptiveTimeout()
+        self.hostname_resolver = HostnameResolver()
+        self.cache = cache
+        self.max_age = max_age
+        self.rescan = rescan
+        # Optional ThermalGovernor narrowing scan concurrency while the CPU is hot
+        self.governor = governor
+        
+    @staticmethod
+    def _throttled(gate: ThrottleGate, func, *args):
+        """Run func once the thermal gate admits another worker."""
+        with gate:
+            return func(*args)
         
     def get_local_network_info(self) -> Dict[str, str]:
         """Get local network configuration."""
@@ -81,9 +188,9 @@ class NetworkScanner:
                 gateway = None
                 interface = None
                 
-            # Get local IP address
+            # Get local IP address; the hostname often maps to 127.0.1.1 in /etc/hosts
             hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
+            local_ip = self.default_route_address(gateway) or socket.gethostbyname(hostname)
             
             # Determine subnet
             if local_ip and gateway:
@@ -105,25 +212,158 @@ class NetworkScanner:
             self.logger.error(f"Could not get network info: {e}")
             return {}
             
-    def scan_port(self, ip: str, port: int, timeout: float = 1.0) -> bool:
-        """Scan single port on target IP."""
+    def default_route_address(self, gateway: Optional[str] = None) -> Optional[str]:
+        """Address of the interface holding the default route, None without one."""
+        # Connecting a UDP socket only selects a route and source address, nothing is sent;
+        # without a known gateway TEST-NET-1 is reached through the default route as well
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.connect((gateway or "192.0.2.1", 9))
+                address = sock.getsockname()[0]
+        except OSError:
+            return None
+        return None if ipaddress.ip_address(address).is_loopback else address
+        
+    def get_neighbor_hosts(self, subnet: str) -> List[str]:
+        """Get hosts on the local segment already known alive from the neighbor table."""
+        try:
+            network = ipaddress.IPv4Network(subnet, strict=False)
+        except ValueError:
+            return []
+            
+        neighbors = self._read_proc_arp()
+        if neighbors is None:
+            neighbors = self._read_ip_neigh()
+            
+        known_hosts = []
+        for ip in neighbors:
+            try:
+                if ipaddress.IPv4Address(ip) in network and ip not in known_hosts:
+                    known_hosts.append(ip)
+            except ValueError:
+                continue
+                
+        return known_hosts
+        
+    def _read_proc_arp(self, path: str = '/proc/net/arp') -> Optional[List[str]]:
+        """Read complete entries from the kernel ARP table."""
+        try:
+            with open(path, 'r') as f:
+                lines = f.readlines()[1:]  # Skip header
+        except OSError:
+            return None
+            
+        neighbors = []
+        for line in lines:
+            # IP address, HW type, Flags, HW address, Mask, Device
+            parts = line.split()
+            if len(parts) < 4:
+                continue
+            try:
+                flags = int(parts[2], 16)
+            except ValueError:
+                continue
+            if flags & 0x2 and parts[3] != "00:00:00:00:00:00":  # ATF_COM
+                neighbors.append(parts[0])
+                
+        return neighbors
+        
+    def _read_ip_neigh(self) -> List[str]:
+        """Read usable neighbor entries via ip neigh."""
+        try:
+            result = subprocess.run(['ip', '-4', 'neigh', 'show'], 
+                                  capture_output=True, text=True)
+            if result.returncode != 0:
+                return []
+        except Exception as e:
+            self.logger.debug(f"Could not read neighbor table: {e}")
+            return []
+            
+        neighbors = []
+        for line in result.stdout.split('\n'):
+            # 192.168.0.1 dev wlan0 lladdr aa:bb:cc:dd:ee:ff REACHABLE
+            parts = line.split()
+            if parts and parts[-1] not in ("FAILED", "INCOMPLETE") and 'lladdr' in parts:
+                neighbors.append(parts[0])
+                
+        return neighbors
+        
+    def _order_hosts_for_discovery(self, subnet: str, 
+                                   hosts: List[str]) -> Tuple[List[str], List[str]]:
+        """Split hosts into neighbor-table hosts (probed first) and unknown hosts."""
+        neighbors = set(self.get_neighbor_hosts(subnet))
+        known = [ip for ip in hosts if ip in neighbors]
+        unknown = [ip for ip in hosts if ip not in neighbors]
+        
+        if known:
+            self.logger.info(f"Neighbor table seeded {len(known)} known hosts")
+            
+        return known, unknown
+        
+    def _plan_incremental_scan(self, subnet: str, hosts: List[str], 
+                               neighbors_only: bool) -> Tuple[List[ServerInfo], List[str], bool]:
+        """Split subnet into fresh cached servers and hosts that need probing."""
+        if self.cache is None or self.rescan:
+            return [], hosts, not neighbors_only
+            
+        cached = self.cache.get_servers(subnet, self.max_age)
+        fresh_ips = {server.ip_address for server in cached}
+        sweep_age = self.cache.sweep_age(subnet)
+        max_age = self.cache.ttl if self.max_age is None else self.max_age
+        
+        if sweep_age is not None and sweep_age <= max_age:
+            # Recent full sweep: only re-probe entries that went stale
+            stale = set(self.cache.get_stale_hosts(subnet, self.max_age))
+            to_probe = [ip for ip in hosts if ip in stale]
+            full_sweep = False
+        else:
+            to_probe = [ip for ip in hosts if ip not in fresh_ips]
+            full_sweep = not neighbors_only
+            
+        self.logger.info(f"Topology cache: {len(cached)} fresh servers, {len(to_probe)} hosts to probe")
+        return cached, to_probe, full_sweep
+        
+    def _store_scan_results(self, subnet: str, probed_hosts: List[str], 
+                            servers: List[ServerInfo], full_sweep: bool):
+        """Persist scan results to the topology cache, with hostnames from lookups that finished late."""
+        if self.cache is None:
+            return
+            
+        unnamed = [server.ip_address for server in servers if server.hostname is None]
+        if unnamed:
+            # Yielded results are never mutated; the cache gets named copies instead
+            hostnames = self.hostname_resolver.resolve_many(unnamed, self.HOSTNAME_TIMEOUT)
+            servers = [replace(server, hostname=hostnames[server.ip_address])
+                       if hostnames.get(server.ip_address) else server for server in servers]
+                       
+        self.cache.store(subnet, probed_hosts, servers, full_sweep)
+            
+    def scan_port(self, ip: str, port: int, timeout: Optional[float] = None) -> bool:
+        """Scan single port on target IP (timeout derived from measured RTT if not given)."""
+        if timeout is None:
+            timeout = self.adaptive_timeout.timeout_for(ip)
+            
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
                 sock.settimeout(timeout)
+                start = time.monotonic()
                 result = sock.connect_ex((ip, port))
+                if result == 0:
+                    self.adaptive_timeout.observe(ip, time.monotonic() - start)
                 return result == 0
         except Exception:
             return False
             
-    def scan_common_ports(self, ip: str, timeout: float = 1.0) -> List[int]:
+    def scan_common_ports(self, ip: str, timeout: Optional[float] = None) -> List[int]:
         """Scan common ports on target IP."""
-        common_ports = [22, 80, 443, 8080, 8443, 3000, 8000, 8123, 9000, 11434, 2222]
         open_ports = []
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        # Every probe passes the gate, so a CPU heating up mid-scan narrows it at once
+        gate = ThrottleGate(self.governor, 20)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=gate.max_workers) as executor:
             future_to_port = {
-                executor.submit(self.scan_port, ip, port, timeout): port 
-                for port in common_ports
+                executor.submit(self._throttled, gate, self.scan_port, ip, port, timeout): port 
+                for port in self.probe_ports
             }
             
             for future in concurrent.futures.as_completed(future_to_port):
@@ -139,21 +379,7 @@ class NetworkScanner:
     def ping_host(self, ip: str, timeout: int = 2) -> Optional[float]:
         """Ping host and return response time."""
         try:
-            result = subprocess.run(
-                ['ping', '-c', '1', '-W', str(timeout), ip],
-                capture_output=True, text=True
-            )
-            
-            if result.returncode == 0:
-                # Parse ping time from output
-                for line in result.stdout.split('\n'):
-                    if 'time=' in line:
-                        time_str = line.split('time=')[1].split()[0]
-                        return float(time_str)
-                return 0.0  # Ping successful but couldn't parse time
-            else:
-                return None
-                
+            return self.liveness_prober.probe_hosts([ip], timeout).get(ip)
         except Exception as e:
             self.logger.debug(f"Ping failed for {ip}: {e}")
             return None
@@ -161,69 +387,120 @@ class NetworkScanner:
     def resolve_hostname(self, ip: str) -> Optional[str]:
         """Resolve IP address to hostname."""
         try:
-            hostname = socket.gethostbyaddr(ip)[0]
-            return hostname
+            return self.hostname_resolver.resolve(ip)
         except Exception:
             return None
             
+    def _collect_hostname(self, ip: str) -> Optional[str]:
+        """Hostname of a lookup started with the port scan, waiting at most HOSTNAME_TIMEOUT."""
+        return self.hostname_resolver.resolve_many([ip], self.HOSTNAME_TIMEOUT).get(ip)
+        
     def identify_server_type(self, server_info: ServerInfo) -> Optional[str]:
         """Identify server type based on open ports and services."""
-        open_ports_set = set(server_info.open_ports)
+        return self.port_profiles.classify(server_info.open_ports)
         
-        for server_type, config in self.ECOSYSTEM_SERVERS.items():
-            required_ports = set(config["ports"])
-            
-            # Check if server has majority of required ports
-            matching_ports = open_ports_set.intersection(required_ports)
-            if len(matching_ports) >= len(required_ports) * 0.6:  # 60% match threshold
-                return server_type
-                
-        return None
+    def scan_subnet(self, subnet: str, timeout: float = 1.0, 
+                    neighbors_only: bool = False) -> List[ServerInfo]:
+        """Scan entire subnet for active hosts, neighbor-table hosts first."""
+        return list(self.iter_subnet(subnet, timeout, neighbors_only))
         
-    def scan_subnet(self, subnet: str, timeout: float = 1.0) -> List[ServerInfo]:
-        """Scan entire subnet for active hosts."""
+    def iter_subnet(self, subnet: str, timeout: float = 1.0, 
+                    neighbors_only: bool = False) -> Iterator[ServerInfo]:
+        """Yield servers as soon as each host finishes scanning."""
         self.logger.info(f"Scanning subnet: {subnet}")
         
         try:
             network = ipaddress.IPv4Network(subnet, strict=False)
         except ValueError as e:
             self.logger.error(f"Invalid subnet: {e}")
-            return []
+            return
             
+        cached, to_probe, full_sweep = self._plan_incremental_scan(
+            subnet, [str(ip) for ip in network.hosts()], neighbors_only
+        )
+        yield from cached
+        
+        known, unknown = self._order_hosts_for_discovery(subnet, to_probe)
+        probed = known if neighbors_only else known + unknown
         active_servers = []
         
-        # Scan hosts in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-            future_to_ip = {
-                executor.submit(self._scan_single_host, str(ip), timeout): str(ip)
-                for ip in network.hosts()
-            }
-            
-            for future in concurrent.futures.as_completed(future_to_ip):
-                ip = future_to_ip[future]
+        # Liveness sweep feeds port scans from a separate thread so finished
+        # hosts can be yielded while dead hosts are still timing out
+        completed = queue.Queue()
+        future_to_ip = {}
+        # Set when the consumer stops early so the feed thread stops submitting
+        stopped = threading.Event()
+        
+        gate = ThrottleGate(self.governor, 50)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=gate.max_workers) as executor:
+            def feed():
                 try:
-                    server_info = future.result()
-                    if server_info:
-                        active_servers.append(server_info)
-                        self.logger.info(f"Found server: {ip} ({server_info.hostname})")
-                except Exception as e:
-                    self.logger.debug(f"Scan error for {ip}: {e}")
+                    for hosts in ([known] if neighbors_only else [known, unknown]):
+                        # Measured hosts get an RTT-derived window, unmeasured ones the full 2s
+                        sweep_timeout = self.adaptive_timeout.sweep_timeout(2.0, hosts)
+                        for ip, ping_time in self.liveness_prober.iter_probe(hosts, sweep_timeout):
+                            if stopped.is_set():
+                                return
+                            try:
+                                future = executor.submit(self._throttled, gate, self._scan_single_host,
+                                                         ip, timeout, ping_time)
+                            except RuntimeError:
+                                # Executor shut down between the check and the submit
+                                return
+                            future_to_ip[future] = ip
+                            future.add_done_callback(completed.put)
+                finally:
+                    completed.put(None)
                     
-        return active_servers
+            threading.Thread(target=feed, daemon=True).start()
+            
+            try:
+                feeding = True
+                finished = 0
+                while feeding or finished < len(future_to_ip):
+                    future = completed.get()
+                    if future is None:
+                        feeding = False
+                        continue
+                        
+                    finished += 1
+                    ip = future_to_ip[future]
+                    try:
+                        server_info = future.result()
+                        if server_info:
+                            active_servers.append(server_info)
+                            self.logger.info(f"Found server: {ip} ({server_info.hostname})")
+                            yield server_info
+                    except Exception as e:
+                        self.logger.debug(f"Scan error for {ip}: {e}")
+            finally:
+                stopped.set()
+                if feeding or finished < len(future_to_ip):
+                    # Abandoned early: drop queued host scans instead of waiting for them
+                    for pending in list(future_to_ip):
+                        pending.cancel()
+                        
+        self._store_scan_results(subnet, probed, active_servers, full_sweep)
         
-    def _scan_single_host(self, ip: str, timeout: float) -> Optional[ServerInfo]:
+    def _scan_single_host(self, ip: str, timeout: float, 
+                          ping_time: Optional[float] = None) -> Optional[ServerInfo]:
         """Scan single host for server information."""
         # First ping to check if host is alive
-        ping_time = self.ping_host(ip, timeout=2)
+        if ping_time is None:
+            ping_time = self.ping_host(ip, timeout=2)
         if ping_time is None:
             return None
-            
-        # Resolve hostname
-        hostname = self.resolve_hostname(ip)
+        self.adaptive_timeout.observe(ip, ping_time / 1000)
+        
+        # Reverse lookup overlaps the port scan, which uses a timeout derived from the measured RTT
+        self.hostname_resolver.resolve_async(ip)
+        open_ports = self.scan_common_ports(ip, self.adaptive_timeout.timeout_for(ip, timeout))
         
-        # Scan ports
-        open_ports = self.scan_common_ports(ip, timeout)
+        return self._build_server_info(ip, self._collect_hostname(ip), open_ports, ping_time)
         
+    def _build_server_info(self, ip: str, hostname: Optional[str], 
+                           open_ports: List[int], ping_time: float) -> ServerInfo:
+        """Assemble server information from probe results."""
         # Detect SSH port
         ssh_port = None
         for port in [22, 2222]:
@@ -251,53 +528,27 @@ class NetworkScanner:
         
     def _identify_services(self, open_ports: List[int]) -> Dict[str, str]:
         """Identify services based on open ports."""
-        service_mapping = {
-            22: "ssh",
-            2222: "ssh-alt",
-            80: "http",
-            443: "https",
-            3000: "grafana/adguard",
-            8000: "development",
-            8080: "http-alt/llm-api",
-            8123: "home-assistant",
-            8443: "https-alt",
-            9000: "portainer",
-            11434: "ollama",
-            5432: "postgresql",
-            6379: "redis",
-            3306: "mysql",
-            9090: "prometheus",
-            5601: "kibana",
-            9200: "elasticsearch"
-        }
+        return self.port_profiles.identify_services(open_ports)
         
-        services = {}
-        for port in open_ports:
-            if port in service_mapping:
-                services[str(port)] = service_mapping[port]
-                
-        return services
-        
-    def scan_ecosystem(self) -> List[ServerInfo]:
+    def scan_ecosystem(self, neighbors_only: bool = False) -> List[ServerInfo]:
         """Scan for ecosystem servers specifically."""
+        return list(self.iter_ecosystem(neighbors_only))
+        
+    def iter_ecosystem(self, neighbors_only: bool = False) -> Iterator[ServerInfo]:
+        """Yield ecosystem servers as they are discovered."""
         network_info = self.get_local_network_info()
         
         if not network_info.get("subnet"):
             self.logger.error("Could not determine local subnet")
-            return []
+            return
             
-        all_servers = self.scan_subnet(network_info["subnet"])
-        
         # Filter for ecosystem servers (servers with SSH and other services)
-        ecosystem_servers = []
-        for server in all_servers:
+        for server in self.iter_subnet(network_info["subnet"], neighbors_only=neighbors_only):
             if (server.ssh_port and 
                 len(server.open_ports) > 1 and 
                 server.server_type):
-                ecosystem_servers.append(server)
+                yield server
                 
-        return ecosystem_servers
-        
     def discover_network_topology(self) -> NetworkTopology:
         """Discover complete network topology."""
         self.logger.info("Discovering network topology")
@@ -315,12 +566,14 @@ class NetworkScanner:
                 ecosystem_servers=[]
             )
             
-        # Scan all servers
-        all_servers = self.scan_subnet(network_info["subnet"])
-        
-        # Identify ecosystem servers
-        ecosystem_servers = [s for s in all_servers if s.server_type]
-        
+        # Scan all servers, collecting ecosystem servers as they arrive
+        all_servers = []
+        ecosystem_servers = []
+        for server in self.iter_subnet(network_info["subnet"]):
+            all_servers.append(server)
+            if server.server_type:
+                ecosystem_servers.append(server)
+                
         return NetworkTopology(
             local_ip=network_info["local_ip"],
             subnet=network_info["subnet"],
@@ -375,18 +628,24 @@ class NetworkScanner:
             return False
             
     def export_topology(self, filepath: str):
-        """Export network topology to JSON file."""
+        """Export network topology to JSON file, writing servers as they are found."""
+        # Streamed into a temp file so a failed scan never leaves a truncated export behind
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
         try:
-            topology = self.discover_network_topology()
+            network_info = self.get_local_network_info()
+            subnet = network_info.get("subnet")
+            ecosystem_servers = []
+            total_hosts = 0
             
-            # Convert to serializable format
-            topology_dict = {
-                "local_ip": topology.local_ip,
-                "subnet": topology.subnet,
-                "gateway": topology.gateway,
-                "total_hosts": topology.total_hosts,
-                "servers": [
-                    {
+            with open(tmp_path, 'w') as f:
+                f.write("{\n")
+                f.write(f'  "local_ip": {json.dumps(network_info.get("local_ip") if subnet else "unknown")},\n')
+                f.write(f'  "subnet": {json.dumps(subnet or "unknown")},\n')
+                f.write(f'  "gateway": {json.dumps(network_info.get("gateway") if subnet else "unknown")},\n')
+                f.write('  "servers": [')
+                
+                for server in (self.iter_subnet(subnet) if subnet else []):
+                    server_dict = {
                         "ip_address": server.ip_address,
                         "hostname": server.hostname,
                         "open_ports": server.open_ports,
@@ -395,24 +654,35 @@ class NetworkScanner:
                         "ping_time": server.ping_time,
                         "server_type": server.server_type
                     }
-                    for server in topology.servers
-                ],
-                "ecosystem_servers": [
+                    f.write(("," if total_hosts else "") + "\n    " + json.dumps(server_dict))
+                    f.flush()
+                    
+                    total_hosts += 1
+                    if server.server_type:
+                        ecosystem_servers.append(server)
+                        
+                ecosystem_list = [
                     {
                         "ip_address": server.ip_address,
                         "hostname": server.hostname,
                         "server_type": server.server_type,
                         "open_ports": server.open_ports
                     }
-                    for server in topology.ecosystem_servers
+                    for server in ecosystem_servers
                 ]
-            }
-            
-            with open(filepath, 'w') as f:
-                json.dump(topology_dict, f, indent=2)
                 
+                f.write("\n  ],\n")
+                f.write(f'  "total_hosts": {total_hosts},\n')
+                f.write(f'  "ecosystem_servers": {json.dumps(ecosystem_list)}\n')
+                f.write("}\n")
+                
+            os.replace(tmp_path, filepath)
             self.logger.info(f"Network topology exported to {filepath}")
             
         except Exception as e:
             self.logger.error(f"Could not export topology: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
             raise
\ No newline at end of file
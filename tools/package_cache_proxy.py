@@ -0,0 +1,359 @@
+"""
+Package Cache Proxy Module
+Caching HTTP proxy for apt, pip and npm artifacts shared by the ecosystem fleet
+"""
+
+import os
+import io
+import re
+import glob
+import shutil
+import hashlib
+import threading
+import http.client
+import urllib.request
+import urllib.error
+import urllib.parse
+import logging
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+
+class DiskLRUCache:
+    """Content-addressed artifact store with least-recently-used eviction."""
+    
+    def __init__(self, cache_dir: str, max_size_mb: int):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_existing()
+        
+    def _load_existing(self):
+        """Index files left by a previous run, oldest access first."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".tmp"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((max(st.st_atime, st.st_mtime), name, st.st_size))
+            
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._size += size
+        self._evict()
+        
+    @staticmethod
+    def key(url: str) -> str:
+        """Cache key of an upstream URL."""
+        return hashlib.sha256(url.encode()).hexdigest()
+        
+    def path(self, key: str) -> str:
+        """File holding a cached artifact."""
+        return os.path.join(self.cache_dir, key)
+        
+    def get(self, key: str) -> Optional[str]:
+        """Path of a cached artifact, marking it recently used."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        return self.path(key)
+        
+    def temp_path(self, key: str) -> str:
+        """Private file an artifact is written to before it is committed."""
+        return f"{self.path(key)}.{threading.get_ident()}.tmp"
+        
+    def put(self, key: str, data: bytes):
+        """Store artifact atomically and evict old entries over the size cap."""
+        if len(data) > self.max_bytes:
+            return
+            
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        self.commit(key, tmp_path)
+        
+    def commit(self, key: str, tmp_path: str) -> bool:
+        """Move a fully written temp file into the store; False when it exceeds the size cap."""
+        size = os.path.getsize(tmp_path)
+        if size > self.max_bytes:
+            return False
+        os.replace(tmp_path, self.path(key))
+        
+        with self._lock:
+            self._size += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+        return True
+            
+    def _evict(self):
+        """Remove least recently used artifacts until under the size cap."""
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            try:
+                os.remove(self.path(key))
+            except OSError as e:
+                self.logger.debug(f"Cannot evict {key}: {e}")
+                
+    @property
+    def size(self) -> int:
+        """Bytes currently stored."""
+        return self._size
+
+
+class PackageCacheProxy:
+    """Caching proxy: apt uses it as an HTTP proxy, pip and npm as their index."""
+    
+    DEFAULT_PORT = 3142
+    DEFAULT_SIZE_MB = 10240
+    
+    # Path prefix routes used by pip (index-url) and npm (registry)
+    UPSTREAMS = {
+        "pypi": "https://pypi.org/simple",
+        "files": "https://files.pythonhosted.org",
+        "npm": "https://registry.npmjs.org"
+    }
+    
+    # Forward-proxied (apt) requests may only reach these mirrors, their subdomains,
+    # and the repositories configured in this machine's apt sources
+    MIRROR_HOSTS = ("deb.debian.org", "security.debian.org", "ftp.debian.org", "archive.ubuntu.com",
+                    "security.ubuntu.com", "ports.ubuntu.com")
+    APT_SOURCES = "/etc/apt/sources.list"
+    
+    # Immutable artifacts are cached; indexes and metadata always go upstream
+    CACHEABLE_SUFFIXES = (".deb", ".udeb", ".rpm", ".whl", ".tar.gz", ".tgz", ".zip", ".tar.bz2")
+    CHUNK_BYTES = 64 * 1024
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: int = DEFAULT_SIZE_MB,
+                 host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 upstreams: Optional[Dict[str, str]] = None, timeout: float = 30.0,
+                 allowed_hosts: Optional[List[str]] = None):
+        self.logger = logging.getLogger(__name__)
+        if cache_dir is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            cache_dir = os.path.join(cache_home, "unifikation", "proxy")
+        self.cache = DiskLRUCache(cache_dir, max_size_mb)
+        self.host = host
+        self.port = port
+        self.upstreams = dict(upstreams or self.UPSTREAMS)
+        self.mirror_hosts = {name.lower() for name in
+                             list(self.MIRROR_HOSTS) + self._apt_source_hosts() + list(allowed_hosts or [])}
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._key_locks: Dict[str, list] = {}  # key -> [lock, requests holding or waiting]
+        self._key_locks_guard = threading.Lock()
+        
+    def _apt_source_hosts(self) -> List[str]:
+        """Repository hosts named in apt's one-line and deb822 source files."""
+        hosts = []
+        for path in [self.APT_SOURCES] + sorted(glob.glob(f"{self.APT_SOURCES}.d/*")):
+            try:
+                with open(path) as f:
+                    for line in f:
+                        if not line.lstrip().startswith("#"):
+                            hosts.extend(re.findall(r"https?://([^/\s:\]]+)", line))
+            except OSError:
+                continue
+        return hosts
+        
+    def start(self) -> Tuple[str, int]:
+        """Serve in a background thread and return the bound address."""
+        handler = type("Handler", (ProxyRequestHandler,), {"proxy": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.1,),
+                                        name="package-cache-proxy", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Package cache proxy listening on {self.host}:{self.port}")
+        return self.host, self.port
+        
+    def stop(self):
+        """Stop serving."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            
+    def is_mirror(self, url: str) -> bool:
+        """True when an absolute URL points at an allowed mirror or one of its subdomains."""
+        host = (urllib.parse.urlsplit(url).hostname or "").lower()
+        return any(host == name or host.endswith(f".{name}") for name in self.mirror_hosts)
+        
+    def resolve_upstream(self, request_path: str) -> Optional[Tuple[str, str]]:
+        """Map a request to (route, upstream URL); absolute URIs to known mirrors are forward-proxied."""
+        if request_path.startswith("http://"):
+            if not self.is_mirror(request_path):
+                self.logger.warning(f"Refusing to proxy {request_path}: not a known mirror")
+                return None
+            return "http", request_path
+            
+        route, _, rest = request_path.lstrip("/").partition("/")
+        base = self.upstreams.get(route)
+        if base is None:
+            return None
+        return route, f"{base.rstrip('/')}/{rest}"
+        
+    def is_cacheable(self, url: str) -> bool:
+        """Only versioned package files are immutable enough to cache."""
+        return url.split("?", 1)[0].endswith(self.CACHEABLE_SUFFIXES)
+        
+    def rewrite_body(self, route: str, body: bytes, proxy_base: str) -> bytes:
+        """Point artifact links in index metadata back at this proxy."""
+        if route not in ("pypi", "npm"):
+            return body
+        for name, base in self.upstreams.items():
+            body = body.replace(base.rstrip("/").encode(), f"{proxy_base}/{name}".encode())
+        return body
+        
+    def open_upstream(self, url: str):
+        """Open an upstream response for streaming; HTTP error responses are returned, not raised."""
+        request = urllib.request.Request(url, headers={"Accept-Encoding": "identity",
+                                                       "User-Agent": "unifikation-cache-proxy"})
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            return e
+            
+    def fetch(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Fetch index metadata from upstream, returning (status, headers, body)."""
+        with self.open_upstream(url) as response:
+            return response.getcode(), dict(response.headers or {}), response.read()
+            
+    def get_cached(self, url: str) -> Tuple[int, Dict[str, str], BinaryIO, int, bool]:
+        """Open artifact from disk, downloading it once even under concurrent requests; caller closes it."""
+        key = self.cache.key(url)
+        key_lock = self._lock_key(key)
+        try:
+            with key_lock:
+                path = self.cache.get(key)
+                if path is not None:
+                    try:
+                        # An open handle survives eviction of the file
+                        artifact = open(path, 'rb')
+                        self.hits += 1
+                        return 200, {}, artifact, os.fstat(artifact.fileno()).st_size, True
+                    except OSError:
+                        pass
+                        
+                self.misses += 1
+                return self.download(key, url) + (False,)
+        finally:
+            self._unlock_key(key)
+            
+    def download(self, key: str, url: str) -> Tuple[int, Dict[str, str], BinaryIO, int]:
+        """Stream an artifact through a temp file into the cache, returning an open handle to it."""
+        with self.open_upstream(url) as response:
+            status, headers = response.getcode(), dict(response.headers or {})
+            if status != 200:
+                body = response.read()
+                return status, headers, io.BytesIO(body), len(body)
+                
+            tmp_path = self.cache.temp_path(key)
+            try:
+                with open(tmp_path, 'wb') as f:
+                    shutil.copyfileobj(response, f, self.CHUNK_BYTES)
+                artifact = open(tmp_path, 'rb')
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+                
+        length = os.fstat(artifact.fileno()).st_size
+        if not self.cache.commit(key, tmp_path):
+            # Larger than the whole cache: serve it once from the unlinked temp file
+            os.remove(tmp_path)
+        return 200, headers, artifact, length
+        
+    def _lock_key(self, key: str) -> threading.Lock:
+        """Per-artifact download lock, shared by every request currently wanting that artifact."""
+        with self._key_locks_guard:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+            
+    def _unlock_key(self, key: str):
+        """Drop one request's claim on a key lock, forgetting the lock once nobody holds or awaits it."""
+        with self._key_locks_guard:
+            entry = self._key_locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._key_locks[key]
+            
+    @staticmethod
+    def client_config(proxy_url: str) -> Dict[str, str]:
+        """Client configuration snippets for apt, pip and npm, keyed by file path."""
+        proxy_url = proxy_url.rstrip("/")
+        host = proxy_url.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+        return {
+            "/etc/apt/apt.conf.d/01unifikation-proxy":
+                f'Acquire::http::Proxy "{proxy_url}";\n',
+            os.path.expanduser("~/.config/pip/pip.conf"):
+                f"[global]\nindex-url = {proxy_url}/pypi/\ntrusted-host = {host}\n",
+            os.path.expanduser("~/.npmrc"):
+                f"registry={proxy_url}/npm/\n"
+        }
+
+
+class ProxyRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler delegating to a PackageCacheProxy."""
+    
+    proxy: PackageCacheProxy = None
+    
+    def do_GET(self):
+        """Serve cached artifact or relay upstream response."""
+        resolved = self.proxy.resolve_upstream(self.path)
+        if resolved is None:
+            if self.path.startswith("http://"):
+                self.send_error(403, "Host not allowed")
+            else:
+                self.send_error(404, "Unknown route")
+            return
+        route, url = resolved
+        
+        try:
+            hit = False
+            if self.proxy.is_cacheable(url):
+                status, headers, body, length, hit = self.proxy.get_cached(url)
+            elif route in ("pypi", "npm"):
+                # Index metadata is small and has to be rewritten as a whole
+                status, headers, content = self.proxy.fetch(url)
+                proxy_base = f"http://{self.headers.get('Host', f'localhost:{self.proxy.port}')}"
+                content = self.proxy.rewrite_body(route, content, proxy_base)
+                body, length = io.BytesIO(content), len(content)
+            else:
+                body = self.proxy.open_upstream(url)
+                status, headers = body.getcode(), dict(body.headers or {})
+                length = headers.get("Content-Length")
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            self.proxy.logger.warning(f"Upstream fetch failed for {url}: {e}")
+            self.send_error(502, "Upstream unavailable")
+            return
+            
+        with body:
+            self.send_response(status)
+            content_type = headers.get("Content-Type") or headers.get("content-type")
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            if length is not None:
+                self.send_header("Content-Length", str(length))
+            self.send_header("X-Cache", "HIT" if hit else "MISS")
+            self.end_headers()
+            shutil.copyfileobj(body, self.wfile, self.proxy.CHUNK_BYTES)
+        
+    def log_message(self, format, *args):
+        """Route access log to logging instead of stderr."""
+        self.proxy.logger.debug(f"{self.address_string()} {format % args}")
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Package Catalog Module
+Package definitions compiled from a data file into a name lookup index
+"""
+
+import os
+import json
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "configs", "packages.json")
+
+# Managers with a per-package name field
+MANAGERS = ("apt", "yum", "dnf", "pacman", "apk", "brew", "pip", "npm", "conda", "snap")
+
+# Compiled catalogs shared by all resolvers, keyed by (path, mtime)
+_compiled: Dict[Tuple[str, Optional[float]], "PackageCatalog"] = {}
+_compiled_lock = threading.Lock()
+
+
+class Package:
+    """Package definition with OS-specific names."""
+    
+    __slots__ = tuple(f"{manager}_name" for manager in MANAGERS) + (
+        "name", "description", "required", "depends_on", "aliases"
+    )
+    
+    def __init__(self, name: str, apt_name: Optional[str] = None, yum_name: Optional[str] = None,
+                 dnf_name: Optional[str] = None, pacman_name: Optional[str] = None,
+                 apk_name: Optional[str] = None, brew_name: Optional[str] = None,
+                 pip_name: Optional[str] = None, npm_name: Optional[str] = None,
+                 conda_name: Optional[str] = None, snap_name: Optional[str] = None,
+                 description: str = "", required: bool = True,
+                 depends_on: Optional[List[str]] = None, aliases: Optional[List[str]] = None):
+        self.name = name
+        self.apt_name = apt_name
+        self.yum_name = yum_name
+        self.dnf_name = dnf_name
+        self.pacman_name = pacman_name
+        self.apk_name = apk_name
+        self.brew_name = brew_name
+        self.pip_name = pip_name
+        self.npm_name = npm_name
+        self.conda_name = conda_name
+        self.snap_name = snap_name
+        self.description = description
+        self.required = required
+        self.depends_on = list(depends_on or [])
+        self.aliases = list(aliases or [])
+        
+    def native_name(self, manager: str) -> Optional[str]:
+        """Name given for a manager, None when the package is not packaged for it."""
+        return getattr(self, f"{manager}_name", None)
+        
+    def __eq__(self, other) -> bool:
+        """Packages are equal when every field matches."""
+        if not isinstance(other, Package):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+        
+    def __repr__(self) -> str:
+        """Name plus the manager names that are set."""
+        names = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__[:len(MANAGERS)]
+                          if getattr(self, slot))
+        return f"Package(name={self.name!r}{', ' + names if names else ''})"
+
+
+class PackageCatalog:
+    """Known packages with precomputed alias and (package, manager) name tables."""
+    
+    def __init__(self, packages: Iterable[Package]):
+        self.logger = logging.getLogger(__name__)
+        self.packages: Dict[str, Package] = {}
+        self.aliases: Dict[str, str] = {}
+        self.names: Dict[Tuple[str, str], str] = {}
+        
+        for package in packages:
+            self.packages[package.name] = package
+            for manager in MANAGERS:
+                self.names[(package.name, manager)] = package.native_name(manager) or package.name
+                
+        # Canonical names win over aliases of other packages
+        for package in self.packages.values():
+            for alias in package.aliases:
+                if alias in self.packages or self.aliases.get(alias, package.name) != package.name:
+                    self.logger.warning(f"Ignoring ambiguous package alias {alias} of {package.name}")
+                    continue
+                self.aliases[alias] = package.name
+                
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PackageCatalog":
+        """Build catalog from the parsed data file."""
+        packages = []
+        for name, entry in data["packages"].items():
+            names = entry.get("names", {})
+            unknown = set(names) - set(MANAGERS)
+            if unknown:
+                raise ValueError(f"{name}: unknown package managers {', '.join(sorted(unknown))}")
+            packages.append(Package(
+                name=name,
+                description=entry.get("description", ""),
+                required=entry.get("required", True),
+                depends_on=entry.get("depends_on", []),
+                aliases=entry.get("aliases", []),
+                **{f"{manager}_name": package_name for manager, package_name in names.items()}
+            ))
+        return cls(packages)
+        
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "PackageCatalog":
+        """Load catalog from JSON, reusing the compiled index while the file is unchanged."""
+        path = path or os.environ.get("UNIFIKATION_PACKAGE_CATALOG") or DEFAULT_CATALOG_PATH
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+            
+        with _compiled_lock:
+            catalog = _compiled.get((path, mtime))
+            if catalog is None:
+                catalog = cls._compile(path, mtime)
+                _compiled[(path, mtime)] = catalog
+            return catalog
+            
+    @classmethod
+    def _compile(cls, path: str, mtime: Optional[float]) -> "PackageCatalog":
+        """Parse catalog file, falling back to an empty catalog when unreadable."""
+        logger = logging.getLogger(__name__)
+        if mtime is None:
+            logger.warning(f"Package catalog {path} not found")
+            return cls([])
+            
+        try:
+            with open(path, 'r') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Invalid package catalog {path}: {e}")
+            return cls([])
+            
+    def get(self, name: str) -> Optional[Package]:
+        """Package by canonical name or alias."""
+        package = self.packages.get(name)
+        if package is None and name in self.aliases:
+            package = self.packages[self.aliases[name]]
+        return package
+        
+    def __contains__(self, name: str) -> bool:
+        """True for canonical names and aliases."""
+        return name in self.packages or name in self.aliases
+        
+    def __len__(self) -> int:
+        """Number of packages."""
+        return len(self.packages)
+        
+    def package_name(self, package: Package, manager: str) -> str:
+        """Name to install package under with manager, falling back to its generic name."""
+        if self.packages.get(package.name) is package:
+            return self.names.get((package.name, manager), package.name)
+        return package.native_name(manager) or package.name
\ No newline at end of file
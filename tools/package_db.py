@@ -0,0 +1,211 @@
+"""
+Package Database Module
+Direct, streaming reads of installed-package databases
+"""
+
+import os
+import re
+import sys
+import site
+import shutil
+import threading
+import logging
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def normalize_pip_name(name: str) -> str:
+    """Normalize Python distribution name (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class PackageDatabase:
+    """Installed-package index read from package manager databases, no subprocesses."""
+    
+    DPKG_STATUS = "/var/lib/dpkg/status"
+    PACMAN_LOCAL = "/var/lib/pacman/local"
+    APK_INSTALLED = "/lib/apk/db/installed"
+    # rpm rewrites its database files in place, so the files are stat'ed, not their directory;
+    # newer rpm keeps them under /usr/lib/sysimage/rpm, sqlite databases may only touch the WAL
+    RPM_DIRS = ["/var/lib/rpm", "/usr/lib/sysimage/rpm"]
+    RPM_FILES = ["rpmdb.sqlite", "rpmdb.sqlite-wal", "Packages", "Packages.db"]
+    
+    def __init__(self, site_dirs: Optional[List[str]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.site_dirs = site_dirs
+        self._indexes: Dict[str, Tuple[List, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+        
+    def database_paths(self, manager: str) -> List[str]:
+        """Files or directories whose changes signal an install or removal."""
+        paths = {
+            "apt": [self.DPKG_STATUS],
+            "yum": self._rpm_files(),
+            "dnf": self._rpm_files(),
+            "pacman": [self.PACMAN_LOCAL],
+            "apk": [self.APK_INSTALLED],
+            "pip": self._site_dirs()
+        }
+        return paths.get(manager, [])
+        
+    def signature(self, manager: str) -> Optional[List[Optional[List[int]]]]:
+        """Change signature of a manager's database, None when it has none on disk."""
+        signature = [self._signature(path) for path in self.database_paths(manager)]
+        if not any(signature):
+            return None
+        return [list(entry) if entry else None for entry in signature]
+        
+    def installed(self, manager: str) -> Optional[Dict[str, str]]:
+        """Map installed package names to versions, None when the database is unavailable."""
+        readers: Dict[str, Callable[[], Iterator[Tuple[str, str]]]] = {
+            "apt": self._read_dpkg_status,
+            "pacman": self._read_pacman_local,
+            "apk": self._read_apk_installed,
+            "pip": self._read_dist_info
+        }
+        if manager not in readers:
+            return None
+            
+        key = self.signature(manager)
+        if key is None:
+            return None
+            
+        with self._lock:
+            cached = self._indexes.get(manager)
+            if cached and cached[0] == key:
+                return cached[1]
+                
+            try:
+                index = dict(readers[manager]())
+            except (OSError, UnicodeDecodeError) as e:
+                self.logger.debug(f"Cannot read {manager} database: {e}")
+                return None
+                
+            self._indexes[manager] = (key, index)
+            return index
+            
+    def _rpm_files(self) -> List[str]:
+        """Candidate rpm database files in every known location."""
+        return [os.path.join(directory, name) for directory in self.RPM_DIRS for name in self.RPM_FILES]
+        
+    def _site_dirs(self) -> List[str]:
+        """Python site-packages directories searched for dist-info metadata."""
+        if self.site_dirs is not None:
+            return self.site_dirs
+        # Installs use the pip on PATH; another environment's pip is left to the CLI
+        if not self._pip_uses_this_interpreter():
+            return []
+        dirs = list(site.getsitepackages()) if hasattr(site, "getsitepackages") else []
+        dirs.append(site.getusersitepackages())
+        return dirs
+        
+    @staticmethod
+    def _pip_uses_this_interpreter() -> bool:
+        """True when the pip on PATH runs under the interpreter running this process."""
+        pip = shutil.which("pip")
+        if pip is None:
+            return False
+        try:
+            with open(pip, 'rb') as f:
+                shebang = f.readline(256).decode('utf-8', errors='replace')
+        except OSError:
+            return False
+        if not shebang.startswith("#!"):
+            return False
+            
+        command = shebang[2:].split()
+        if command[:1] and os.path.basename(command[0]) == "env":
+            command = [shutil.which(command[1]) or ""] if len(command) > 1 else []
+        if not command or not command[0]:
+            return False
+            
+        # Same directory keeps venvs apart, same real file keeps python3.11 and python3.12 apart
+        interpreter = os.path.abspath(command[0])
+        return (os.path.dirname(interpreter) == os.path.dirname(os.path.abspath(sys.executable))
+                and os.path.realpath(interpreter) == os.path.realpath(sys.executable))
+        
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+        """Change signature of a database file or directory, None if missing."""
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_ino, st.st_size
+        except OSError:
+            return None
+            
+    def _read_dpkg_status(self) -> Iterator[Tuple[str, str]]:
+        """Stream dpkg status paragraphs, yielding installed packages."""
+        name = version = status = None
+        with open(self.DPKG_STATUS, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.startswith("Package: "):
+                    name = line[9:].strip()
+                elif line.startswith("Version: "):
+                    version = line[9:].strip()
+                elif line.startswith("Status: "):
+                    status = line[8:].split()
+                elif not line.strip():
+                    if name and version and status and status[-1] == "installed":
+                        yield name, version
+                    name = version = status = None
+                    
+        if name and version and status and status[-1] == "installed":
+            yield name, version
+            
+    def _read_pacman_local(self) -> Iterator[Tuple[str, str]]:
+        """Read %NAME% and %VERSION% from each local/*/desc file."""
+        with os.scandir(self.PACMAN_LOCAL) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                fields = {}
+                try:
+                    with open(os.path.join(entry.path, "desc"), 'r') as f:
+                        section = None
+                        for line in f:
+                            line = line.strip()
+                            if line.startswith("%") and line.endswith("%"):
+                                section = line
+                            elif line and section in ("%NAME%", "%VERSION%") and section not in fields:
+                                fields[section] = line
+                            if len(fields) == 2:
+                                break
+                except OSError:
+                    continue
+                if len(fields) == 2:
+                    yield fields["%NAME%"], fields["%VERSION%"]
+                    
+    def _read_apk_installed(self) -> Iterator[Tuple[str, str]]:
+        """Stream apk installed database records (P: name, V: version)."""
+        name = version = None
+        with open(self.APK_INSTALLED, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.startswith("P:"):
+                    name = line[2:].strip()
+                elif line.startswith("V:"):
+                    version = line[2:].strip()
+                elif not line.strip():
+                    if name and version:
+                        yield name, version
+                    name = version = None
+                    
+        if name and version:
+            yield name, version
+            
+    def _read_dist_info(self) -> Iterator[Tuple[str, str]]:
+        """Derive distribution names and versions from *.dist-info directory names."""
+        seen = set()
+        for site_dir in self._site_dirs():
+            try:
+                entries = os.listdir(site_dir)
+            except OSError:
+                continue
+            for entry in entries:
+                stem, ext = os.path.splitext(entry)
+                if ext not in (".dist-info", ".egg-info") or "-" not in stem:
+                    continue
+                name, version = stem.split("-", 1)
+                name = normalize_pip_name(name)
+                # Earlier site directories shadow later ones, as on sys.path
+                if name not in seen:
+                    seen.add(name)
+                    yield name, version.split("-py")[0]
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Port Profiles Module
+Role definitions compiled into a port to role bitmask index
+"""
+
+import os
+import json
+import math
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_PROFILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "configs", "port_profiles.json")
+
+# Compiled profiles shared by all scanners, keyed by (path, mtime)
+_compiled: Dict[Tuple[str, Optional[float]], "PortProfiles"] = {}
+_compiled_lock = threading.Lock()
+
+
+class PortProfiles:
+    """Server role profiles with a precompiled port to role bitmask index."""
+    
+    DEFAULT_THRESHOLD = 0.6
+    
+    def __init__(self, roles: Dict[str, Dict], services: Optional[Dict[int, str]] = None,
+                 extra_ports: Optional[List[int]] = None, match_threshold: float = DEFAULT_THRESHOLD):
+        self.logger = logging.getLogger(__name__)
+        self.roles = list(roles)
+        self.services = dict(services or {})
+        
+        # Bit i of a port's mask is set when role i lists that port
+        self.port_roles: Dict[int, int] = {}
+        self.min_hits: List[int] = []
+        for bit, role in enumerate(self.roles):
+            ports = set(roles[role].get("ports", []))
+            for port in ports:
+                self.port_roles[port] = self.port_roles.get(port, 0) | (1 << bit)
+            self.min_hits.append(max(1, math.ceil(len(ports) * match_threshold - 1e-9)))
+            
+        self.probe_ports = sorted(set(self.port_roles) | set(extra_ports or []) | set(self.services))
+        
+    @classmethod
+    def load(cls, path: Optional[str] = None, fallback_roles: Optional[Dict[str, Dict]] = None,
+             fallback_services: Optional[Dict[int, str]] = None) -> "PortProfiles":
+        """Load profiles from JSON, reusing the compiled index while the file is unchanged."""
+        path = path or os.environ.get("UNIFIKATION_PORT_PROFILES") or DEFAULT_PROFILES_PATH
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+            
+        with _compiled_lock:
+            profiles = _compiled.get((path, mtime))
+            if profiles is None:
+                profiles = cls._compile(path, mtime, fallback_roles or {}, fallback_services or {})
+                _compiled[(path, mtime)] = profiles
+            return profiles
+            
+    @classmethod
+    def _compile(cls, path: str, mtime: Optional[float], fallback_roles: Dict[str, Dict],
+                 fallback_services: Dict[int, str]) -> "PortProfiles":
+        """Parse profile file, falling back to built-in roles when unreadable."""
+        if mtime is not None:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                return cls(
+                    roles=data["roles"],
+                    services={int(port): name for port, name in data.get("services", {}).items()},
+                    extra_ports=data.get("extra_ports", []),
+                    match_threshold=data.get("match_threshold", cls.DEFAULT_THRESHOLD)
+                )
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logging.getLogger(__name__).warning(f"Invalid port profiles {path}: {e}")
+                
+        return cls(roles=fallback_roles, services=fallback_services)
+        
+    def classify(self, open_ports: List[int]) -> Optional[str]:
+        """Return the first role whose port match reaches the threshold."""
+        hits = [0] * len(self.roles)
+        candidates = 0
+        for port in open_ports:
+            mask = self.port_roles.get(port, 0)
+            candidates |= mask
+            while mask:
+                low = mask & -mask
+                hits[low.bit_length() - 1] += 1
+                mask ^= low
+                
+        # Walk candidate roles from lowest bit to keep definition order precedence
+        while candidates:
+            low = candidates & -candidates
+            bit = low.bit_length() - 1
+            if hits[bit] >= self.min_hits[bit]:
+                return self.roles[bit]
+            candidates ^= low
+            
+        return None
+        
+    def identify_services(self, open_ports: List[int]) -> Dict[str, str]:
+        """Map open ports to known service names."""
+        return {str(port): self.services[port] for port in open_ports if port in self.services}
\ No newline at end of file
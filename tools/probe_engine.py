@@ -0,0 +1,113 @@
+"""
+Probe Engine Module
+Concurrent detection probes with declared dependencies and per-probe timeouts
+"""
+
+import copy
+import time
+import queue
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Probe:
+    """One detection step; receives its dependencies' results as keyword arguments."""
+    name: str
+    func: Callable[..., Any]
+    depends_on: List[str] = field(default_factory=list)
+    timeout: float = 5.0
+    default: Any = None
+
+
+class ProbeEngine:
+    """Run registered probes concurrently, at most max_workers at a time."""
+    
+    DEFAULT_TIMEOUT = 5.0
+    
+    def __init__(self, max_workers: int = 4):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.probes: Dict[str, Probe] = {}
+        self.durations: Dict[str, float] = {}
+        
+    def register(self, name: str, func: Callable[..., Any], depends_on: Iterable[str] = (),
+                 timeout: float = DEFAULT_TIMEOUT, default: Any = None):
+        """Add a probe; default is its result when it fails or times out."""
+        self.probes[name] = Probe(name, func, list(depends_on), timeout, default)
+        
+    def _closure(self, names: Iterable[str]) -> List[str]:
+        """Requested probes plus everything they depend on."""
+        selected = []
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in selected or name not in self.probes:
+                continue
+            selected.append(name)
+            pending.extend(self.probes[name].depends_on)
+        return selected
+        
+    def run(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Run probes and their dependencies, returning results by probe name."""
+        pending = {name: self.probes[name] for name in self._closure(names or list(self.probes))}
+        results: Dict[str, Any] = {}
+        running: Dict[str, float] = {}
+        started: Dict[str, float] = {}
+        finished: queue.Queue = queue.Queue()
+        
+        def call(probe: Probe, kwargs: Dict[str, Any]):
+            try:
+                finished.put((probe.name, True, probe.func(**kwargs)))
+            except Exception as e:
+                finished.put((probe.name, False, e))
+                
+        while pending or running:
+            for name, probe in list(pending.items()):
+                if len(running) >= self.max_workers:
+                    break
+                if all(dep in results for dep in probe.depends_on):
+                    del pending[name]
+                    kwargs = {dep: results[dep] for dep in probe.depends_on}
+                    started[name] = time.monotonic()
+                    running[name] = started[name] + probe.timeout
+                    # Daemon threads: a hung probe is abandoned, never joined
+                    threading.Thread(target=call, args=(probe, kwargs), name=f"probe-{name}",
+                                     daemon=True).start()
+                                     
+            if not running:
+                # Remaining probes depend on something unregistered
+                for name, probe in pending.items():
+                    self.logger.warning(f"Probe {name} has unmet dependencies {probe.depends_on}")
+                    results[name] = self._default(name)
+                break
+                
+            try:
+                name, ok, value = finished.get(timeout=max(0.0, min(running.values()) - time.monotonic()))
+            except queue.Empty:
+                name = None
+                
+            if name in running:
+                del running[name]
+                self.durations[name] = time.monotonic() - started[name]
+                if ok:
+                    results[name] = value
+                else:
+                    self.logger.warning(f"Probe {name} failed: {value}")
+                    results[name] = self._default(name)
+                    
+            now = time.monotonic()
+            for name, deadline in list(running.items()):
+                if deadline <= now:
+                    del running[name]
+                    self.durations[name] = now - started[name]
+                    self.logger.warning(f"Probe {name} timed out after {self.probes[name].timeout:.1f}s")
+                    results[name] = self._default(name)
+                    
+        return results
+        
+    def _default(self, name: str) -> Any:
+        """Fresh copy of a probe's fallback result."""
+        return copy.deepcopy(self.probes[name].default)
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Sysfs Reader Module
+Partial reads of /proc, /sys and /run in place of sensors, systemctl and ufw
+"""
+
+import os
+import glob
+import logging
+from typing import Dict, List, Optional, Tuple
+
+
+class SysfsReader:
+    """Kernel and systemd state read straight from pseudo-files, no subprocesses."""
+    
+    HWMON = "sys/class/hwmon"
+    THERMAL = "sys/class/thermal"
+    DMI = "sys/class/dmi/id"
+    CPUINFO = "proc/cpuinfo"
+    INIT_CGROUP = "proc/1/cgroup"
+    SYSTEMD_RUNTIME = "run/systemd/system"
+    SYSTEMD_UNITS = "run/systemd/units"
+    UFW_CONF = "etc/ufw/ufw.conf"
+    
+    DMI_FIELDS = ["sys_vendor", "product_name", "product_version", "board_vendor", "board_name",
+                  "bios_vendor", "chassis_type"]
+                  
+    # hwmon drivers and thermal zone types that report the CPU package or cores
+    CPU_CHIPS = ("coretemp", "k10temp", "zenpower", "cpu_thermal")
+    CPU_ZONE_TYPES = ("x86_pkg_temp", "cpu-thermal", "acpitz")
+    
+    # Sysfs attributes are a single short line; this is plenty
+    ATTRIBUTE_BYTES = 256
+    CHUNK_BYTES = 4096
+    
+    def __init__(self, root: str = "/"):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        
+    def _path(self, *parts: str) -> str:
+        """Path below the reader's root."""
+        return os.path.join(self.root, *parts)
+        
+    def read_attribute(self, path: str, limit: int = ATTRIBUTE_BYTES) -> Optional[str]:
+        """First bytes of a pseudo-file with one read call, None if unreadable."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            return os.read(fd, limit).decode('utf-8', errors='replace').strip()
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+            
+    def _read_until(self, path: str, marker: bytes, limit: int = 64 * 1024) -> Optional[str]:
+        """Read a file in chunks only until marker appears."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        data = b""
+        try:
+            while marker not in data and len(data) < limit:
+                chunk = os.read(fd, self.CHUNK_BYTES)
+                if not chunk:
+                    break
+                data += chunk
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+        return data.split(marker, 1)[0].decode('utf-8', errors='replace')
+        
+    def _millidegrees(self, path: str) -> Optional[float]:
+        """Temperature attribute in degrees Celsius."""
+        value = self.read_attribute(path, 32)
+        try:
+            return int(value) / 1000.0
+        except (TypeError, ValueError):
+            return None
+            
+    def hwmon_temperatures(self) -> List[Tuple[str, str, float]]:
+        """(chip, label, celsius) of every readable hwmon temperature input."""
+        readings = []
+        for chip_dir in sorted(glob.glob(self._path(self.HWMON, "hwmon*"))):
+            chip = self.read_attribute(os.path.join(chip_dir, "name")) or os.path.basename(chip_dir)
+            for input_path in sorted(glob.glob(os.path.join(chip_dir, "temp*_input"))):
+                celsius = self._millidegrees(input_path)
+                if celsius is None:
+                    continue
+                label = self.read_attribute(input_path[:-len("_input")] + "_label")
+                readings.append((chip, label or os.path.basename(input_path)[:-len("_input")], celsius))
+        return readings
+        
+    def thermal_zones(self) -> Dict[str, Dict[str, Optional[object]]]:
+        """Kernel thermal zones with their type and current temperature."""
+        zones = {}
+        for zone_dir in sorted(glob.glob(self._path(self.THERMAL, "thermal_zone*"))):
+            zones[os.path.basename(zone_dir)] = {
+                "type": self.read_attribute(os.path.join(zone_dir, "type")),
+                "temp": self._millidegrees(os.path.join(zone_dir, "temp"))
+            }
+        return zones
+        
+    def cpu_temperature(self) -> Optional[float]:
+        """Hottest CPU reading: coretemp/k10temp first, CPU thermal zones otherwise."""
+        readings = [celsius for chip, _, celsius in self.hwmon_temperatures() if chip in self.CPU_CHIPS]
+        if not readings:
+            readings = [zone["temp"] for zone in self.thermal_zones().values()
+                        if zone["temp"] is not None and zone["type"] in self.CPU_ZONE_TYPES]
+        return max(readings) if readings else None
+        
+    def dmi(self) -> Dict[str, str]:
+        """Firmware-reported machine identity; root-only fields are skipped."""
+        info = {}
+        for field in self.DMI_FIELDS:
+            value = self.read_attribute(self._path(self.DMI, field))
+            if value:
+                info[field] = value
+        return info
+        
+    def cpuinfo(self) -> Dict[str, str]:
+        """Fields of the first processor block only, not the whole of /proc/cpuinfo."""
+        block = self._read_until(self._path(self.CPUINFO), b"\n\n")
+        fields = {}
+        for line in (block or "").splitlines():
+            key, sep, value = line.partition(":")
+            if sep:
+                fields[key.strip()] = value.strip()
+        return fields
+        
+    def container(self) -> Optional[str]:
+        """Container runtime of this system, from marker files and init's cgroup."""
+        if os.path.exists(self._path(".dockerenv")):
+            return "docker"
+        if os.path.exists(self._path("run/.containerenv")):
+            return "podman"
+            
+        cgroup = self.read_attribute(self._path(self.INIT_CGROUP), self.CHUNK_BYTES) or ""
+        for marker, runtime in [("docker", "docker"), ("kubepods", "kubernetes"), ("libpod", "podman"),
+                                ("lxc", "lxc"), ("containerd", "containerd")]:
+            if marker in cgroup:
+                return runtime
+        return None
+        
+    def systemd_running(self) -> bool:
+        """True when systemd is the service manager."""
+        return os.path.isdir(self._path(self.SYSTEMD_RUNTIME))
+        
+    def unit_loaded(self, unit: str) -> Optional[bool]:
+        """Whether systemd holds an invocation link for a unit; None without systemd."""
+        # The link outlives a stopped unit that stays loaded: a hint, never proof it is running
+        if not self.systemd_running():
+            return None
+        if "." not in unit:
+            unit = f"{unit}.service"
+        return os.path.lexists(self._path(self.SYSTEMD_UNITS, f"invocation:{unit}"))
+        
+    def pidfile_alive(self, relative_path: str) -> bool:
+        """True when a pid file names a running process."""
+        try:
+            pid = int(self.read_attribute(self._path(relative_path), 32) or "")
+        except ValueError:
+            return False
+        return os.path.exists(self._path("proc", str(pid)))
+        
+    def process_running(self, name: str) -> bool:
+        """True when any process's comm matches name (the kernel truncates comm to 15 bytes)."""
+        for comm_path in glob.glob(self._path("proc", "[0-9]*", "comm")):
+            if self.read_attribute(comm_path, 32) == name[:15]:
+                return True
+        return False
+        
+    def ufw_enabled(self) -> Optional[bool]:
+        """ufw's persistent enabled flag, None when ufw is not installed."""
+        content = self.read_attribute(self._path(self.UFW_CONF), self.CHUNK_BYTES)
+        if content is None:
+            return None
+        for line in content.splitlines():
+            key, sep, value = line.partition("=")
+            if sep and key.strip() == "ENABLED":
+                return value.strip().strip('"').lower() == "yes"
+        return False
\ No newline at end of file
@@ -5,13 +5,21 @@ Intelligent detection of hardware, OS, and system capabilities
 
 import os
 import platform
-import subprocess
 import psutil
 import json
+import time
 import logging
+import threading
+import concurrent.futures
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from tools.command_index import command_exists
+from tools.detection_cache import DetectionCache
+from tools.health_sampler import HealthSampler
+from tools.probe_engine import ProbeEngine
+from tools.sysfs_reader import SysfsReader
+
 
 @dataclass
 class SystemInfo:
@@ -29,13 +37,76 @@ class SystemInfo:
     network_interfaces: List[str]
     python_version: str
     package_managers: List[str]
+    load_average: float = 0.0
 
 
 class SystemDetector:
     """Intelligent system detection and analysis."""
     
-    def __init__(self):
+    # Probes whose results hold until the next reboot
+    STATIC_PROBES = ["platform", "os_distribution", "cpu_cores", "package_managers"]
+    
+    # Seconds a volatile probe result stays fresh in snapshot()
+    VOLATILE_TTLS = {
+        "cpu_frequency": 5.0,
+        "memory": 5.0,
+        "load": 5.0,
+        "disk": 30.0,
+        "network_interfaces": 60.0
+    }
+    
+    # Probes merged into SystemInfo
+    SYSTEM_PROBES = STATIC_PROBES + list(VOLATILE_TTLS)
+    
+    # health_check() window over sampled history and sustained CPU temperature limit
+    HEALTH_WINDOW = 300.0
+    TEMPERATURE_LIMIT = 85.0
+    
+    # CPU models this project tunes thermal management for
+    Q9550_SIGNATURES = ["Q9550", "Core(TM)2 Quad", "Core 2 Quad"]
+    
+    def __init__(self, max_workers: int = 4, sysfs: Optional[SysfsReader] = None,
+                 facts_cache: Optional[DetectionCache] = None):
         self.logger = logging.getLogger(__name__)
+        self.sysfs = sysfs or SysfsReader()
+        self.facts_cache = facts_cache or DetectionCache()
+        self.probes = ProbeEngine(max_workers=max_workers)
+        self._register_probes()
+        
+        # snapshot() state: static facts of one boot, volatile results with their probe time
+        self._snapshot_lock = threading.Lock()
+        self._static: Optional[Dict[str, any]] = None
+        self._static_boot: Optional[int] = None
+        self._volatile: Dict[str, Tuple[float, any]] = {}
+        
+    def _register_probes(self):
+        """Register every detector as a probe; slow command-backed probes get a timeout."""
+        self.probes.register("platform", self._detect_platform, timeout=2.0, default={})
+        self.probes.register("os_distribution", self._detect_os_distribution, timeout=2.0,
+                             default=platform.system())
+        self.probes.register("cpu_cores", self._detect_cpu_cores, timeout=2.0, default=0)
+        self.probes.register("cpu_frequency", self._detect_cpu_frequency, timeout=2.0, default=0.0)
+        self.probes.register("memory", self._detect_memory, timeout=2.0, default=(0, 0))
+        self.probes.register("load", self._detect_load, timeout=2.0, default=0.0)
+        self.probes.register("disk", self._detect_disk, timeout=2.0, default=(0, 0))
+        self.probes.register("network_interfaces", self._detect_network_interfaces, timeout=2.0, default=[])
+        self.probes.register("package_managers", self._detect_package_managers, timeout=2.0, default=[])
+        
+        self.probes.register("cpuinfo", self.sysfs.cpuinfo, timeout=2.0, default={})
+        self.probes.register("dmi", self.sysfs.dmi, timeout=2.0, default={})
+        self.probes.register("hwmon", self.sysfs.hwmon_temperatures, timeout=2.0, default=[])
+        self.probes.register("thermal_zones", self.sysfs.thermal_zones, timeout=2.0, default={})
+        self.probes.register("thermal", self._thermal_capabilities,
+                             depends_on=["hwmon", "thermal_zones", "cpuinfo"],
+                             default=self._thermal_capabilities([], {}, {}))
+                             
+        self.probes.register("virtualization", self._detect_virtualization, depends_on=["cpuinfo", "dmi"],
+                             default={"is_virtual": False, "hypervisor": None, "container": None})
+                             
+        self.probes.register("ssh_server", self._ssh_server_running, timeout=2.0, default=False)
+        self.probes.register("firewall", self._firewall_active, timeout=2.0, default=False)
+        self.probes.register("security", self._security_features, depends_on=["ssh_server", "firewall"],
+                             default=self._security_features(False, False))
         
     def detect_basic_info(self) -> Dict[str, str]:
         """Quick system detection for basic information."""
@@ -50,52 +121,112 @@ class SystemDetector:
     def detect_comprehensive_info(self) -> SystemInfo:
         """Comprehensive system detection and analysis."""
         self.logger.info("Starting comprehensive system detection")
+        return self._system_info(self.probes.run(self.SYSTEM_PROBES))
         
-        # Basic platform info
-        hostname = platform.node()
-        os_name = self._detect_os_distribution()
-        os_version = platform.release()
-        architecture = platform.machine()
-        
-        # CPU information
-        cpu_cores = psutil.cpu_count(logical=False)
-        cpu_frequency = psutil.cpu_freq().current if psutil.cpu_freq() else 0.0
-        
-        # Memory information
-        memory = psutil.virtual_memory()
-        memory_total = memory.total
-        memory_available = memory.available
-        
-        # Disk information
-        disk = psutil.disk_usage('/')
-        disk_total = disk.total
-        disk_available = disk.free
-        
-        # Network interfaces
-        network_interfaces = self._detect_network_interfaces()
+    def detect_all(self, max_age: Optional[float] = None) -> Dict[str, any]:
+        """System snapshot plus thermal, virtualization and security features in one concurrent pass."""
+        self.logger.info("Starting full system detection")
+        # The snapshot's own probes run alongside the feature probes, not after them
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot") as executor:
+            system = executor.submit(self.snapshot, max_age)
+            results = self.probes.run(["thermal", "virtualization", "security"])
+            return {
+                "system": system.result(),
+                "thermal": results["thermal"],
+                "virtualization": results["virtualization"],
+                "security": results["security"]
+            }
         
-        # Python version
-        python_version = platform.python_version()
+    def snapshot(self, max_age: Optional[float] = None) -> SystemInfo:
+        """SystemInfo with static facts cached per boot and volatile ones re-probed past their TTL or max_age."""
+        with self._snapshot_lock:
+            boot_time = int(psutil.boot_time())
+            if self._static is None or self._static_boot != boot_time:
+                self._static = self.facts_cache.get(boot_time)
+                self._static_boot = boot_time
+                if self._static is None:
+                    self._static = self.probes.run(self.STATIC_PROBES)
+                    # A probe that fell back to its default is retried next time, not kept for the boot
+                    if any(self._static[name] == self.probes.probes[name].default for name in self.STATIC_PROBES):
+                        self._static_boot = None
+                    else:
+                        self.facts_cache.store(boot_time, self._static)
+                
+            now = time.monotonic()
+            stale = [name for name, ttl in self.VOLATILE_TTLS.items()
+                     if name not in self._volatile
+                     or now - self._volatile[name][0] > (ttl if max_age is None else max_age)]
+            if stale:
+                for name, value in self.probes.run(stale).items():
+                    self._volatile[name] = (now, value)
+                    
+            results = dict(self._static)
+            results.update({name: value for name, (_, value) in self._volatile.items()})
+            
+        return self._system_info(results)
         
-        # Package managers
-        package_managers = self._detect_package_managers()
+    def invalidate(self):
+        """Forget cached facts so the next snapshot probes everything again."""
+        with self._snapshot_lock:
+            self._static = None
+            self._volatile = {}
+            self.facts_cache.invalidate()
+            
+    def _system_info(self, results: Dict[str, any]) -> SystemInfo:
+        """Merge probe results into SystemInfo."""
+        platform_info = results["platform"]
+        memory_total, memory_available = results["memory"]
+        disk_total, disk_available = results["disk"]
         
         return SystemInfo(
-            hostname=hostname,
-            os_name=os_name,
-            os_version=os_version,
-            architecture=architecture,
-            cpu_cores=cpu_cores,
-            cpu_frequency=cpu_frequency,
+            hostname=platform_info.get("hostname", ""),
+            os_name=results["os_distribution"],
+            os_version=platform_info.get("os_version", ""),
+            architecture=platform_info.get("architecture", ""),
+            cpu_cores=results["cpu_cores"],
+            cpu_frequency=results["cpu_frequency"],
             memory_total=memory_total,
             memory_available=memory_available,
             disk_total=disk_total,
             disk_available=disk_available,
-            network_interfaces=network_interfaces,
-            python_version=python_version,
-            package_managers=package_managers
+            network_interfaces=list(results["network_interfaces"]),
+            python_version=platform_info.get("python_version", ""),
+            package_managers=list(results["package_managers"]),
+            load_average=results["load"]
         )
         
+    def _detect_platform(self) -> Dict[str, str]:
+        """Hostname, kernel release, architecture and Python version."""
+        return {
+            "hostname": platform.node(),
+            "os_version": platform.release(),
+            "architecture": platform.machine(),
+            "python_version": platform.python_version()
+        }
+        
+    def _detect_cpu_cores(self) -> int:
+        """Physical core count."""
+        return psutil.cpu_count(logical=False) or 0
+        
+    def _detect_cpu_frequency(self) -> float:
+        """Current CPU frequency in MHz."""
+        cpu_frequency = psutil.cpu_freq()
+        return cpu_frequency.current if cpu_frequency else 0.0
+        
+    def _detect_load(self) -> float:
+        """One-minute load average."""
+        return os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0.0
+        
+    def _detect_memory(self) -> Tuple[int, int]:
+        """Total and available memory in bytes."""
+        memory = psutil.virtual_memory()
+        return memory.total, memory.available
+        
+    def _detect_disk(self) -> Tuple[int, int]:
+        """Total and free bytes of the root filesystem."""
+        disk = psutil.disk_usage('/')
+        return disk.total, disk.free
+        
     def _detect_os_distribution(self) -> str:
         """Detect specific OS distribution."""
         try:
@@ -165,156 +296,121 @@ class SystemDetector:
         
     def _command_exists(self, command: str) -> bool:
         """Check if command exists in system PATH."""
-        try:
-            subprocess.run(['which', command], 
-                         check=True, 
-                         capture_output=True, 
-                         text=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return command_exists(command)
             
     def detect_thermal_capabilities(self) -> Dict[str, any]:
         """Detect thermal monitoring capabilities (Q9550 specific)."""
-        thermal_info = {
-            "sensors_available": False,
-            "thermal_zones": [],
-            "cpu_temp_available": False,
-            "q9550_detected": False
-        }
+        return self.probes.run(["thermal"])["thermal"]
         
-        try:
-            # Check for sensors command
-            if self._command_exists('sensors'):
-                thermal_info["sensors_available"] = True
-                
-                # Run sensors and parse output
-                result = subprocess.run(['sensors'], 
-                                      capture_output=True, 
-                                      text=True)
-                if result.returncode == 0:
-                    output = result.stdout
-                    if 'Core' in output and 'temp' in output.lower():
-                        thermal_info["cpu_temp_available"] = True
-                        
-                    # Check for Q9550 specific signatures
-                    if 'Q9550' in output or 'Core 2 Quad' in output:
-                        thermal_info["q9550_detected"] = True
-                        
-            # Check thermal zones
-            thermal_zones = []
-            thermal_zone_path = "/sys/class/thermal"
-            if os.path.exists(thermal_zone_path):
-                for item in os.listdir(thermal_zone_path):
-                    if item.startswith('thermal_zone'):
-                        thermal_zones.append(item)
-                        
-            thermal_info["thermal_zones"] = thermal_zones
-            
-        except Exception as e:
-            self.logger.warning(f"Could not detect thermal capabilities: {e}")
-            
-        return thermal_info
+    def _thermal_capabilities(self, hwmon: List[Tuple[str, str, float]], thermal_zones: Dict[str, Dict],
+                              cpuinfo: Dict[str, str]) -> Dict[str, any]:
+        """Combine hwmon readings, thermal zones and the CPU model."""
+        cpu_readings = [celsius for chip, _, celsius in hwmon if chip in SysfsReader.CPU_CHIPS]
+        model = cpuinfo.get("model name", "")
+        
+        return {
+            "sensors_available": bool(hwmon),
+            "thermal_zones": sorted(thermal_zones),
+            "cpu_temp_available": bool(cpu_readings),
+            "cpu_temperature": max(cpu_readings) if cpu_readings else None,
+            "q9550_detected": any(signature in model for signature in self.Q9550_SIGNATURES)
+        }
         
     def detect_virtualization(self) -> Dict[str, any]:
         """Detect if system is running in virtualization."""
+        return self.probes.run(["virtualization"])["virtualization"]
+        
+    def _detect_virtualization(self, cpuinfo: Dict[str, str], dmi: Dict[str, str]) -> Dict[str, any]:
+        """Hypervisor from CPU flags and DMI identity, container from init's cgroup."""
         virt_info = {
             "is_virtual": False,
             "hypervisor": None,
             "container": None
         }
         
-        try:
-            # Check for common virtualization indicators
-            if os.path.exists('/proc/cpuinfo'):
-                with open('/proc/cpuinfo', 'r') as f:
-                    cpuinfo = f.read()
-                    
-                if 'hypervisor' in cpuinfo.lower():
-                    virt_info["is_virtual"] = True
-                    
-                # Check for specific hypervisors
-                hypervisors = ['vmware', 'virtualbox', 'kvm', 'xen', 'hyper-v']
-                for hypervisor in hypervisors:
-                    if hypervisor in cpuinfo.lower():
-                        virt_info["hypervisor"] = hypervisor
-                        break
-                        
-            # Check for container environments
-            if os.path.exists('/.dockerenv'):
-                virt_info["container"] = "docker"
-            elif os.path.exists('/run/.containerenv'):
-                virt_info["container"] = "podman"
-                
-        except Exception as e:
-            self.logger.warning(f"Could not detect virtualization: {e}")
+        if "hypervisor" in cpuinfo.get("flags", "").split():
+            virt_info["is_virtual"] = True
             
+        # Check for specific hypervisors
+        identity = " ".join([cpuinfo.get("model name", "")] + list(dmi.values())).lower()
+        hypervisors = {'vmware': 'vmware', 'virtualbox': 'virtualbox', 'innotek': 'virtualbox',
+                       'kvm': 'kvm', 'qemu': 'kvm', 'xen': 'xen', 'hyper-v': 'hyper-v',
+                       'virtual machine': 'hyper-v'}
+        for signature, hypervisor in hypervisors.items():
+            if signature in identity:
+                virt_info["is_virtual"] = True
+                virt_info["hypervisor"] = hypervisor
+                break
+                
+        virt_info["container"] = self.sysfs.container()
         return virt_info
         
     def detect_security_features(self) -> Dict[str, any]:
         """Detect available security features."""
-        security_info = {
-            "sudo_available": False,
-            "ssh_server_running": False,
-            "firewall_active": False,
+        return self.probes.run(["security"])["security"]
+        
+    def _ssh_server_running(self) -> bool:
+        """True when an sshd process is alive, found from its pid file or /proc."""
+        # Under systemd an unloaded ssh unit rules sshd out; a loaded one still needs a live process
+        loaded = [self.sysfs.unit_loaded(unit) for unit in ['ssh', 'sshd', 'openssh']]
+        if loaded[0] is not None and not any(loaded):
+            return False
+        return self.sysfs.pidfile_alive("run/sshd.pid") or self.sysfs.process_running("sshd")
+        
+    def _firewall_active(self) -> bool:
+        """True when ufw is enabled in its configuration."""
+        return bool(self.sysfs.ufw_enabled())
+        
+    def _security_features(self, ssh_server: bool, firewall: bool) -> Dict[str, any]:
+        """Combine security probe results."""
+        return {
+            "sudo_available": self._command_exists('sudo'),
+            "ssh_server_running": ssh_server,
+            "firewall_active": firewall,
             "selinux_status": None,
             "apparmor_status": None
         }
         
+    def health_check(self, sampler: Optional[HealthSampler] = None,
+                     window: float = HEALTH_WINDOW) -> bool:
+        """Perform basic system health check, over the sampler's recent history when given."""
         try:
-            # Check sudo
-            security_info["sudo_available"] = self._command_exists('sudo')
-            
-            # Check SSH server
-            try:
-                result = subprocess.run(['systemctl', 'is-active', 'ssh'], 
-                                      capture_output=True, text=True)
-                security_info["ssh_server_running"] = (result.returncode == 0 and 
-                                                     'active' in result.stdout)
-            except:
-                # Try alternative SSH service names
-                for service in ['sshd', 'openssh']:
-                    try:
-                        result = subprocess.run(['systemctl', 'is-active', service], 
-                                              capture_output=True, text=True)
-                        if result.returncode == 0 and 'active' in result.stdout:
-                            security_info["ssh_server_running"] = True
-                            break
-                    except:
-                        continue
-                        
-            # Check firewall
-            if self._command_exists('ufw'):
-                try:
-                    result = subprocess.run(['ufw', 'status'], 
-                                          capture_output=True, text=True)
-                    security_info["firewall_active"] = 'Status: active' in result.stdout
-                except:
-                    pass
+            disk_free_percent = memory_percent = load_avg = temperature = None
+            if sampler is not None:
+                # Smoothed over the window so a single spike does not fail the check
+                sampler.sample()
+                disk_percent = sampler.window("disk_percent", window)
+                disk_free_percent = 100 - disk_percent[-1] if disk_percent else None
+                memory_percent = sampler.ewma("memory_percent", window)
+                load_avg = sampler.ewma("load", window)
+                temperature = sampler.percentile("temperature", 95, window)
+                
+            if None in (disk_free_percent, memory_percent, load_avg):
+                # Volatile fields fresh, static ones from the cache; also fills fields the sampler lacks
+                info = self.snapshot(max_age=0)
+                if disk_free_percent is None:
+                    disk_free_percent = (info.disk_available / info.disk_total) * 100
+                if memory_percent is None:
+                    memory_percent = 100 - (info.memory_available / info.memory_total) * 100
+                if load_avg is None:
+                    load_avg = info.load_average
                     
-        except Exception as e:
-            self.logger.warning(f"Could not detect security features: {e}")
-            
-        return security_info
-        
-    def health_check(self) -> bool:
-        """Perform basic system health check."""
-        try:
             # Check disk space (warn if less than 10% free)
-            disk = psutil.disk_usage('/')
-            disk_free_percent = (disk.free / disk.total) * 100
             if disk_free_percent < 10:
                 self.logger.warning(f"Low disk space: {disk_free_percent:.1f}% free")
                 return False
                 
             # Check memory usage (warn if less than 10% free)
-            memory = psutil.virtual_memory()
-            if memory.percent > 90:
-                self.logger.warning(f"High memory usage: {memory.percent:.1f}%")
+            if memory_percent > 90:
+                self.logger.warning(f"High memory usage: {memory_percent:.1f}%")
+                return False
+                
+            # Check sustained CPU temperature
+            if temperature is not None and temperature > self.TEMPERATURE_LIMIT:
+                self.logger.warning(f"High CPU temperature: {temperature:.1f}°C (p95 over {window:.0f}s)")
                 return False
                 
             # Check CPU load
-            load_avg = os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0
             cpu_cores = psutil.cpu_count()
             if load_avg > cpu_cores * 2:
                 self.logger.warning(f"High CPU load: {load_avg:.2f} (cores: {cpu_cores})")
@@ -329,17 +425,14 @@ class SystemDetector:
     def export_system_info(self, filepath: str):
         """Export comprehensive system information to JSON."""
         try:
-            system_info = self.detect_comprehensive_info()
-            thermal_info = self.detect_thermal_capabilities()
-            virt_info = self.detect_virtualization()
-            security_info = self.detect_security_features()
+            detected = self.detect_all()
             
             export_data = {
                 "timestamp": psutil.boot_time(),
-                "system": system_info.__dict__,
-                "thermal": thermal_info,
-                "virtualization": virt_info,
-                "security": security_info
+                "system": detected["system"].__dict__,
+                "thermal": detected["thermal"],
+                "virtualization": detected["virtualization"],
+                "security": detected["security"]
             }
             
             with open(filepath, 'w') as f:
@@ -0,0 +1,100 @@
+"""
+Thermal Governor Module
+Temperature-driven worker limits for long installation and scan runs
+"""
+
+import time
+import threading
+import logging
+from typing import Optional
+
+from tools.sysfs_reader import SysfsReader
+
+
+class ThermalGovernor:
+    """Halve concurrency for every throttle step the CPU is above threshold, with hysteresis."""
+    
+    # Q9550 cores report against a 100°C TjMax; stay well clear of it
+    DEFAULT_THRESHOLD = 80.0
+    STEP = 5.0  # Each further STEP degrees halves workers again
+    HYSTERESIS = 3.0  # Degrees below a step before it is released
+    READ_INTERVAL = 2.0  # Seconds a temperature reading is reused
+    
+    def __init__(self, sysfs: Optional[SysfsReader] = None, threshold: float = DEFAULT_THRESHOLD,
+                 min_workers: int = 1):
+        self.logger = logging.getLogger(__name__)
+        self.sysfs = sysfs or SysfsReader()
+        self.threshold = threshold
+        self.min_workers = min_workers
+        self.level = 0  # Number of halvings currently applied
+        self._lock = threading.Lock()
+        self._reading: Optional[float] = None
+        self._read_at = 0.0
+        
+    def temperature(self) -> Optional[float]:
+        """Hottest CPU reading from hwmon, at most one sysfs read per READ_INTERVAL."""
+        with self._lock:
+            now = time.monotonic()
+            if self._read_at == 0.0 or now - self._read_at >= self.READ_INTERVAL:
+                self._reading = self.sysfs.cpu_temperature()
+                self._read_at = now
+            return self._reading
+            
+    def _level_for(self, temperature: float) -> int:
+        """Throttle level for a temperature, holding the current level within the hysteresis band."""
+        if temperature < self.threshold - self.HYSTERESIS:
+            return 0
+        target = 0 if temperature < self.threshold else 1 + int((temperature - self.threshold) // self.STEP)
+        if target < self.level:
+            # Release one level at a time, only once clearly below its step
+            release_below = self.threshold + (self.level - 1) * self.STEP - self.HYSTERESIS
+            return self.level - 1 if temperature < release_below else self.level
+        return target
+        
+    def limit(self, max_workers: int) -> int:
+        """Workers allowed right now out of max_workers."""
+        temperature = self.temperature()
+        if temperature is None:
+            return max_workers
+            
+        with self._lock:
+            level = self._level_for(temperature)
+            if level != self.level:
+                allowed = max(self.min_workers, max_workers >> level)
+                if level > self.level:
+                    self.logger.warning(f"CPU at {temperature:.1f}°C (threshold {self.threshold:.0f}°C): "
+                                        f"throttling to {allowed}/{max_workers} workers")
+                else:
+                    self.logger.info(f"CPU cooled to {temperature:.1f}°C: "
+                                     f"raising to {allowed}/{max_workers} workers")
+                self.level = level
+                
+        return max(self.min_workers, max_workers >> self.level)
+
+
+class ThrottleGate:
+    """Counting gate whose width follows the governor, re-read every time a worker asks to enter."""
+    
+    POLL = 0.5  # Seconds a waiting worker sleeps before re-reading the limit
+    
+    def __init__(self, governor: Optional[ThermalGovernor], max_workers: int):
+        self.governor = governor
+        self.max_workers = max_workers
+        self._slots = threading.Condition()
+        self._active = 0
+        
+    def width(self) -> int:
+        """Workers admitted right now."""
+        return self.governor.limit(self.max_workers) if self.governor else self.max_workers
+        
+    def __enter__(self):
+        with self._slots:
+            while self._active >= self.width():
+                self._slots.wait(self.POLL)
+            self._active += 1
+        return self
+        
+    def __exit__(self, *exc_info):
+        with self._slots:
+            self._active -= 1
+            self._slots.notify_all()
\ No newline at end of file
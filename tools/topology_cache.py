@@ -0,0 +1,107 @@
+"""
+Topology Cache Module
+Persistent on-disk cache of discovered servers keyed by subnet
+"""
+
+import os
+import json
+import time
+import logging
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from tools.network_scanner import ServerInfo
+
+
+class TopologyCache:
+    """JSON topology store under ~/.cache/unifikation with per-server TTL."""
+    
+    DEFAULT_TTL = 900  # 15 minutes
+    CACHE_VERSION = 1
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.logger = logging.getLogger(__name__)
+        if cache_dir is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            cache_dir = os.path.join(cache_home, "unifikation")
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "topology.json")
+        self.ttl = ttl
+        
+    def _load(self) -> Dict:
+        """Load cache file, returning an empty cache when missing or corrupt."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.CACHE_VERSION:
+                return data
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Topology cache unavailable: {e}")
+            
+        return {"version": self.CACHE_VERSION, "subnets": {}}
+        
+    def _save(self, data: Dict):
+        """Atomically write cache file."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write topology cache: {e}")
+            
+    def _max_age(self, max_age: Optional[float]) -> float:
+        """Resolve per-call max_age against the default TTL."""
+        return self.ttl if max_age is None else max_age
+        
+    def get_servers(self, subnet: str, max_age: Optional[float] = None) -> List[ServerInfo]:
+        """Get cached servers whose entries are younger than max_age."""
+        entry = self._load()["subnets"].get(subnet, {})
+        cutoff = time.time() - self._max_age(max_age)
+        
+        servers = []
+        for host in entry.get("hosts", {}).values():
+            if host["scanned_at"] >= cutoff:
+                servers.append(ServerInfo(**host["server"]))
+                
+        return servers
+        
+    def get_stale_hosts(self, subnet: str, max_age: Optional[float] = None) -> List[str]:
+        """Get cached host addresses whose entries have expired."""
+        entry = self._load()["subnets"].get(subnet, {})
+        cutoff = time.time() - self._max_age(max_age)
+        
+        return [ip for ip, host in entry.get("hosts", {}).items() if host["scanned_at"] < cutoff]
+        
+    def sweep_age(self, subnet: str) -> Optional[float]:
+        """Seconds since the last full sweep of subnet, None if never swept."""
+        swept_at = self._load()["subnets"].get(subnet, {}).get("swept_at")
+        return None if swept_at is None else time.time() - swept_at
+        
+    def store(self, subnet: str, probed_hosts: List[str], servers: List[ServerInfo],
+              full_sweep: bool = False):
+        """Record scan results; probed hosts that did not answer are dropped."""
+        data = self._load()
+        entry = data["subnets"].setdefault(subnet, {"swept_at": None, "hosts": {}})
+        now = time.time()
+        
+        for ip in probed_hosts:
+            entry["hosts"].pop(ip, None)
+            
+        for server in servers:
+            entry["hosts"][server.ip_address] = {"scanned_at": now, "server": asdict(server)}
+            
+        if full_sweep:
+            entry["swept_at"] = now
+            
+        self._save(data)
+        
+    def invalidate(self, subnet: Optional[str] = None):
+        """Forget one subnet or the whole cache."""
+        data = self._load()
+        if subnet is None:
+            data["subnets"] = {}
+        else:
+            data["subnets"].pop(subnet, None)
+        self._save(data)
\ No newline at end of file
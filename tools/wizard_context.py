@@ -0,0 +1,116 @@
+"""
+Wizard Context Module
+Lazily built subsystems shared by the master wizard and scenario wizards
+"""
+
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+from tools.system_detector import SystemDetector
+from tools.dependency_resolver import DependencyResolver
+from tools.async_network_scanner import AsyncNetworkScanner
+from tools.config_validator import ConfigValidator
+from tools.topology_cache import TopologyCache
+from tools.installed_cache import InstalledStateCache
+from tools.install_history import InstallHistory
+from tools.health_sampler import HealthSampler
+from tools.thermal_governor import ThermalGovernor
+
+
+class WizardContext:
+    """Subsystems created on first use and shared across wizards."""
+    
+    # Slowest subsystems first so they are ready before the user picks a scenario
+    WARM_UP_ORDER = ["thermal_governor", "dependency_resolver", "system_detector", "health_sampler",
+                     "config_validator", "network_scanner"]
+    
+    def __init__(self, rescan: bool = False, max_age: Optional[int] = None,
+                 download_cache_dir: Optional[str] = None,
+                 download_cache_mb: int = DependencyResolver.DEFAULT_DOWNLOAD_CACHE_MB,
+                 proxy_url: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.rescan = rescan
+        self.max_age = max_age
+        self.download_cache_dir = download_cache_dir
+        self.download_cache_mb = download_cache_mb
+        self.proxy_url = proxy_url
+        
+        self._instances: Dict[str, object] = {}
+        self._locks = {name: threading.Lock() for name in self.WARM_UP_ORDER}
+        self._warm_up_thread: Optional[threading.Thread] = None
+        
+    def _get(self, name: str, factory: Callable[[], object]):
+        """Return subsystem, building it once even under concurrent first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+            
+        with self._locks[name]:
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = factory()
+                self._instances[name] = instance
+            return instance
+            
+    @property
+    def system_detector(self) -> SystemDetector:
+        """Shared SystemDetector."""
+        return self._get("system_detector", SystemDetector)
+        
+    @property
+    def health_sampler(self) -> HealthSampler:
+        """Shared HealthSampler, sampling in the background from first use."""
+        return self._get("health_sampler", self._start_health_sampler)
+        
+    def _start_health_sampler(self) -> HealthSampler:
+        """Build the sampler on the detector's sysfs reader and start it."""
+        sampler = HealthSampler(sysfs=self.system_detector.sysfs)
+        sampler.start()
+        return sampler
+        
+    @property
+    def thermal_governor(self) -> ThermalGovernor:
+        """Shared ThermalGovernor throttling installs and scans while the CPU is hot."""
+        return self._get("thermal_governor", ThermalGovernor)
+        
+    @property
+    def dependency_resolver(self) -> DependencyResolver:
+        """Shared DependencyResolver backed by the installed-state cache and install history."""
+        return self._get("dependency_resolver", lambda: DependencyResolver(
+            installed_cache=InstalledStateCache(),
+            install_history=InstallHistory(),
+            thermal_governor=self.thermal_governor,
+            download_cache_dir=self.download_cache_dir,
+            download_cache_mb=self.download_cache_mb,
+            proxy_url=self.proxy_url
+        ))
+        
+    @property
+    def network_scanner(self) -> AsyncNetworkScanner:
+        """Shared network scanner backed by the topology cache."""
+        return self._get("network_scanner", lambda: AsyncNetworkScanner(
+            cache=TopologyCache(), max_age=self.max_age, rescan=self.rescan,
+            governor=self.thermal_governor
+        ))
+        
+    @property
+    def config_validator(self) -> ConfigValidator:
+        """Shared ConfigValidator."""
+        return self._get("config_validator", ConfigValidator)
+        
+    def warm_up(self) -> threading.Thread:
+        """Build all subsystems in a background thread."""
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=self._warm_up, name="wizard-warm-up",
+                                                    daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+        
+    def _warm_up(self):
+        """Instantiate each subsystem, logging failures for later retry on use."""
+        for name in self.WARM_UP_ORDER:
+            try:
+                getattr(self, name)
+            except Exception as e:
+                self.logger.debug(f"Warm-up of {name} failed: {e}")
\ No newline at end of file
@@ -7,16 +7,15 @@ import os
 import sys
 import logging
 import subprocess
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from tools.system_detector import SystemDetector
-from tools.dependency_resolver import DependencyResolver
-from tools.network_scanner import NetworkScanner
-from tools.config_validator import ConfigValidator
+from tools.wizard_context import WizardContext
+from tools.install_executor import InstallExecutor, ProgressEvent
+from tools.install_journal import InstallJournal
 
 
 @dataclass
@@ -49,15 +48,34 @@ class WorkstationWizard:
         "python3-pip", "python3-dev", "ffmpeg", "git-lfs"
     ]
     
-    def __init__(self, language: str = "en"):
-        """Initialize workstation wizard."""
+    def __init__(self, language: str = "en", context: Optional[WizardContext] = None):
+        """Initialize workstation wizard, reusing the master wizard's subsystems if given."""
         self.language = language
-        self.system_detector = SystemDetector()
-        self.dependency_resolver = DependencyResolver()
-        self.network_scanner = NetworkScanner()
-        self.config_validator = ConfigValidator()
+        self.context = context or WizardContext()
+        self._prefetch = None
+        self.journal = InstallJournal("workstation")
         self.setup_logging()
         
+    @property
+    def system_detector(self):
+        """System detector from the shared context."""
+        return self.context.system_detector
+        
+    @property
+    def dependency_resolver(self):
+        """Dependency resolver from the shared context."""
+        return self.context.dependency_resolver
+        
+    @property
+    def network_scanner(self):
+        """Network scanner from the shared context."""
+        return self.context.network_scanner
+        
+    @property
+    def config_validator(self):
+        """Config validator from the shared context."""
+        return self.context.config_validator
+        
     def setup_logging(self):
         """Configure logging for the wizard."""
         logging.basicConfig(
@@ -125,9 +143,10 @@ class WorkstationWizard:
         self.logger.info("Analyzing system configuration")
         
         # Detect system information
-        system_info = self.system_detector.detect_comprehensive_info()
-        thermal_info = self.system_detector.detect_thermal_capabilities()
-        security_info = self.system_detector.detect_security_features()
+        detected = self.system_detector.detect_all()
+        system_info = detected["system"]
+        thermal_info = detected["thermal"]
+        security_info = detected["security"]
         
         # Detect network topology
         network_topology = self.network_scanner.discover_network_topology()
@@ -219,6 +238,7 @@ class WorkstationWizard:
             "configuration_steps": config_steps,
             "total_estimated_time": total_time,
             "disk_space_required": installation_plan.disk_space_required + 1000,  # +1GB for configs
+            "download_size": installation_plan.download_size,
             "conflicts": installation_plan.conflicts_detected,
             "warnings": []
         }
@@ -240,6 +260,7 @@ class WorkstationWizard:
             print(f"• Konfigurační kroky: {len(plan['configuration_steps'])}")
             print(f"• Odhadovaný čas: {plan['total_estimated_time']//60} minut")
             print(f"• Potřebný diskový prostor: {plan['disk_space_required']} MB")
+            print(f"• Ke stažení: {plan['download_size']} MB")
             
             if plan['conflicts']:
                 print(f"⚠️  Konflikty: {len(plan['conflicts'])}")
@@ -257,6 +278,7 @@ class WorkstationWizard:
             print(f"• Configuration steps: {len(plan['configuration_steps'])}")
             print(f"• Estimated time: {plan['total_estimated_time']//60} minutes")
             print(f"• Disk space required: {plan['disk_space_required']} MB")
+            print(f"• Download size: {plan['download_size']} MB")
             
             if plan['conflicts']:
                 print(f"⚠️  Conflicts: {len(plan['conflicts'])}")
@@ -269,42 +291,117 @@ class WorkstationWizard:
                     print(f"   • {warning}")
                     
     def execute_installation(self, plan: Dict, config: WorkstationConfig, dry_run: bool = False):
-        """Execute the installation plan."""
+        """Execute the installation plan, skipping steps a previous interrupted run completed."""
         self.logger.info(f"Executing installation plan (dry_run={dry_run})")
         
+        journal = None if dry_run else self.journal
+        if journal and journal.load():
+            self.logger.info(f"Resuming interrupted installation from {journal.path}")
+            
         try:
+            # Downloads, list updates and installs share package manager locks, let the prefetch finish
+            if self._prefetch is not None and not dry_run:
+                try:
+                    self.logger.info(f"Prefetch results: {self._prefetch.result()}")
+                except Exception as e:
+                    self.logger.warning(f"Prefetch failed, packages will be downloaded now: {e}")
+                    
             # Update package lists
             if not dry_run:
-                self.dependency_resolver.update_package_lists()
+                self._journaled(journal, "update_package_lists",
+                                InstallJournal.checksum([m.value for m in self.dependency_resolver.detected_managers]),
+                                self.dependency_resolver.update_package_lists)
                 
-            # Install packages
-            success = self.dependency_resolver.install_packages(
-                plan['packages'].packages_to_install, 
-                dry_run=dry_run
+            # Install packages, one concurrent worker per package manager
+            executor = InstallExecutor(self.dependency_resolver,
+                                       governor=self.dependency_resolver.thermal_governor)
+            installation_order, batch_checksums = self._pending_batches(
+                executor, plan['packages'].installation_order, journal
             )
             
+            success = True
+            for event in executor.execute_levels(installation_order, dry_run):
+                step = f"install:{event.manager}:{'+'.join(event.packages)}"
+                if journal and step in batch_checksums:
+                    state = {"started": "started", "finished": "done"}.get(event.status, "failed")
+                    journal.record(step, state, batch_checksums[step])
+                self._report_progress(event)
+                if event.status in ("failed", "skipped"):
+                    success = False
+                    
             if not success and not dry_run:
                 raise Exception("Package installation failed")
                 
             # Execute configuration steps
+            steps = {
+                'configure_ssh': self._configure_ssh_server,
+                'setup_tmux': self._setup_tmux_ecosystem,
+                'setup_power_management': self._setup_power_management,
+                'setup_ai_tools': self._setup_ai_tools
+            }
             for step in plan['configuration_steps']:
+                if step['name'] not in steps:
+                    continue
                 self.logger.info(f"Executing step: {step['name']}")
-                
-                if step['name'] == 'configure_ssh':
-                    self._configure_ssh_server(config, dry_run)
-                elif step['name'] == 'setup_tmux':
-                    self._setup_tmux_ecosystem(config, dry_run)
-                elif step['name'] == 'setup_power_management':
-                    self._setup_power_management(config, dry_run)
-                elif step['name'] == 'setup_ai_tools':
-                    self._setup_ai_tools(config, dry_run)
-                    
+                self._journaled(journal, f"config:{step['name']}", InstallJournal.checksum(step, asdict(config)),
+                                lambda: steps[step['name']](config, dry_run))
+                                
+            if journal:
+                journal.complete()
             self.logger.info("Installation completed successfully")
             
         except Exception as e:
             self.logger.error(f"Installation failed: {e}")
             raise
             
+    def _journaled(self, journal: Optional[InstallJournal], step: str, checksum: str, action):
+        """Run action unless the journal shows it done, recording its outcome."""
+        if journal is None:
+            return action()
+        if journal.is_done(step, checksum):
+            self.logger.info(f"Skipping completed step: {step}")
+            return None
+            
+        journal.record(step, "started", checksum)
+        try:
+            result = action()
+        except Exception:
+            journal.record(step, "failed", checksum)
+            raise
+        journal.record(step, "done" if result is not False else "failed", checksum)
+        return result
+        
+    def _pending_batches(self, executor: InstallExecutor, installation_order: List[List],
+                         journal: Optional[InstallJournal]) -> Tuple[List[List], Dict[str, str]]:
+        """Drop batches the journal shows done; returns (remaining levels, {batch step: checksum})."""
+        partitions, _ = executor.partition(installation_order)
+        checksums = {}
+        done = set()
+        for manager, level_batches in partitions.items():
+            for _, batch in level_batches:
+                step = f"install:{manager.value}:{'+'.join(p.name for p in batch)}"
+                checksums[step] = InstallJournal.checksum(
+                    manager.value, [self.dependency_resolver.get_package_name(p, manager) for p in batch]
+                )
+                if journal and journal.is_done(step, checksums[step]):
+                    self.logger.info(f"Skipping completed step: {step}")
+                    done.update(p.name for p in batch)
+                    
+        remaining = [[p for p in level if p.name not in done] for level in installation_order]
+        return [level for level in remaining if level], checksums
+        
+    def _report_progress(self, event: ProgressEvent):
+        """Print installation progress as package manager transactions start and end."""
+        icons = {"started": "⏳", "finished": "✅", "failed": "❌", "skipped": "⏭️"}
+        packages = ", ".join(event.packages)
+        if event.status == "started" and event.expected:
+            elapsed = f" (~{event.expected:.0f}s)"
+        elif event.status == "finished":
+            elapsed = f" ({event.elapsed:.1f}s)"
+        else:
+            elapsed = ""
+        print(f"  {icons.get(event.status, '•')} [{event.manager}] {packages}{elapsed} {event.message}".rstrip())
+        
     def _configure_ssh_server(self, config: WorkstationConfig, dry_run: bool):
         """Configure SSH server."""
         if dry_run:
@@ -339,7 +436,18 @@ PubkeyAuthentication yes
             return
             
         self.logger.info("Setting up Q9550 power management")
-        # In real implementation, would install thermal monitoring and CPU controls
+        
+        # Installs and scans for the rest of the run follow the governor's limits
+        governor = self.context.thermal_governor
+        temperature = governor.temperature()
+        if temperature is None:
+            self.logger.warning("No CPU temperature readable from hwmon; load the coretemp module "
+                                "to enable thermal throttling")
+            return
+            
+        self.logger.info(f"CPU at {temperature:.1f}°C; setup work is throttled above "
+                         f"{governor.threshold:.0f}°C")
+        # In real implementation, would also install CPU frequency controls
         
     def _setup_ai_tools(self, config: WorkstationConfig, dry_run: bool):
         """Setup AI development tools."""
@@ -385,6 +493,12 @@ PubkeyAuthentication yes
             # Create installation plan
             plan = self.create_installation_plan(config, analysis)
             
+            # Download packages while the user reviews the plan
+            if plan['packages'].packages_to_install:
+                self._prefetch = self.dependency_resolver.start_prefetch(
+                    plan['packages'].packages_to_install
+                )
+                
             # Display plan
             self.display_installation_plan(plan)
             